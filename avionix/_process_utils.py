@@ -1,13 +1,265 @@
+"""
+Runs the helm and kubectl commands avionix needs, reading their output as it is
+written so that neither a command that prints a lot nor one that hangs can hold up
+the caller indefinitely
+"""
+
+import asyncio
+from collections import deque
 from logging import error, info
-from subprocess import STDOUT, CalledProcessError, check_output
+import os
+import signal
+from subprocess import PIPE, CalledProcessError, Popen, TimeoutExpired
+from threading import Thread
+import time
+from typing import IO, Any, Deque, List, Optional, Sequence, Union
+
+# How much of the error output of a command is kept, its end holds the error
+MAX_ERROR_OUTPUT = 64 * 1024
+
+_CHUNK_SIZE = 64 * 1024
+
+# How many seconds the output of a killed command is read for, a process it started
+# can keep its output open after it is killed
+_KILLED_READ_TIMEOUT = 1.0
+
+Command = Union[str, Sequence[str]]
+
+# Commands are started in a session of their own where process groups exist, so
+# that killing a command also kills the processes it started, which would otherwise
+# keep its output open
+_HAS_PROCESS_GROUPS = hasattr(os, "killpg")
+
+
+class _RingBuffer:
+    """
+    The last *limit* bytes written to it, or every byte if limit is None
+    """
+
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+        self.__chunks: Deque[bytes] = deque()
+        self.__size = 0
+        self.dropped = 0
+
+    def write(self, chunk: bytes):
+        self.__chunks.append(chunk)
+        self.__size += len(chunk)
+        if self.limit is None:
+            return
+        while self.__size > self.limit:
+            excess = self.__size - self.limit
+            first = self.__chunks[0]
+            if len(first) <= excess:
+                self.__chunks.popleft()
+                removed = len(first)
+            else:
+                self.__chunks[0] = first[excess:]
+                removed = excess
+            self.__size -= removed
+            self.dropped += removed
+
+    def getvalue(self) -> bytes:
+        content = b"".join(self.__chunks)
+        if self.dropped:
+            return f"[{self.dropped} bytes omitted]\n".encode("utf-8") + content
+        return content
+
+
+class _LazyText:
+    """
+    Decodes output only if a log record is emitted, so that large output isn't
+    decoded and formatted when the log level leaves it out
+    """
+
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def __str__(self):
+        return self.content.decode("utf-8", errors="replace")
+
+
+class _LazyCommand:
+    def __init__(self, arguments: List[str]):
+        self.arguments = arguments
+
+    def __str__(self):
+        return " ".join(self.arguments)
+
+
+def _get_arguments(command: Command) -> List[str]:
+    # Commands given as a string are split on spaces, so arguments containing
+    # spaces have to be given in a list
+    if isinstance(command, str):
+        return command.split(" ")
+    return list(command)
+
+
+def _get_error(
+    arguments: List[str], returncode: int, output: _RingBuffer, errors: _RingBuffer,
+) -> CalledProcessError:
+    error_output = errors.getvalue()
+    # The error output is also part of the output, where callers look for the
+    # messages of helm
+    err = CalledProcessError(
+        returncode, arguments, output.getvalue() + error_output, error_output
+    )
+    error("%s", _LazyText(err.output))
+    return err
+
+
+def _kill(process: Union[Popen, asyncio.subprocess.Process]):
+    if not _HAS_PROCESS_GROUPS:
+        if process.returncode is None:
+            process.kill()
+        return
+    try:
+        # The command leads its process group, whose id is its process id
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        # Every process of the group has exited
+        pass
+
+
+def _read(stream: IO[bytes], buffer: _RingBuffer):
+    for chunk in iter(lambda: stream.read1(_CHUNK_SIZE), b""):  # type: ignore
+        buffer.write(chunk)
+
+
+def _join(readers: List[Thread], deadline: Optional[float]) -> bool:
+    """
+    :returns: Whether the readers finished before the deadline, given as a time of \
+        :func:`time.monotonic`
+    """
+    for reader in readers:
+        reader.join(None if deadline is None else max(deadline - time.monotonic(), 0))
+    return not any(reader.is_alive() for reader in readers)
+
+
+def custom_check_output(
+    command: Command,
+    timeout: Optional[float] = None,
+    max_output: Optional[int] = None,
+    max_error_output: int = MAX_ERROR_OUTPUT,
+) -> str:
+    """
+    Runs a command, reading its output and error output as they are written
+
+    :param command: The arguments of the command, or the command as a string, \
+        which is split on spaces
+    :param timeout: How many seconds the command can run for before it is killed
+    :param max_output: How many bytes at the end of the output are kept, all of \
+        them by default
+    :param max_error_output: How many bytes at the end of the error output are kept
+
+    :returns: The output of the command
+
+    :raises subprocess.CalledProcessError: If the command fails, with the kept \
+        output followed by the kept error output as its output
+    :raises subprocess.TimeoutExpired: If the command runs for longer than \
+        *timeout*, after it and the processes it started are killed
+    """
+    arguments = _get_arguments(command)
+    info("Running command: %s", _LazyCommand(arguments))
+    output = _RingBuffer(max_output)
+    errors = _RingBuffer(max_error_output)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    with Popen(
+        arguments, stdout=PIPE, stderr=PIPE, start_new_session=_HAS_PROCESS_GROUPS
+    ) as process:
+        readers = [
+            Thread(target=_read, args=(process.stdout, output), daemon=True),
+            Thread(target=_read, args=(process.stderr, errors), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+        try:
+            returncode = process.wait(timeout)
+            if not _join(readers, deadline):
+                # A process the command started still holds its output open
+                raise TimeoutExpired(arguments, timeout or 0)
+        except TimeoutExpired:
+            _kill(process)
+            process.wait()
+            if not _join(readers, time.monotonic() + _KILLED_READ_TIMEOUT):
+                # Closing the output would wait for the readers, which are left to
+                # finish once the process holding it exits
+                process.stdout = process.stderr = None
+            raise TimeoutExpired(
+                arguments, timeout or 0, output.getvalue(), errors.getvalue()
+            )
+        except BaseException:
+            # Interrupted, for example with Ctrl+C, which the command doesn't get
+            # itself in a session of its own
+            _kill(process)
+            raise
+    if returncode:
+        raise _get_error(arguments, returncode, output, errors)
+    content = output.getvalue()
+    info("Output from command:\n%s", _LazyText(content))
+    return content.decode("utf-8")
+
+
+async def _read_async(stream: asyncio.StreamReader, buffer: _RingBuffer):
+    while True:
+        chunk = await stream.read(_CHUNK_SIZE)
+        if not chunk:
+            return
+        buffer.write(chunk)
+
+
+async def _wait(
+    process: asyncio.subprocess.Process, readers: "asyncio.Future[Any]"
+) -> int:
+    await readers
+    return await process.wait()
 
 
-def custom_check_output(command: str):
-    info(f"Running command: {command}")
+async def custom_check_output_async(
+    command: Command,
+    timeout: Optional[float] = None,
+    max_output: Optional[int] = None,
+    max_error_output: int = MAX_ERROR_OUTPUT,
+) -> str:
+    """
+    Like :func:`custom_check_output`, but waits for the command without blocking the
+    event loop, raising the same errors. The command is also killed if the task
+    waiting for it is cancelled
+    """
+    arguments = _get_arguments(command)
+    info("Running command: %s", _LazyCommand(arguments))
+    output = _RingBuffer(max_output)
+    errors = _RingBuffer(max_error_output)
+    process = await asyncio.create_subprocess_exec(
+        *arguments,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=_HAS_PROCESS_GROUPS,
+    )
+    assert process.stdout is not None and process.stderr is not None
+    readers = asyncio.gather(
+        _read_async(process.stdout, output), _read_async(process.stderr, errors)
+    )
     try:
-        output = check_output(command.split(" "), stderr=STDOUT).decode("utf-8")
-    except CalledProcessError as err:
-        error(err.output.decode("utf-8"))
-        raise err
-    info(f"Output from command:\n{output}")
-    return output
+        # The output is read to its end within the timeout too, since a process the
+        # command started can keep it open after the command exits
+        returncode = await asyncio.wait_for(_wait(process, readers), timeout)
+    except BaseException as err:
+        _kill(process)
+        readers.cancel()
+        try:
+            # Process.wait also waits for the output to be closed, which a process
+            # that left the process group of the command could keep open
+            await asyncio.wait_for(process.wait(), _KILLED_READ_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass
+        if isinstance(err, asyncio.TimeoutError):
+            raise TimeoutExpired(
+                arguments, timeout or 0, output.getvalue(), errors.getvalue()
+            ) from err
+        raise
+    if returncode:
+        raise _get_error(arguments, returncode, output, errors)
+    content = output.getvalue()
+    info("Output from command:\n%s", _LazyText(content))
+    return content.decode("utf-8")
@@ -4,4 +4,6 @@ from avionix.chart.chart_builder import ChartBuilder
 from avionix.chart.chart_dependency import ChartDependency
 from avionix.chart.chart_info import ChartInfo
 from avionix.chart.chart_maintainer import ChartMaintainer
+from avionix.chart.orchestrator import ReleaseOrchestrator
+from avionix.chart.release_state import ReleaseStateCache
 from avionix.chart.values_yaml import Value, Values
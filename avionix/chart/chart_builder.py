@@ -1,23 +1,46 @@
-from logging import error, info
+import asyncio
+from contextlib import ExitStack
+from copy import copy
+from itertools import repeat
+from logging import info
 import os
 from pathlib import Path
 import re
 import shutil
 import subprocess
-from typing import Dict, List, Optional
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import yaml
 
-from avionix._process_utils import custom_check_output
+from avionix._process_utils import custom_check_output, custom_check_output_async
+from avionix.chart.chart_dependency import ChartDependency
 from avionix.chart.chart_info import ChartInfo
-from avionix.chart.utils import get_helm_installations
+from avionix.chart.chart_writer import ChartWriter, RegenerationReport
+from avionix.chart.dependency_cache import SHARED_DEPENDENCY_CACHE, DependencyCache
+from avionix.chart.dependency_resolver import (
+    SHARED_DEPENDENCY_RESOLVER,
+    DependencyResolver,
+)
+from avionix.chart.packaging import create_chart_archive
+from avionix.chart.release_digest import DIGEST_ANNOTATION, get_chart_digest
+from avionix.chart.release_state import SHARED_RELEASE_STATE, ReleaseStateCache
+from avionix.chart.repositories import SHARED_REPOSITORY_CACHE
+from avionix.chart.utils import HelmRelease
 from avionix.chart.values_yaml import Values
 from avionix.errors import (
     ChartNotInstalledError,
+    DependencyResolutionError,
     ErrorFactory,
     post_uninstall_handle_error,
 )
 from avionix.kube.base_objects import KubernetesBaseObject
+from avionix.yaml.deduplication import DeduplicationReport, SubtreeDeduplicator
+from avionix.yaml.emitters import get_emitter, get_stream_emitter
+from avionix.yaml.parallel import ParallelSerializer
+from avionix.yaml.yaml_handling import memoized
+
+# Helm options that change which release helm acts on
+_RELEASE_TARGET_OPTIONS = ("namespace", "n", "kube-context", "kubeconfig")
 
 
 class ChartBuilder:
@@ -33,8 +56,80 @@ class ChartBuilder:
     :param namespace: The namespace in which all chart components should be installed \
         This allows the convenience of not passing the namespace option to both \
         install and uninstall
+    :param values: The values to output in *values.yaml*
+    :param emitter: The name of the emitter used to write the chart files, one of \
+        "pyyaml", "libyaml", "fast" or "json". Defaults to DEFAULTS["emitter"] from \
+        :mod:`avionix.options`
+    :param deduplicate: Whether to write blocks repeated across the templates, such \
+        as identical containers, only once. The text of the templates is the same \
+        either way, and :attr:`deduplication_report` holds the work saved by the \
+        last call to :meth:`generate_chart`
+    :param stream: Whether to write the chart files as they are emitted instead of \
+        building the text of each file in memory first, which keeps memory use flat \
+        for very large objects such as custom resource definitions. The text of the \
+        templates is then neither memoized nor deduplicated
+    :param pack_templates: How to pack the objects into multi-document templates \
+        instead of writing one template per object. "kind" writes one template per \
+        kind, "namespace" one per namespace in the metadata of the objects, with \
+        objects without a namespace in *release-namespace.yaml*, and "size" fills \
+        each template until it holds at least pack_size bytes
+    :param pack_size: The size in bytes of the templates when packing by size
+    :param workers: The number of processes writing the templates. With more than \
+        one, the objects are pickled in chunks and written by a process pool, which \
+        gives the same files as writing them in this process. Objects that can't be \
+        pickled are written in this process. Not used when streaming
+    :param chunk_size: The number of objects sent to a worker process at a time, \
+        defaults to four chunks per worker
+    :param incremental: Whether to regenerate the chart in place, only writing the \
+        files whose content changed and removing files that are no longer part of \
+        the chart, instead of deleting the chart directory and writing every file. \
+        Unchanged files keep their modification time, and \
+        :attr:`regeneration_report` holds the files added, changed and removed by \
+        the last call to :meth:`generate_chart`
+    :param atomic: Whether to write the chart to a temporary directory next to the \
+        chart directory and then rename it to the chart directory, so that the \
+        chart directory never holds a partly written chart, even if generation \
+        fails. On Linux the two directories are swapped in a single step, \
+        elsewhere the chart directory is missing for a moment in between. The \
+        files are written by a background thread while the following templates \
+        are serialized. Can't be combined with incremental
+    :param template_names: How to name the templates when they are not packed. \
+        "position" names each template after the kind of its object and the \
+        position of the object among the objects of that kind, for example \
+        *Deployment-0.yaml*. "name" names it after the kind, namespace and name in \
+        the metadata of the object, for example *Deployment_monitoring_grafana.yaml*, \
+        so that the template of an object keeps its name when other objects are \
+        added or removed
+    :param release_state: The cache of the releases installed in the cluster used \
+        by :attr:`is_installed`, defaults to the cache shared by every ChartBuilder \
+        of the process
+    :param dependency_cache: The cache of the chart archives of dependencies. When \
+        installing or upgrading with the *dependency-update* option, the cached \
+        archives are copied into the *charts* directory of the chart, and helm only \
+        downloads the dependencies if any of them isn't cached. Defaults to the \
+        cache shared by every ChartBuilder of the process
+    :param dependency_resolver: Resolves the versions of the dependencies against \
+        the repository indexes helm already downloaded when installing or upgrading \
+        with the *dependency-update* option, and writes them to *Chart.lock*, so \
+        that helm downloads these versions without resolving them again. If a \
+        dependency can't be resolved, helm resolves every dependency as before. \
+        Defaults to the resolver shared by every ChartBuilder of the process
+    :param skip_unchanged: Whether :meth:`upgrade_chart` skips ``helm upgrade`` \
+        when the release is deployed with the same chart and options, so that no \
+        new revision is created. A digest of the generated chart and the options \
+        is stored in the *avionix.io/digest* annotation of *Chart.yaml* when \
+        installing or upgrading, and compared with the digest of the deployed \
+        release. Releases deployed without the annotation are upgraded once
+    :param timeout: How many seconds each helm command run by the builder can take \
+        before it is killed, raising :class:`subprocess.TimeoutExpired`. Unlike the \
+        *timeout* option of helm, which only bounds waiting for the resources of \
+        the release, this also bounds downloading the dependencies. No limit by \
+        default
     """
 
+    PACKING_MODES = ("kind", "namespace", "size")
+    TEMPLATE_NAMING_MODES = ("position", "name")
+
     def __init__(
         self,
         chart_info: ChartInfo,
@@ -43,7 +138,38 @@ class ChartBuilder:
         keep_chart: bool = False,
         namespace: Optional[str] = None,
         values: Optional[Values] = None,
+        emitter: Optional[str] = None,
+        deduplicate: bool = True,
+        stream: bool = False,
+        pack_templates: Optional[str] = None,
+        pack_size: int = 1024 * 1024,
+        workers: int = 1,
+        chunk_size: Optional[int] = None,
+        incremental: bool = False,
+        template_names: str = "position",
+        atomic: bool = False,
+        release_state: Optional[ReleaseStateCache] = None,
+        dependency_cache: Optional[DependencyCache] = None,
+        dependency_resolver: Optional[DependencyResolver] = None,
+        skip_unchanged: bool = False,
+        timeout: Optional[float] = None,
     ):
+        if pack_templates is not None and pack_templates not in self.PACKING_MODES:
+            raise ValueError(
+                f"Unknown packing mode {pack_templates!r}, choose one of "
+                f"{', '.join(self.PACKING_MODES)}"
+            )
+        if template_names not in self.TEMPLATE_NAMING_MODES:
+            raise ValueError(
+                f"Unknown template naming mode {template_names!r}, choose one of "
+                f"{', '.join(self.TEMPLATE_NAMING_MODES)}"
+            )
+        if incremental and atomic:
+            raise ValueError(
+                "A chart can't be generated both incrementally and atomically"
+            )
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
         self.chart_info = chart_info
         self.kubernetes_objects = kubernetes_objects
         self.chart_folder_path = Path(self.chart_info.name)
@@ -52,6 +178,33 @@ class ChartBuilder:
         self.__keep_chart = keep_chart
         self.__values = values
         self.namespace = namespace
+        self.emitter = emitter
+        self.deduplicate = deduplicate
+        self.deduplication_report: Optional[DeduplicationReport] = None
+        self.stream = stream
+        self.pack_templates = pack_templates
+        self.pack_size = pack_size
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.incremental = incremental
+        self.regeneration_report: Optional[RegenerationReport] = None
+        self.template_names = template_names
+        self.atomic = atomic
+        self.release_state = (
+            SHARED_RELEASE_STATE if release_state is None else release_state
+        )
+        self.dependency_cache = (
+            SHARED_DEPENDENCY_CACHE if dependency_cache is None else dependency_cache
+        )
+        self.dependency_resolver = (
+            SHARED_DEPENDENCY_RESOLVER
+            if dependency_resolver is None
+            else dependency_resolver
+        )
+        self.skip_unchanged = skip_unchanged
+        self.timeout = timeout
+        # The digest written to Chart.yaml of the chart last generated, if any
+        self.__digest = ""
         if output_directory:
             self.__templates_directory = Path(output_directory) / str(
                 self.__templates_directory
@@ -71,107 +224,407 @@ class ChartBuilder:
 
         :returns The template directory
         """
-        self.__delete_chart_directory()
-        os.makedirs(self.__templates_directory, exist_ok=True)
-        with open(self.__chart_yaml, "w+") as chart_yaml_file:
-            chart_yaml_file.write(str(self.chart_info))
+        return self.__generate_chart(keep_digest=False)
+
+    def __generate_chart(self, keep_digest: bool):
+        # When the digest is written after generating the chart, an incrementally
+        # regenerated Chart.yaml keeps the digest it has, so that it is only
+        # written again if the digest changed
+        self.__digest = ""
+        digest = self.__read_digest() if keep_digest and self.incremental else ""
+        self.regeneration_report = self.__generate(
+            ChartWriter(
+                self.chart_folder_path, self.incremental, self.atomic, self.stream
+            ),
+            digest,
+        )
+        return self.__templates_directory
+
+    def __read_digest(self) -> str:
+        try:
+            with open(self.__chart_yaml) as chart_yaml_file:
+                chart_yaml = yaml.safe_load(chart_yaml_file)
+        except (OSError, yaml.YAMLError):
+            return ""
+        if not isinstance(chart_yaml, dict):
+            return ""
+        return str((chart_yaml.get("annotations") or {}).get(DIGEST_ANNOTATION, ""))
+
+    def __get_chart_yaml_text(self, digest: str = "") -> str:
+        if not digest:
+            return self.chart_info._get_text(self.emitter)
+        chart_info = copy(self.chart_info)
+        chart_info.annotations = {
+            **(self.chart_info.annotations or {}),
+            DIGEST_ANNOTATION: digest,
+        }
+        return chart_info._get_text(self.emitter)
+
+    def package_chart(self) -> bytes:
+        """
+        Generates the chart in memory and packages it into a .tgz archive, like
+        ``helm package`` does, without writing anything to disk. The same objects,
+        chart info and values always give the same bytes, so archives can be cached
+        and compared by their digest
 
+        Dependencies are listed in *Chart.yaml* but are not included in the archive
+
+        :returns: The bytes of the archive
+        """
+        return create_chart_archive(self.chart_info.name, self.generate_chart_files())
+
+    def generate_chart_files(self) -> Dict[str, bytes]:
+        """
+        Generates the chart in memory instead of on disk, with the same files that
+        :meth:`generate_chart` writes, encoded as UTF-8
+
+        :returns: The content of each file of the chart, keyed by its path relative \
+            to the chart directory, such as *Chart.yaml*, *values.yaml* and \
+            *templates/Deployment-0.yaml*
+        """
+        files: Dict[str, bytes] = {}
+        self.__generate(
+            ChartWriter(self.chart_folder_path, stream=self.stream, files=files)
+        )
+        return files
+
+    def __generate(
+        self, writer: ChartWriter, digest: str = ""
+    ) -> Optional[RegenerationReport]:
+        emit = get_emitter(self.emitter)
+        self.__writer = writer
+        with ExitStack() as stack:
+            serializer = None
+            if self.workers > 1 and not self.stream:
+                # The worker processes are started before the background writer, as
+                # forking while other threads run can leave locks held in the workers
+                serializer = stack.enter_context(
+                    ParallelSerializer(
+                        self.workers, self.emitter, self.chunk_size, self.deduplicate
+                    )
+                )
+            writer.start()
+            try:
+                # Output memoized by earlier calls isn't used, since the objects may
+                # have been changed in place since
+                with memoized():
+                    self.__write_chart(emit, serializer, digest)
+            except BaseException:
+                writer.abort()
+                raise
+        return writer.finish()
+
+    def __write_chart(
+        self,
+        emit: Callable[[Any], str],
+        serializer: Optional[ParallelSerializer],
+        digest: str,
+    ):
+        self.__writer.make_directory(self.__templates_directory)
+        with self.__writer.open(self.__chart_yaml) as chart_yaml_file:
+            chart_yaml_file.write(self.__get_chart_yaml_text(digest))
+
+        # Texts are written as they are taken, so that with a background writer the
+        # templates are serialized while earlier ones are written to disk
+        texts: Iterable[Optional[str]]
+        if self.stream:
+            texts = repeat(None)
+        elif serializer is not None:
+            texts = serializer.get_texts(self.kubernetes_objects)
+            self.deduplication_report = serializer.report
+        elif self.deduplicate:
+            deduplicator = SubtreeDeduplicator(self.emitter)
+            texts = deduplicator.iter_texts(self.kubernetes_objects)
+            self.deduplication_report = deduplicator.report
+        else:
+            texts = (
+                kubernetes_object._get_text(self.emitter)
+                for kubernetes_object in self.kubernetes_objects
+            )
+
+        self.__write_templates(self.kubernetes_objects, texts)
+        with self.__writer.open(
+            self.__templates_directory.parent / "values.yaml"
+        ) as values_file:
+            if self.stream:
+                get_stream_emitter(self.emitter)(self.__get_values(), values_file)
+            else:
+                values_file.write(emit(self.__get_values()))
+
+    def __write_template(
+        self,
+        template: IO[str],
+        kubernetes_object: KubernetesBaseObject,
+        text: Optional[str],
+    ):
+        if text is None:
+            kubernetes_object._write_text(template, self.emitter)
+        else:
+            template.write(text)
+
+    @staticmethod
+    def __get_namespace_template_name(kubernetes_object: KubernetesBaseObject):
+        namespace = getattr(kubernetes_object.metadata, "namespace", None)
+        if namespace is None:
+            return "release-namespace"
+        return f"namespace-{namespace}"
+
+    @staticmethod
+    def __get_names_from_positions(
+        kubernetes_objects: List[KubernetesBaseObject],
+    ) -> List[str]:
         kind_count: Dict[str, int] = {}
-        for kubernetes_object in self.kubernetes_objects:
+        names = []
+        for kubernetes_object in kubernetes_objects:
             if kubernetes_object.kind not in kind_count:
                 kind_count[kubernetes_object.kind] = 0
             else:
                 kind_count[kubernetes_object.kind] += 1
-            with open(
-                self.__templates_directory / f"{kubernetes_object.kind}-"
-                f"{kind_count[kubernetes_object.kind]}.yaml",
-                "w",
-            ) as template:
-                template.write(str(kubernetes_object))
-        with open(
-            self.__templates_directory.parent / "values.yaml", "w"
-        ) as values_file:
-            values_file.write(self.__get_values_yaml())
-        return self.__templates_directory
+            names.append(
+                f"{kubernetes_object.kind}-{kind_count[kubernetes_object.kind]}"
+            )
+        return names
 
-    def _helm_list_repos(self) -> List[str]:
-        try:
-            return custom_check_output("helm repo list").split("\n")[1:]
-        except subprocess.CalledProcessError as err:
-            error_message = err.output.decode("utf-8").strip()
-            if error_message == "Error: no repositories to show":
-                return []
-            error(error_message)
-            raise err
-
-    def get_helm_repos(self):
-        repo_lines = self._helm_list_repos()
-        repo_to_url_dict = {}
-        for repo_line in repo_lines:
-            repo_line_no_extra_space = repo_line.strip()
-            match = re.match(
-                r"(?P<repo_name>.+?)\s+(?P<url>.+)", repo_line_no_extra_space
+    @staticmethod
+    def __get_names_from_metadata(
+        kubernetes_objects: List[KubernetesBaseObject],
+    ) -> List[str]:
+        names = []
+        # Compared in lower case for case insensitive file systems
+        used_names = set()
+        for kubernetes_object in kubernetes_objects:
+            parts = [
+                kubernetes_object.kind,
+                getattr(kubernetes_object.metadata, "namespace", None),
+                getattr(kubernetes_object.metadata, "name", None),
+            ]
+            # Kubernetes names never contain underscores, so the parts can't run
+            # into each other
+            name = "_".join(
+                re.sub(r"[^A-Za-z0-9.-]", "-", part) for part in parts if part
             )
-            if not repo_line_no_extra_space:
-                continue
-            if not match:
-                raise Exception(
-                    f"Could not match repo name pattern from output for "
-                    f"line {repo_line_no_extra_space}"
-                )
-            repo_to_url_dict[match.group("repo_name")] = match.group("url")
-        return repo_to_url_dict
+            # Objects with the same kind, namespace and name, or without a name,
+            # are numbered in the order they are given in
+            unique_name = name
+            count = 0
+            while unique_name.lower() in used_names:
+                count += 1
+                unique_name = f"{name}-{count}"
+            used_names.add(unique_name.lower())
+            names.append(unique_name)
+        return names
+
+    def __write_templates(
+        self,
+        kubernetes_objects: List[KubernetesBaseObject],
+        texts: Iterable[Optional[str]],
+    ):
+        objects = zip(kubernetes_objects, texts)
+        if self.pack_templates is None:
+            if self.template_names == "name":
+                names = self.__get_names_from_metadata(kubernetes_objects)
+            else:
+                names = self.__get_names_from_positions(kubernetes_objects)
+            for name, (kubernetes_object, text) in zip(names, objects):
+                with self.__writer.open(
+                    self.__templates_directory / f"{name}.yaml"
+                ) as template:
+                    self.__write_template(template, kubernetes_object, text)
+        elif self.pack_templates == "size":
+            self.__write_templates_by_size(objects)
+        else:
+            groups: Dict[str, List[Tuple[KubernetesBaseObject, Optional[str]]]] = {}
+            for kubernetes_object, text in objects:
+                if self.pack_templates == "kind":
+                    name = kubernetes_object.kind
+                else:
+                    name = self.__get_namespace_template_name(kubernetes_object)
+                groups.setdefault(name, []).append((kubernetes_object, text))
+            for name, group in groups.items():
+                with self.__writer.open(
+                    self.__templates_directory / f"{name}.yaml"
+                ) as template:
+                    for i, (kubernetes_object, text) in enumerate(group):
+                        if i:
+                            template.write("---\n")
+                        self.__write_template(template, kubernetes_object, text)
+
+    def __write_templates_by_size(
+        self, objects: Iterable[Tuple[KubernetesBaseObject, Optional[str]]]
+    ):
+        template: Optional[IO[str]] = None
+        template_count = 0
+        try:
+            for kubernetes_object, text in objects:
+                if template is None:
+                    template = self.__writer.open(
+                        self.__templates_directory / f"templates-{template_count}.yaml"
+                    )
+                    template_count += 1
+                else:
+                    template.write("---\n")
+                self.__write_template(template, kubernetes_object, text)
+                if template.tell() >= self.pack_size:
+                    template.close()
+                    template = None
+        finally:
+            if template is not None:
+                template.close()
+
+    def get_helm_repos(self) -> Dict[str, str]:
+        """
+        :returns: The URL of each chart repository known to helm, keyed by \
+            repository name. The repositories are read from the repository config \
+            file of helm, see :class:`~avionix.chart.repositories.HelmRepositoryCache`
+        """
+        return SHARED_REPOSITORY_CACHE.get_repositories()
+
+    async def get_helm_repos_async(self) -> Dict[str, str]:
+        """
+        Like :meth:`get_helm_repos`, but reads the repository config file of helm \
+        without blocking the event loop
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            None, SHARED_REPOSITORY_CACHE.get_repositories
+        )
 
     def add_dependency_repos(self):
         """
-        Adds repos for all dependencies listed
+        Adds repos for all dependencies listed. The missing repos are registered
+        together and their indexes downloaded with a single ``helm repo update``
+        """
+        info("Adding dependencies...")
+        SHARED_REPOSITORY_CACHE.add_repositories(self.__get_missing_repos())
+
+    async def add_dependency_repos_async(self):
+        """
+        Like :meth:`add_dependency_repos`, but runs helm without blocking the event \
+        loop
         """
         info("Adding dependencies...")
-        installed_repos = self.get_helm_repos()
+        await SHARED_REPOSITORY_CACHE.add_repositories_async(
+            await self.__get_missing_repos_async()
+        )
+
+    def __get_missing_repos(self) -> Dict[str, str]:
+        return self.__get_repos_to_add(self.get_helm_repos())
+
+    async def __get_missing_repos_async(self) -> Dict[str, str]:
+        return self.__get_repos_to_add(await self.get_helm_repos_async())
+
+    def __get_repos_to_add(self, installed_repos: Dict[str, str]) -> Dict[str, str]:
+        return {
+            dependency.local_repo_name: dependency.repository
+            for dependency in self.__get_missing_dependencies(installed_repos)
+        }
+
+    def __get_missing_dependencies(
+        self, installed_repos: Dict[str, str]
+    ) -> Iterator[ChartDependency]:
         for dependency in self.chart_info.dependencies:
             if (
                 installed_repos.get(dependency.local_repo_name) == dependency.repository
                 or dependency.is_local
             ):
                 continue
-            dependency.add_repo()
-            installed_repos[dependency.local_repo_name] = dependency.repository
+            yield dependency
 
-    def __get_values_yaml(self):
+    def __get_values(self):
         values = {}
         for dependency in self.chart_info.dependencies:
             values.update(dependency.get_values_yaml())
         if self.__values:
             values.update(self.__values.values)
-        return yaml.dump(values)
+        return values
 
     @staticmethod
-    def __parse_options(options: Optional[Dict[str, Optional[str]]] = None):
-        option_string = ""
+    def __parse_options(
+        options: Optional[Dict[str, Optional[str]]] = None
+    ) -> List[str]:
+        arguments: List[str] = []
         if options is None:
-            return option_string
+            return arguments
         for option in options:
-            option_string += f" --{option}"
+            arguments.append(f"--{option}")
 
             # Add value after flag if one is given
             value = options[option]
             if value:
-                option_string += f" {value}"
-        return option_string
+                arguments.append(value)
+        return arguments
+
+    def __record_release(
+        self, options: Optional[Dict[str, Optional[str]]], installed: bool
+    ):
+        """
+        Updates the release state after helm changed the release, unless helm was
+        only asked to show what it would do
+        """
+        options = options or {}
+        if "dry-run" in options:
+            return
+        if any(option in options for option in _RELEASE_TARGET_OPTIONS):
+            # The release may not be where the builder expects it
+            self.release_state.invalidate()
+        elif installed:
+            self.release_state.set_installed(
+                self.chart_info.name, self.namespace, self.__digest
+            )
+        else:
+            self.release_state.set_uninstalled(self.chart_info.name, self.namespace)
+
+    def __get_timeout(self, timeout: Optional[float]) -> Optional[float]:
+        return self.timeout if timeout is None else timeout
+
+    def __run_helm(
+        self,
+        command: List[str],
+        options: Optional[Dict[str, Optional[str]]],
+        installed: bool,
+        timeout: Optional[float],
+    ):
+        try:
+            custom_check_output(command, timeout=self.__get_timeout(timeout))
+        except subprocess.TimeoutExpired:
+            # helm was killed, possibly part way through changing the release
+            self.release_state.invalidate(self.chart_info.name, self.namespace)
+            raise
+        self.__record_release(options, installed)
+
+    async def __run_helm_async(
+        self,
+        command: List[str],
+        options: Optional[Dict[str, Optional[str]]],
+        installed: bool,
+        timeout: Optional[float],
+    ):
+        try:
+            await custom_check_output_async(
+                command, timeout=self.__get_timeout(timeout)
+            )
+        except subprocess.TimeoutExpired:
+            self.release_state.invalidate(self.chart_info.name, self.namespace)
+            raise
+        self.__record_release(options, installed)
 
     def __get_helm_install_command(
         self, options: Optional[Dict[str, Optional[str]]] = None
-    ):
-        command = (
-            f"helm install {self.chart_info.name} {self.chart_folder_path.resolve()}"
-        )
+    ) -> List[str]:
+        command = ["helm", "install", self.chart_info.name]
+        command.append(str(self.chart_folder_path.resolve()))
         return self.__handle_namespace(command) + self.__parse_options(options)
 
-    def run_helm_install(self, options: Optional[Dict[str, Optional[str]]] = None):
+    def run_helm_install(
+        self,
+        options: Optional[Dict[str, Optional[str]]] = None,
+        timeout: Optional[float] = None,
+    ):
         """
         Runs helm install on the chart
 
         :param options: A dictionary of command line arguments to pass to helm
+        :param timeout: How many seconds helm can run for before it is killed, \
+            defaults to the timeout of the ChartBuilder
 
         :Example:
 
@@ -179,22 +632,44 @@ class ChartBuilder:
 
         >>> self.run_helm_install({"dependency_update": None, "v": "info"})
         """
-        custom_check_output(self.__get_helm_install_command(options))
+        self.__run_helm(
+            self.__get_helm_install_command(options), options, True, timeout
+        )
+
+    @staticmethod
+    def __raise_known_error(err: subprocess.CalledProcessError) -> str:
+        """
+        Raises the error matching the output of a failed helm command, if any
+
+        :returns: The output of the command
+        """
+        decoded = err.output.decode("utf-8")
+        error = ErrorFactory(decoded).get_error()
+        if error is not None:
+            raise error
+        return decoded
 
-    def __handle_installation(self, options: Optional[Dict[str, Optional[str]]] = None):
+    def __handle_installation(
+        self,
+        options: Optional[Dict[str, Optional[str]]] = None,
+        timeout: Optional[float] = None,
+    ):
         try:
             info(f"Installing helm chart {self.chart_info.name}...")
-            self.run_helm_install(options)
+            self.run_helm_install(options, timeout)
         except subprocess.CalledProcessError as err:
-            decoded = err.output.decode("utf-8")
-            error = ErrorFactory(decoded).get_error()
-            if error is not None:
-                raise error
+            decoded = self.__raise_known_error(err)
+            # A failed installation can still leave a release behind
+            self.release_state.invalidate(self.chart_info.name, self.namespace)
             if self.is_installed:
-                self.uninstall_chart()
+                self.uninstall_chart(timeout=timeout)
             raise post_uninstall_handle_error(decoded)
 
-    def install_chart(self, options: Optional[Dict[str, Optional[str]]] = None):
+    def install_chart(
+        self,
+        options: Optional[Dict[str, Optional[str]]] = None,
+        timeout: Optional[float] = None,
+    ):
         """
         Generates and installs the helm chart onto kubernetes and handles all failures.
         It will also add the repos of all listed dependencies.
@@ -206,28 +681,37 @@ class ChartBuilder:
         so if working with an existing chart, please use upgrade_chart instead
 
         :param options: A dictionary of command line arguments to pass to helm
+        :param timeout: How many seconds helm can run for before it is killed, \
+            defaults to the timeout of the ChartBuilder
 
         For example, to run an install with updated dependencies and with verbose
         logging:
         >>> self.helm_install({"dependency_update": None, "v": "info"})
         """
-        self.generate_chart()
-        self.add_dependency_repos()
-        self.__handle_installation(options)
+        options = self.__prepare_chart(options)
+        if self.skip_unchanged:
+            self.__write_digest(options)
+        self.__handle_installation(options, timeout)
         if not self.__keep_chart:
             self.__delete_chart_directory()
 
     def __get_helm_uninstall_command(
         self, options: Optional[Dict[str, Optional[str]]] = None
-    ):
-        command = f"helm uninstall {self.chart_info.name}"
+    ) -> List[str]:
+        command = ["helm", "uninstall", self.chart_info.name]
         return self.__handle_namespace(command) + self.__parse_options(options)
 
-    def run_helm_uninstall(self, options: Optional[Dict[str, Optional[str]]] = None):
+    def run_helm_uninstall(
+        self,
+        options: Optional[Dict[str, Optional[str]]] = None,
+        timeout: Optional[float] = None,
+    ):
         """
         Runs helm uninstall
 
         :param options: A dictionary of command line arguments to pass to helm
+        :param timeout: How many seconds helm can run for before it is killed, \
+            defaults to the timeout of the ChartBuilder
 
         :Example:
 
@@ -238,7 +722,9 @@ class ChartBuilder:
         >>> )
         """
         info(f"Uninstalling chart {self.chart_info.name}")
-        custom_check_output(self.__get_helm_uninstall_command(options))
+        self.__run_helm(
+            self.__get_helm_uninstall_command(options), options, False, timeout
+        )
 
     def __check_if_installed(self):
         info(f"Checking if helm chart {self.chart_info.name} is installed")
@@ -248,16 +734,24 @@ class ChartBuilder:
             )
 
     def __handle_uninstallation(
-        self, options: Optional[Dict[str, Optional[str]]] = None
+        self,
+        options: Optional[Dict[str, Optional[str]]] = None,
+        timeout: Optional[float] = None,
     ):
         self.__check_if_installed()
-        self.run_helm_uninstall(options)
+        self.run_helm_uninstall(options, timeout)
 
-    def uninstall_chart(self, options: Optional[Dict[str, Optional[str]]] = None):
+    def uninstall_chart(
+        self,
+        options: Optional[Dict[str, Optional[str]]] = None,
+        timeout: Optional[float] = None,
+    ):
         """
         Uninstalls the chart if present, if not present, raises an error
 
         :param options: A dictionary of command line arguments to pass to helm
+        :param timeout: How many seconds helm can run for before it is killed, \
+            defaults to the timeout of the ChartBuilder
 
         :Example:
 
@@ -267,70 +761,483 @@ class ChartBuilder:
         >>>    }
         >>> )
         """
-        self.__handle_uninstallation(options)
+        self.__handle_uninstallation(options, timeout)
 
-    def __handle_namespace(self, command: str):
+    def __handle_namespace(self, command: List[str]) -> List[str]:
         if self.namespace is not None:
-            return command + f" -n {self.namespace}"
+            return command + ["-n", self.namespace]
         return command
 
     def __get_helm_upgrade_command(
         self, options: Optional[Dict[str, Optional[str]]] = None
-    ):
-        command = f"helm upgrade {self.chart_info.name} {self.chart_folder_path}"
+    ) -> List[str]:
+        command = ["helm", "upgrade", self.chart_info.name, str(self.chart_folder_path)]
         return self.__handle_namespace(command) + self.__parse_options(options)
 
-    def __handle_upgrade(self, options: Optional[Dict[str, Optional[str]]] = None):
+    def __handle_upgrade(
+        self,
+        options: Optional[Dict[str, Optional[str]]] = None,
+        timeout: Optional[float] = None,
+    ):
         try:
-            self.run_helm_upgrade(options)
+            self.run_helm_upgrade(options, timeout)
         except subprocess.CalledProcessError as err:
-            decoded = err.output.decode("utf-8")
-            error = ErrorFactory(decoded).get_error()
-            if error is not None:
-                raise error
-            raise post_uninstall_handle_error(decoded)
+            self.release_state.invalidate(self.chart_info.name, self.namespace)
+            raise post_uninstall_handle_error(self.__raise_known_error(err))
 
-    def run_helm_upgrade(self, options: Optional[Dict[str, Optional[str]]] = None):
+    def run_helm_upgrade(
+        self,
+        options: Optional[Dict[str, Optional[str]]] = None,
+        timeout: Optional[float] = None,
+    ):
         """
         Runs 'helm upgrade' on the chart
 
         :param options: A dictionary of command line arguments to pass to helm
+        :param timeout: How many seconds helm can run for before it is killed, \
+            defaults to the timeout of the ChartBuilder
 
         :Example:
 
         >>> self.run_helm_upgrade(options={"atomic": None, "version": "2.0"})
         """
         info(f"Upgrading helm chart {self.chart_info.name}")
-        custom_check_output(self.__get_helm_upgrade_command(options))
+        self.__run_helm(
+            self.__get_helm_upgrade_command(options), options, True, timeout
+        )
 
-    def upgrade_chart(self, options: Optional[Dict[str, Optional[str]]] = None):
+    def upgrade_chart(
+        self,
+        options: Optional[Dict[str, Optional[str]]] = None,
+        timeout: Optional[float] = None,
+    ):
         """
-        Generates and upgrades the helm chart
+        Generates and upgrades the helm chart. With *skip_unchanged* set on the
+        ChartBuilder, helm isn't run if the release is already deployed with the same
+        chart and options
 
         :param options: A dictionary of command line arguments to pass to helm
+        :param timeout: How many seconds helm can run for before it is killed, \
+            defaults to the timeout of the ChartBuilder
 
         :Example:
 
         >>> self.upgrade_chart(options={"atomic": None, "version": "2.0"})
         """
         self.__check_if_installed()
-        self.generate_chart()
-        self.add_dependency_repos()
+        options = self.__prepare_chart(options)
+        if self.skip_unchanged and self.__is_unchanged(
+            self.__write_digest(options), options
+        ):
+            return
+        self.__handle_upgrade(options, timeout)
+
+    def __get_helm_apply_command(
+        self, options: Optional[Dict[str, Optional[str]]] = None
+    ) -> List[str]:
+        command = ["helm", "upgrade", "--install", self.chart_info.name]
+        command.append(str(self.chart_folder_path.resolve()))
+        return self.__handle_namespace(command) + self.__parse_options(options)
+
+    def run_helm_apply(
+        self,
+        options: Optional[Dict[str, Optional[str]]] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Runs 'helm upgrade --install' on the chart
+
+        :param options: A dictionary of command line arguments to pass to helm
+        :param timeout: How many seconds helm can run for before it is killed, \
+            defaults to the timeout of the ChartBuilder
+        """
+        info(f"Applying helm chart {self.chart_info.name}")
+        self.__run_helm(self.__get_helm_apply_command(options), options, True, timeout)
+
+    def apply_chart(
+        self,
+        options: Optional[Dict[str, Optional[str]]] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Generates the chart and installs it, or upgrades it if it is already
+        installed, with a single ``helm upgrade --install``, so without first
+        checking whether the release is installed. Failures raise the same errors as
+        :meth:`install_chart`, but a release that failed isn't uninstalled, pass the
+        *atomic* option to have helm roll it back or uninstall it. With
+        *skip_unchanged* set on the ChartBuilder, helm isn't run if the release is
+        already deployed with the same chart and options
+
+        Note that the generated chart will be deleted if *keep_chart* is not set to
+        true on ChartBuilder
+
+        :param options: A dictionary of command line arguments to pass to helm
+        :param timeout: How many seconds helm can run for before it is killed, \
+            defaults to the timeout of the ChartBuilder
+
+        :Example:
+
+        >>> self.apply_chart(options={"atomic": None, "wait": None})
+        """
+        options = self.__prepare_chart(options)
+        if not (
+            self.skip_unchanged
+            and self.__is_unchanged(self.__write_digest(options), options)
+        ):
+            try:
+                self.run_helm_apply(options, timeout)
+            except subprocess.CalledProcessError as err:
+                self.release_state.invalidate(self.chart_info.name, self.namespace)
+                raise post_uninstall_handle_error(self.__raise_known_error(err))
+        if not self.__keep_chart:
+            self.__delete_chart_directory()
+
+    def __prepare_chart(
+        self, options: Optional[Dict[str, Optional[str]]]
+    ) -> Optional[Dict[str, Optional[str]]]:
+        # Generates the chart and gets its dependencies, returning a copy of the
+        # options without the ones handled here
+        self.__generate_chart(keep_digest=self.skip_unchanged)
+        options = None if options is None else dict(options)
+        if self.__pop_dependency_update(options):
+            self.__update_dependencies()
+        else:
+            self.add_dependency_repos()
+        return options
+
+    async def __prepare_chart_async(
+        self, options: Optional[Dict[str, Optional[str]]]
+    ) -> Optional[Dict[str, Optional[str]]]:
+        await self.__generate_chart_in_executor()
+        options = None if options is None else dict(options)
+        if self.__pop_dependency_update(options):
+            await self.__update_dependencies_async()
+        else:
+            await self.add_dependency_repos_async()
+        return options
+
+    def __write_digest(self, options: Optional[Dict[str, Optional[str]]]) -> str:
+        # Written after the dependencies are downloaded, as the digest covers them.
+        # The digest doesn't cover itself, so Chart.yaml is taken without it
+        digest = get_chart_digest(
+            self.chart_folder_path,
+            options,
+            self.__get_chart_yaml_text().encode("utf-8"),
+        )
+        self.__writer.replace(self.__chart_yaml, self.__get_chart_yaml_text(digest))
+        self.__digest = digest
+        return digest
+
+    def __can_skip_upgrade(self, release: Optional[HelmRelease], digest: str) -> bool:
+        if release is None or release.digest != digest or release.status != "deployed":
+            return False
+        info(f"Helm chart {self.chart_info.name} is unchanged, skipping the upgrade")
+        return True
+
+    def __is_unchanged(
+        self, digest: str, options: Optional[Dict[str, Optional[str]]]
+    ) -> bool:
+        if any(option in (options or {}) for option in _RELEASE_TARGET_OPTIONS):
+            # The deployed release may not be the one the builder looks up
+            return False
+        release = self.release_state.get_release(self.chart_info.name, self.namespace)
+        if release is not None and not release.digest:
+            # Releases listed by helm list have no digest, so look it up on its own
+            self.release_state.invalidate(self.chart_info.name, self.namespace)
+            release = self.release_state.get_release(
+                self.chart_info.name, self.namespace
+            )
+        return self.__can_skip_upgrade(release, digest)
+
+    async def __is_unchanged_async(
+        self, digest: str, options: Optional[Dict[str, Optional[str]]]
+    ) -> bool:
+        if any(option in (options or {}) for option in _RELEASE_TARGET_OPTIONS):
+            return False
+        release = await self.release_state.get_release_async(
+            self.chart_info.name, self.namespace
+        )
+        if release is not None and not release.digest:
+            self.release_state.invalidate(self.chart_info.name, self.namespace)
+            release = await self.release_state.get_release_async(
+                self.chart_info.name, self.namespace
+            )
+        return self.__can_skip_upgrade(release, digest)
+
+    async def __write_digest_async(
+        self, options: Optional[Dict[str, Optional[str]]]
+    ) -> str:
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.__write_digest, options
+        )
+
+    @staticmethod
+    def __pop_dependency_update(options: Optional[Dict[str, Optional[str]]]) -> bool:
         update_depenedencies = "dependency-update"
         if options is not None and update_depenedencies in options:
-            custom_check_output(
-                f"helm dependency update {self.chart_folder_path.resolve()}"
-            )
             del options[update_depenedencies]
-        self.__handle_upgrade(options)
+            return True
+        return False
+
+    def __get_charts_directory(self) -> Path:
+        return self.chart_folder_path / "charts"
+
+    def __prepare_dependencies(
+        self,
+    ) -> Tuple[Optional[List[str]], List[ChartDependency]]:
+        # Returns the helm command that still has to download the dependencies, if
+        # any, and the dependencies it downloads
+        dependencies = self.chart_info.dependencies
+        if not dependencies:
+            return None, dependencies
+        try:
+            dependencies = self.dependency_resolver.write_lock(
+                dependencies, self.chart_folder_path
+            )
+            command = ["helm", "dependency", "build"]
+            command += [str(self.chart_folder_path.resolve()), "--skip-refresh"]
+        except DependencyResolutionError as err:
+            info(f"Letting helm resolve the dependencies: {err}")
+            command = ["helm", "dependency", "update"]
+            command.append(str(self.chart_folder_path.resolve()))
+        # helm downloads every dependency again if any is missing, so the cached
+        # archives are only used when all of them are cached
+        if not self.dependency_cache.vendor(
+            dependencies, self.__get_charts_directory()
+        ):
+            info(f"Using cached dependencies of helm chart {self.chart_info.name}")
+            return None, dependencies
+        return command, dependencies
+
+    def __update_dependencies(self):
+        command, dependencies = self.__prepare_dependencies()
+        if command is None:
+            return
+        self.add_dependency_repos()
+        custom_check_output(command, timeout=self.timeout)
+        self.dependency_cache.store(dependencies, self.__get_charts_directory())
+
+    async def __update_dependencies_async(self):
+        loop = asyncio.get_running_loop()
+        command, dependencies = await loop.run_in_executor(
+            None, self.__prepare_dependencies
+        )
+        if command is None:
+            return
+        await self.add_dependency_repos_async()
+        await custom_check_output_async(command, timeout=self.timeout)
+        await loop.run_in_executor(
+            None,
+            self.dependency_cache.store,
+            dependencies,
+            self.__get_charts_directory(),
+        )
 
     @property
     def is_installed(self):
+        """
+        :return: True if chart with the given name is already installed in the chart \
+            builders namespace, else False. The release is looked up in \
+            :attr:`release_state`, which only runs helm when it wasn't looked up \
+            recently
+        """
+        return self.release_state.is_installed(self.chart_info.name, self.namespace)
+
+    # The asyncio counterparts of the methods running helm, which wait for helm
+    # without blocking the event loop so that one loop can drive many releases
+
+    async def is_installed_async(self) -> bool:
         """
         :return: True if chart with the given name is already installed in the chart \
             builders namespace, else False
         """
-        installations = get_helm_installations(self.namespace)
-        if not installations:
-            return False
-        return self.chart_info.name in installations["NAME"]
+        return await self.release_state.is_installed_async(
+            self.chart_info.name, self.namespace
+        )
+
+    async def __generate_chart_in_executor(self):
+        # Generating the chart is CPU and disk bound, so it is done in a thread
+        await asyncio.get_running_loop().run_in_executor(
+            None, self.__generate_chart, self.skip_unchanged
+        )
+
+    async def run_helm_install_async(
+        self,
+        options: Optional[Dict[str, Optional[str]]] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Like :meth:`run_helm_install`, but runs helm without blocking the event loop
+
+        :param options: A dictionary of command line arguments to pass to helm
+        :param timeout: How many seconds helm can run for before it is killed, \
+            defaults to the timeout of the ChartBuilder
+        """
+        await self.__run_helm_async(
+            self.__get_helm_install_command(options), options, True, timeout
+        )
+
+    async def install_chart_async(
+        self,
+        options: Optional[Dict[str, Optional[str]]] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Like :meth:`install_chart`, but runs helm without blocking the event loop.
+        Failures raise the same errors
+
+        :param options: A dictionary of command line arguments to pass to helm
+        :param timeout: How many seconds helm can run for before it is killed, \
+            defaults to the timeout of the ChartBuilder
+
+        :Example:
+
+        >>> await asyncio.gather(
+        >>>     *(builder.install_chart_async() for builder in builders)
+        >>> )
+        """
+        options = await self.__prepare_chart_async(options)
+        if self.skip_unchanged:
+            await self.__write_digest_async(options)
+        try:
+            info(f"Installing helm chart {self.chart_info.name}...")
+            await self.run_helm_install_async(options, timeout)
+        except subprocess.CalledProcessError as err:
+            decoded = self.__raise_known_error(err)
+            self.release_state.invalidate(self.chart_info.name, self.namespace)
+            if await self.is_installed_async():
+                await self.uninstall_chart_async(timeout=timeout)
+            raise post_uninstall_handle_error(decoded)
+        if not self.__keep_chart:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.__delete_chart_directory
+            )
+
+    async def run_helm_uninstall_async(
+        self,
+        options: Optional[Dict[str, Optional[str]]] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Like :meth:`run_helm_uninstall`, but runs helm without blocking the event \
+        loop
+
+        :param options: A dictionary of command line arguments to pass to helm
+        :param timeout: How many seconds helm can run for before it is killed, \
+            defaults to the timeout of the ChartBuilder
+        """
+        info(f"Uninstalling chart {self.chart_info.name}")
+        await self.__run_helm_async(
+            self.__get_helm_uninstall_command(options), options, False, timeout
+        )
+
+    async def __check_if_installed_async(self):
+        info(f"Checking if helm chart {self.chart_info.name} is installed")
+        if not await self.is_installed_async():
+            raise ChartNotInstalledError(
+                f'Error: chart "{self.chart_info.name}" is not installed'
+            )
+
+    async def uninstall_chart_async(
+        self,
+        options: Optional[Dict[str, Optional[str]]] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Like :meth:`uninstall_chart`, but runs helm without blocking the event loop
+
+        :param options: A dictionary of command line arguments to pass to helm
+        :param timeout: How many seconds helm can run for before it is killed, \
+            defaults to the timeout of the ChartBuilder
+        """
+        await self.__check_if_installed_async()
+        await self.run_helm_uninstall_async(options, timeout)
+
+    async def run_helm_upgrade_async(
+        self,
+        options: Optional[Dict[str, Optional[str]]] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Like :meth:`run_helm_upgrade`, but runs helm without blocking the event loop
+
+        :param options: A dictionary of command line arguments to pass to helm
+        :param timeout: How many seconds helm can run for before it is killed, \
+            defaults to the timeout of the ChartBuilder
+        """
+        info(f"Upgrading helm chart {self.chart_info.name}")
+        await self.__run_helm_async(
+            self.__get_helm_upgrade_command(options), options, True, timeout
+        )
+
+    async def upgrade_chart_async(
+        self,
+        options: Optional[Dict[str, Optional[str]]] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Like :meth:`upgrade_chart`, but runs helm without blocking the event loop.
+        Failures raise the same errors
+
+        :param options: A dictionary of command line arguments to pass to helm
+        :param timeout: How many seconds helm can run for before it is killed, \
+            defaults to the timeout of the ChartBuilder
+        """
+        await self.__check_if_installed_async()
+        options = await self.__prepare_chart_async(options)
+        if self.skip_unchanged and await self.__is_unchanged_async(
+            await self.__write_digest_async(options), options
+        ):
+            return
+        try:
+            await self.run_helm_upgrade_async(options, timeout)
+        except subprocess.CalledProcessError as err:
+            self.release_state.invalidate(self.chart_info.name, self.namespace)
+            raise post_uninstall_handle_error(self.__raise_known_error(err))
+
+    async def run_helm_apply_async(
+        self,
+        options: Optional[Dict[str, Optional[str]]] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Like :meth:`run_helm_apply`, but runs helm without blocking the event loop
+
+        :param options: A dictionary of command line arguments to pass to helm
+        :param timeout: How many seconds helm can run for before it is killed, \
+            defaults to the timeout of the ChartBuilder
+        """
+        info(f"Applying helm chart {self.chart_info.name}")
+        await self.__run_helm_async(
+            self.__get_helm_apply_command(options), options, True, timeout
+        )
+
+    async def apply_chart_async(
+        self,
+        options: Optional[Dict[str, Optional[str]]] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Like :meth:`apply_chart`, but runs helm without blocking the event loop.
+        Failures raise the same errors
+
+        :param options: A dictionary of command line arguments to pass to helm
+        :param timeout: How many seconds helm can run for before it is killed, \
+            defaults to the timeout of the ChartBuilder
+        """
+        options = await self.__prepare_chart_async(options)
+        if not (
+            self.skip_unchanged
+            and await self.__is_unchanged_async(
+                await self.__write_digest_async(options), options
+            )
+        ):
+            try:
+                await self.run_helm_apply_async(options, timeout)
+            except subprocess.CalledProcessError as err:
+                self.release_state.invalidate(self.chart_info.name, self.namespace)
+                raise post_uninstall_handle_error(self.__raise_known_error(err))
+        if not self.__keep_chart:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.__delete_chart_directory
+            )
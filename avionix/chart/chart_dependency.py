@@ -1,6 +1,7 @@
 from typing import Optional
+import warnings
 
-from avionix._process_utils import custom_check_output
+from avionix.chart.repositories import SHARED_REPOSITORY_CACHE
 from avionix.kube.base_objects import HelmYaml
 
 
@@ -42,7 +43,39 @@ class ChartDependency(HelmYaml):
         return {}
 
     def add_repo(self):
-        custom_check_output(f"helm repo add {self.__local_repo_name} {self.repository}")
+        """
+        Adds the repository of this dependency to helm
+
+        .. deprecated::
+            Use ``SHARED_REPOSITORY_CACHE.add_repositories``, which adds several
+            repositories at once
+        """
+        warnings.warn(
+            "ChartDependency.add_repo is deprecated, use "
+            "SHARED_REPOSITORY_CACHE.add_repositories instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        SHARED_REPOSITORY_CACHE.add_repositories(
+            {self.__local_repo_name: self.repository}
+        )
+
+    async def add_repo_async(self):
+        """
+        Like :meth:`add_repo`, without blocking the event loop
+
+        .. deprecated::
+            Use ``SHARED_REPOSITORY_CACHE.add_repositories_async``
+        """
+        warnings.warn(
+            "ChartDependency.add_repo_async is deprecated, use "
+            "SHARED_REPOSITORY_CACHE.add_repositories_async instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        await SHARED_REPOSITORY_CACHE.add_repositories_async(
+            {self.__local_repo_name: self.repository}
+        )
 
     @property
     def is_local(self):
@@ -0,0 +1,418 @@
+"""
+Writing the files of a chart, either from scratch, incrementally, in which case
+only the files whose content changed are written and files that are no longer part
+of the chart are removed, or atomically, in which case the chart is written to a
+temporary directory next to the chart directory and then swapped into place. The
+files can also be kept in memory instead of being written to disk
+"""
+
+import ctypes
+import errno
+from io import BytesIO, TextIOWrapper
+import locale
+import os
+from pathlib import Path
+from queue import Queue
+import shutil
+import tempfile
+from threading import Thread
+from typing import IO, Callable, Dict, List, Optional, Set, Tuple
+
+# The number of files waiting for the background writer before writing more waits,
+# which bounds the memory used by files that were serialized but not yet written
+_WRITE_QUEUE_SIZE = 64
+
+# Created by helm dependency update rather than by ChartBuilder, so kept when
+# regenerating a chart incrementally
+_HELM_MANAGED = ("charts", "Chart.lock")
+
+# Swaps two paths in a single step, only available on Linux
+try:
+    _renameat2 = ctypes.CDLL(None, use_errno=True).renameat2
+    _renameat2.argtypes = [
+        ctypes.c_int,
+        ctypes.c_char_p,
+        ctypes.c_int,
+        ctypes.c_char_p,
+        ctypes.c_uint,
+    ]
+except (AttributeError, OSError, TypeError):  # pragma: no cover
+    _renameat2 = None  # type: ignore
+
+_AT_FDCWD = -100
+_RENAME_EXCHANGE = 2
+
+# Returned by renameat2 for file systems that can't swap paths
+_EXCHANGE_UNSUPPORTED = (errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP)
+
+
+def _exchange(first: Path, second: Path) -> bool:
+    """
+    Swaps two existing paths in a single step, so that no reader finds either of
+    them missing
+
+    :returns: Whether the paths were swapped, False if the platform or the file \
+        system can't swap paths
+    """
+    if _renameat2 is None:  # pragma: no cover
+        return False
+    if not _renameat2(
+        _AT_FDCWD, os.fsencode(first), _AT_FDCWD, os.fsencode(second), _RENAME_EXCHANGE
+    ):
+        return True
+    error = ctypes.get_errno()
+    if error in _EXCHANGE_UNSUPPORTED:  # pragma: no cover
+        return False
+    raise OSError(error, os.strerror(error), str(first), None, str(second))
+
+
+def _read_umask() -> int:
+    # Reading the umask means setting it, which would race with files created by
+    # other threads, so it is read once, on import
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+_UMASK = _read_umask()
+
+
+def _get_mode(mode: int) -> int:
+    # The mode the umask leaves of a mode os.makedirs or open would give a new file
+    return mode & ~_UMASK
+
+
+class RegenerationReport:
+    """
+    The files of a chart that were changed by regenerating it incrementally. Paths
+    are relative to the chart directory
+
+    :param added: The files that did not exist before
+    :param changed: The files whose content changed
+    :param removed: The files that are no longer part of the chart
+    :param unchanged: The files that were left untouched
+    """
+
+    def __init__(
+        self,
+        added: Optional[List[str]] = None,
+        changed: Optional[List[str]] = None,
+        removed: Optional[List[str]] = None,
+        unchanged: Optional[List[str]] = None,
+    ):
+        self.added = added or []
+        self.changed = changed or []
+        self.removed = removed or []
+        self.unchanged = unchanged or []
+
+    @property
+    def touched(self) -> int:
+        """
+        :returns: The number of files written or removed
+        """
+        return len(self.added) + len(self.changed) + len(self.removed)
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}(added={len(self.added)}, "
+            f"changed={len(self.changed)}, removed={len(self.removed)}, "
+            f"unchanged={len(self.unchanged)})"
+        )
+
+
+class _BufferedFile(TextIOWrapper):
+    """
+    A text file kept in memory until it is closed, when its content is handed on.
+    The text is encoded as :func:`open` would encode it, so :meth:`tell` gives the
+    same positions
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        on_close: Callable[[Path, bytes], None],
+        encoding: Optional[str] = None,
+    ):
+        super().__init__(
+            BytesIO(), encoding=encoding or locale.getpreferredencoding(False)
+        )
+        self.__path = path
+        self.__on_close = on_close
+
+    def close(self):
+        if self.closed:
+            return
+        self.flush()
+        buffer = self.buffer
+        assert isinstance(buffer, BytesIO)
+        content = buffer.getvalue()
+        super().close()
+        self.__on_close(self.__path, content)
+
+
+class ChartWriter:
+    """
+    Writes the files of a chart to its directory
+
+    :param chart_directory: The directory of the chart
+    :param incremental: Whether to leave the files already in the directory in \
+        place, only writing the files whose content changed and removing the files \
+        that are not written again before :meth:`finish` is called. Otherwise the \
+        directory is deleted and every file is written
+    :param atomic: Whether to write the files to a temporary directory next to the \
+        chart directory, which :meth:`finish` swaps with the chart directory, so \
+        the chart directory never holds a partly written chart. On Linux the two \
+        directories are swapped in a single step. Elsewhere, or on file systems \
+        that can't swap them, the old chart is moved aside first, so for a moment \
+        there is no chart directory. Files are written by a background thread \
+        while the next ones are being serialized, unless streaming
+    :param stream: Whether files are written as they are produced rather than \
+        built in memory first, in which case they are written to disk directly
+    :param files: A dictionary to put the files of the chart in instead of writing \
+        them to disk, keyed by their path relative to the chart directory, such as \
+        *templates/Deployment-0.yaml*. The files are encoded as UTF-8
+    """
+
+    def __init__(
+        self,
+        chart_directory: Path,
+        incremental: bool = False,
+        atomic: bool = False,
+        stream: bool = False,
+        files: Optional[Dict[str, bytes]] = None,
+    ):
+        if incremental and atomic:
+            raise ValueError(
+                "A chart can't be written both incrementally and atomically"
+            )
+        self.chart_directory = chart_directory
+        self.incremental = incremental
+        self.atomic = atomic
+        self.stream = stream
+        self.files = files
+        self.report: Optional[RegenerationReport] = None
+        self.__existing: Set[Path] = set()
+        self.__written: Set[Path] = set()
+        self.__temporary_directory: Optional[Path] = None
+        self.__queue: "Queue[Optional[Tuple[Path, bytes]]]" = Queue(_WRITE_QUEUE_SIZE)
+        self.__thread: Optional[Thread] = None
+        self.__error: Optional[BaseException] = None
+
+    def start(self):
+        """
+        Prepares the chart directory for writing the files of the chart
+        """
+        if self.files is not None:
+            self.files.clear()
+            return
+        if self.atomic:
+            self.chart_directory.parent.mkdir(parents=True, exist_ok=True)
+            self.__temporary_directory = Path(
+                tempfile.mkdtemp(
+                    prefix=f".{self.chart_directory.name}-",
+                    dir=str(self.chart_directory.parent),
+                )
+            )
+            # mkdtemp only lets its owner in, unlike the chart directory it becomes
+            os.chmod(self.__temporary_directory, _get_mode(0o777))
+            self.__error = None
+            if not self.stream:
+                self.__thread = Thread(target=self.__write_queued_files, daemon=True)
+                self.__thread.start()
+            return
+        if not self.incremental:
+            if os.path.exists(self.chart_directory):
+                shutil.rmtree(self.chart_directory)
+            return
+        self.report = RegenerationReport()
+        self.__written = set()
+        self.__existing = set()
+        if self.chart_directory.is_dir():
+            for path in self.chart_directory.glob("**/*"):
+                relative_path = path.relative_to(self.chart_directory)
+                if relative_path.parts[0] not in _HELM_MANAGED and path.is_file():
+                    self.__existing.add(path)
+
+    def __get_path(self, path: Path) -> Path:
+        if self.__temporary_directory is None:
+            return path
+        return self.__temporary_directory / path.relative_to(self.chart_directory)
+
+    def make_directory(self, path: Path):
+        """
+        :param path: The path of a directory in the chart directory
+        """
+        if self.files is not None:
+            return
+        os.makedirs(self.__get_path(path), exist_ok=True)
+
+    def open(self, path: Path) -> IO[str]:
+        """
+        :param path: The path of a file in the chart directory
+
+        :returns: A text file to write the file to, the file is written when closed
+        """
+        if self.files is not None:
+            return _BufferedFile(path, self.__keep_file, "utf-8")
+        if self.incremental:
+            os.makedirs(path.parent, exist_ok=True)
+            return _BufferedFile(path, self._write_if_changed)
+        path = self.__get_path(path)
+        os.makedirs(path.parent, exist_ok=True)
+        if self.__thread is not None:
+            return _BufferedFile(path, self.__queue_file)
+        return open(path, "w")
+
+    def replace(self, path: Path, text: str):
+        """
+        Replaces a file of a chart after :meth:`finish`, leaving the rest of the
+        chart directory as it is. When writing incrementally, the file is only
+        written if its content changed, and is then reported as changed. When writing atomically, the file is written
+        next to the old one and renamed over it, so it is never found partly written
+
+        :param path: The path of a file in the chart directory
+        :param text: The new content of the file
+        """
+        if self.files is not None:
+            self.__keep_file(path, text.encode("utf-8"))
+            return
+        content = text.encode(locale.getpreferredencoding(False))
+        if self.incremental:
+            if path.is_file() and path.read_bytes() == content:
+                return
+            path.write_bytes(content)
+            relative_path = path.relative_to(self.chart_directory).as_posix()
+            if self.report is not None and relative_path in self.report.unchanged:
+                self.report.unchanged.remove(relative_path)
+                self.report.changed.append(relative_path)
+            return
+        if not self.atomic:
+            path.write_bytes(content)
+            return
+        descriptor, temporary_path = tempfile.mkstemp(
+            prefix=f".{path.name}-", dir=str(path.parent)
+        )
+        try:
+            with os.fdopen(descriptor, "wb") as temporary_file:
+                temporary_file.write(content)
+            # mkstemp only lets its owner in, unlike the file it replaces
+            os.chmod(temporary_path, _get_mode(0o666))
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+    def __keep_file(self, path: Path, content: bytes):
+        assert self.files is not None
+        self.files[path.relative_to(self.chart_directory).as_posix()] = content
+
+    def __queue_file(self, path: Path, content: bytes):
+        if self.__error is not None:
+            raise self.__error
+        self.__queue.put((path, content))
+
+    def __write_queued_files(self):
+        while True:
+            item = self.__queue.get()
+            if item is None:
+                return
+            if self.__error is not None:
+                # Keeps taking files so that serialization isn't blocked, the error
+                # is raised by the next file queued or by finish
+                continue
+            path, content = item
+            try:
+                path.write_bytes(content)
+            except BaseException as err:
+                self.__error = err
+
+    def __stop_thread(self):
+        if self.__thread is not None:
+            self.__queue.put(None)
+            self.__thread.join()
+            self.__thread = None
+
+    def _write_if_changed(self, path: Path, content: bytes):
+        assert self.report is not None
+        self.__written.add(path)
+        relative_path = path.relative_to(self.chart_directory).as_posix()
+        if path not in self.__existing:
+            self.report.added.append(relative_path)
+        elif os.path.getsize(path) == len(content) and path.read_bytes() == content:
+            self.report.unchanged.append(relative_path)
+            return
+        else:
+            self.report.changed.append(relative_path)
+        path.write_bytes(content)
+
+    def __swap(self):
+        assert self.__temporary_directory is not None
+        new_directory = self.__temporary_directory
+        self.__temporary_directory = None
+        if not self.chart_directory.exists():
+            os.rename(new_directory, self.chart_directory)
+            return
+        try:
+            exchanged = _exchange(new_directory, self.chart_directory)
+        except BaseException:
+            shutil.rmtree(new_directory, ignore_errors=True)
+            raise
+        if exchanged:
+            # The temporary directory now holds the old chart
+            shutil.rmtree(new_directory)
+            return
+        # Directories can't be renamed over directories with files in them, so the
+        # old chart is moved aside first. Readers find either the old chart, the new
+        # one or, in between the two renames, no chart, but never part of a chart
+        old_directory = new_directory.with_name(f"{new_directory.name}-old")
+        os.rename(self.chart_directory, old_directory)
+        try:
+            os.rename(new_directory, self.chart_directory)
+        except BaseException:
+            os.rename(old_directory, self.chart_directory)
+            shutil.rmtree(new_directory, ignore_errors=True)
+            raise
+        shutil.rmtree(old_directory)
+
+    def abort(self):
+        """
+        Removes the files written so far when writing atomically, leaving the chart
+        directory as it was
+        """
+        self.__stop_thread()
+        if self.__temporary_directory is not None:
+            shutil.rmtree(self.__temporary_directory, ignore_errors=True)
+            self.__temporary_directory = None
+
+    def finish(self) -> Optional[RegenerationReport]:
+        """
+        Completes writing the chart. When writing atomically, waits for every file
+        to be written and swaps the new chart into place. When writing
+        incrementally, removes the files that were in the chart directory before
+        :meth:`start` but were not written since
+
+        :returns: The files added, changed, removed and left untouched when writing \
+            incrementally, otherwise None
+        """
+        if self.files is not None:
+            return None
+        if self.atomic:
+            self.__stop_thread()
+            if self.__error is not None:
+                self.abort()
+                raise self.__error
+            self.__swap()
+            return None
+        if not self.incremental:
+            return None
+        assert self.report is not None
+        for path in sorted(self.__existing - self.__written):
+            path.unlink()
+            self.report.removed.append(
+                path.relative_to(self.chart_directory).as_posix()
+            )
+            parent = path.parent
+            while parent != self.chart_directory and not any(parent.iterdir()):
+                parent.rmdir()
+                parent = parent.parent
+        return self.report
@@ -0,0 +1,157 @@
+"""
+A local cache of the chart archives of dependencies, so that charts can be given
+their dependencies without helm downloading them again
+"""
+
+from hashlib import sha256
+from logging import info
+import os
+from pathlib import Path
+import re
+import tempfile
+from typing import List, Optional, Sequence
+
+from avionix.chart.chart_dependency import ChartDependency
+from avionix.chart.utils import get_cache_directory
+
+# Versions naming a single release of a chart, ranges such as ^5.0.0 can resolve to
+# another release whenever the repository changes, so are not cached
+_EXACT_VERSION = re.compile(
+    r"^v?\d+\.\d+\.\d+(?:-[0-9A-Za-z.-]+)?(?:\+[0-9A-Za-z.-]+)?$"
+)
+
+
+def _write_atomically(path: Path, content: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        dir=str(path.parent), delete=False, suffix=".tmp"
+    ) as temporary_file:
+        temporary_file.write(content)
+    os.replace(temporary_file.name, path)
+
+
+def get_archive_name(dependency: ChartDependency) -> str:
+    """
+    :returns: The name helm gives the archive of a dependency in the *charts* \
+        directory of a chart
+    """
+    return f"{dependency.name}-{dependency.version}.tgz"
+
+
+class DependencyCache:
+    """
+    Chart archives of dependencies, stored by the SHA-256 digest of their content
+    and looked up by the name, version and repository URL of the dependency. An
+    archive whose content no longer matches its digest is treated as missing
+
+    Only dependencies with an exact version from a remote repository are cached
+
+    :param cache_directory: The directory to keep the archives in, defaults to \
+        *charts* in :func:`~avionix.chart.utils.get_cache_directory`
+    """
+
+    def __init__(self, cache_directory: Optional[Path] = None):
+        self.cache_directory = (
+            get_cache_directory() / "charts"
+            if cache_directory is None
+            else cache_directory
+        )
+
+    @staticmethod
+    def is_cacheable(dependency: ChartDependency) -> bool:
+        """
+        :returns: Whether the archive of the dependency can be cached
+        """
+        return (
+            not dependency.is_local
+            and not dependency.repository.startswith("file://")
+            and _EXACT_VERSION.match(dependency.version) is not None
+        )
+
+    def __get_reference(self, dependency: ChartDependency) -> Path:
+        key = "\n".join(
+            [dependency.repository.rstrip("/"), dependency.name, dependency.version]
+        )
+        return (
+            self.cache_directory
+            / "references"
+            / sha256(key.encode("utf-8")).hexdigest()
+        )
+
+    def __get_blob(self, digest: str) -> Path:
+        return self.cache_directory / "blobs" / digest[:2] / f"{digest}.tgz"
+
+    def get_archive(self, dependency: ChartDependency) -> Optional[bytes]:
+        """
+        :returns: The content of the cached archive of the dependency, or None if \
+            it isn't cached
+        """
+        if not self.is_cacheable(dependency):
+            return None
+        try:
+            digest = self.__get_reference(dependency).read_text().strip()
+            content = self.__get_blob(digest).read_bytes()
+        except OSError:
+            return None
+        if sha256(content).hexdigest() != digest:
+            return None
+        return content
+
+    def add_archive(self, dependency: ChartDependency, content: bytes):
+        """
+        Caches the archive of a dependency
+
+        :param dependency: The dependency
+        :param content: The content of its chart archive
+        """
+        if not self.is_cacheable(dependency):
+            return
+        digest = sha256(content).hexdigest()
+        blob = self.__get_blob(digest)
+        # Archives are only ever added under the digest of their content, so an
+        # existing blob already holds the same bytes
+        if not blob.exists():
+            _write_atomically(blob, content)
+        _write_atomically(self.__get_reference(dependency), digest.encode("utf-8"))
+
+    def vendor(
+        self, dependencies: Sequence[ChartDependency], charts_directory: Path
+    ) -> List[ChartDependency]:
+        """
+        Copies the cached archives of dependencies into the *charts* directory of a
+        chart
+
+        :param dependencies: The dependencies of the chart
+        :param charts_directory: The *charts* directory of the chart
+
+        :returns: The dependencies that aren't cached
+        """
+        missing = []
+        for dependency in dependencies:
+            content = self.get_archive(dependency)
+            if content is None:
+                missing.append(dependency)
+                continue
+            charts_directory.mkdir(parents=True, exist_ok=True)
+            (charts_directory / get_archive_name(dependency)).write_bytes(content)
+        if len(missing) < len(dependencies):
+            info(
+                f"Used {len(dependencies) - len(missing)} cached dependencies, "
+                f"{len(missing)} missing"
+            )
+        return missing
+
+    def store(self, dependencies: Sequence[ChartDependency], charts_directory: Path):
+        """
+        Caches the archives helm downloaded into the *charts* directory of a chart
+
+        :param dependencies: The dependencies of the chart
+        :param charts_directory: The *charts* directory of the chart
+        """
+        for dependency in dependencies:
+            archive = charts_directory / get_archive_name(dependency)
+            if self.is_cacheable(dependency) and archive.is_file():
+                self.add_archive(dependency, archive.read_bytes())
+
+
+SHARED_DEPENDENCY_CACHE = DependencyCache()
@@ -0,0 +1,319 @@
+"""
+Resolves the versions of the dependencies of a chart against the repository indexes
+helm already downloaded, and writes the Chart.lock helm would write, without any
+network access
+"""
+
+from copy import copy
+from datetime import datetime, timezone
+from hashlib import sha256
+import json
+from logging import info
+import os
+from pathlib import Path
+import tempfile
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import yaml
+
+from avionix.chart.chart_dependency import ChartDependency
+from avionix.chart.repositories import (
+    SHARED_REPOSITORY_CACHE,
+    HelmRepositoryCache,
+    get_repository_cache,
+)
+from avionix.chart.semver import VersionConstraint, parse_version
+from avionix.chart.utils import get_cache_directory, get_file_stamp
+from avionix.errors import DependencyResolutionError
+
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# The versions of each chart of an index, from the highest to the lowest
+_ChartVersions = Dict[str, List[str]]
+
+# Characters the JSON encoder of go escapes, which changes the digest of a lock
+_GO_JSON_ESCAPES = {
+    "<": "\\u003c",
+    ">": "\\u003e",
+    "&": "\\u0026",
+    "\u2028": "\\u2028",
+    "\u2029": "\\u2029",
+}
+
+
+def _read_index(index: Path) -> _ChartVersions:
+    with open(index, "rb") as index_file:
+        content = yaml.load(index_file, Loader=_Loader) or {}
+    chart_versions = {}
+    for name, entries in (content.get("entries") or {}).items():
+        versions = []
+        for entry in entries or []:
+            version = str(entry.get("version", ""))
+            key = parse_version(version)
+            if key is not None:
+                versions.append((key, version))
+        versions.sort(reverse=True)
+        chart_versions[name] = [version for _, version in versions]
+    return chart_versions
+
+
+def _to_go_json(value) -> str:
+    text = json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+    for character, escape in _GO_JSON_ESCAPES.items():
+        text = text.replace(character, escape)
+    return text
+
+
+def _get_lock_entry(name: str, version: str, repository: str) -> dict:
+    entry = {"name": name}
+    if version:
+        entry["version"] = version
+    entry["repository"] = repository
+    return entry
+
+
+def get_lock_digest(
+    dependencies: Sequence[ChartDependency], resolved: Sequence[ChartDependency]
+) -> str:
+    """
+    :param dependencies: The dependencies as listed in *Chart.yaml*
+    :param resolved: The same dependencies with their resolved versions
+
+    :returns: The digest helm checks *Chart.lock* against *Chart.yaml* with
+    """
+    data = [
+        [
+            _get_lock_entry(dependency.name, dependency.version, dependency.repository)
+            for dependency in dependencies
+        ]
+        for dependencies in (dependencies, resolved)
+    ]
+    return "sha256:" + sha256(_to_go_json(data).encode("utf-8")).hexdigest()
+
+
+class DependencyResolver:
+    """
+    Resolves the version constraints of dependencies, such as ``^5.0.0``, to the
+    highest version satisfying them in the indexes helm downloaded with
+    ``helm repo add`` or ``helm repo update``, as ``helm dependency update`` would
+    after updating the indexes. The versions each index lists are cached in memory
+    and on disk until helm downloads the index again, so resolving doesn't read
+    the index, which can be several megabytes, every time
+
+    :param repository_cache: The directory helm keeps the indexes in, defaults to \
+        :func:`~avionix.chart.repositories.get_repository_cache`
+    :param cache_directory: The directory to cache the versions in, defaults to \
+        *indexes* in :func:`~avionix.chart.utils.get_cache_directory`
+    :param repositories: The repositories known to helm, defaults to the cache \
+        shared by every ChartBuilder of the process
+    """
+
+    def __init__(
+        self,
+        repository_cache: Optional[Path] = None,
+        cache_directory: Optional[Path] = None,
+        repositories: Optional[HelmRepositoryCache] = None,
+    ):
+        self.repository_cache = repository_cache
+        self.cache_directory = (
+            get_cache_directory() / "indexes"
+            if cache_directory is None
+            else cache_directory
+        )
+        self.repositories = (
+            SHARED_REPOSITORY_CACHE if repositories is None else repositories
+        )
+        self.__indexes: Dict[Path, Tuple[Tuple[int, int], _ChartVersions]] = {}
+        self.__lock = Lock()
+
+    def __get_index_path(self, repository_name: str) -> Path:
+        repository_cache = (
+            get_repository_cache()
+            if self.repository_cache is None
+            else self.repository_cache
+        )
+        return repository_cache / f"{repository_name}-index.yaml"
+
+    def __get_cache_file(self, index: Path) -> Path:
+        key = sha256(str(index.resolve()).encode("utf-8")).hexdigest()[:16]
+        return self.cache_directory / f"{key}.json"
+
+    def __read_cache_file(
+        self, index: Path, stamp: Tuple[int, int]
+    ) -> Optional[_ChartVersions]:
+        try:
+            with open(self.__get_cache_file(index)) as cache_file:
+                cached = json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+        if cached.get("index") != str(index) or cached.get("stamp") != list(stamp):
+            return None
+        return cached["versions"]
+
+    def __write_cache_file(
+        self, index: Path, stamp: Tuple[int, int], chart_versions: _ChartVersions
+    ):
+        cached = {"index": str(index), "stamp": stamp, "versions": chart_versions}
+        try:
+            self.cache_directory.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", dir=str(self.cache_directory), delete=False, suffix=".tmp"
+            ) as cache_file:
+                json.dump(cached, cache_file)
+            os.replace(cache_file.name, self.__get_cache_file(index))
+        except OSError as err:
+            info(f"Could not cache the versions of {index}: {err}")
+
+    def get_versions(self, repository_name: str, chart_name: str) -> List[str]:
+        """
+        :param repository_name: The name helm knows the repository by
+        :param chart_name: The name of the chart
+
+        :returns: The versions of the chart in the index of the repository, from \
+            the highest to the lowest
+
+        :raises DependencyResolutionError: If helm hasn't downloaded the index
+        """
+        index = self.__get_index_path(repository_name)
+        stamp = get_file_stamp(index)
+        if stamp is None:
+            raise DependencyResolutionError(
+                f"The index of repository {repository_name!r} isn't cached by helm, "
+                f"run helm repo update"
+            )
+        with self.__lock:
+            cached = self.__indexes.get(index)
+        if cached is not None and cached[0] == stamp:
+            chart_versions = cached[1]
+        else:
+            read = self.__read_cache_file(index, stamp)
+            if read is None:
+                read = _read_index(index)
+                self.__write_cache_file(index, stamp, read)
+            chart_versions = read
+            with self.__lock:
+                self.__indexes[index] = (stamp, chart_versions)
+        return chart_versions.get(chart_name, [])
+
+    def __get_repository_name(self, dependency: ChartDependency) -> str:
+        repository = dependency.repository
+        # Repositories can also be given by name, as @name or alias:name
+        if repository.startswith("@"):
+            return repository[1:]
+        if repository.startswith("alias:"):
+            return repository[len("alias:") :]
+        url = repository.rstrip("/")
+        for name, repository_url in self.repositories.get_repositories().items():
+            if repository_url.rstrip("/") == url:
+                return name
+        raise DependencyResolutionError(
+            f"Repository {repository} of dependency {dependency.name!r} isn't known "
+            f"to helm"
+        )
+
+    @staticmethod
+    def __get_local_version(
+        dependency: ChartDependency, chart_directory: Optional[Path]
+    ) -> str:
+        path = Path(dependency.repository[len("file://") :])
+        if not path.is_absolute() and chart_directory is not None:
+            path = chart_directory / path
+        try:
+            with open(path / "Chart.yaml") as chart_yaml:
+                return str(yaml.safe_load(chart_yaml)["version"])
+        except (OSError, KeyError, TypeError) as err:
+            raise DependencyResolutionError(
+                f"Could not read the version of local dependency "
+                f"{dependency.name!r}: {err}"
+            )
+
+    def resolve(
+        self, dependency: ChartDependency, chart_directory: Optional[Path] = None
+    ) -> str:
+        """
+        :param dependency: The dependency
+        :param chart_directory: The directory of the chart, which the paths of \
+            local dependencies are relative to
+
+        :returns: The highest version of the dependency satisfying its version
+
+        :raises DependencyResolutionError: If no version satisfies it, or the \
+            index of its repository isn't cached
+        """
+        try:
+            constraint = VersionConstraint(dependency.version)
+        except ValueError as err:
+            raise DependencyResolutionError(
+                f"Dependency {dependency.name!r}: {err}"
+            ) from err
+        if dependency.repository.startswith("file://"):
+            candidates = [self.__get_local_version(dependency, chart_directory)]
+        else:
+            candidates = self.get_versions(
+                self.__get_repository_name(dependency), dependency.name
+            )
+        for version in candidates:
+            key = parse_version(version)
+            if key is not None and constraint.is_satisfied_by(key):
+                return version
+        raise DependencyResolutionError(
+            f"No version of dependency {dependency.name!r} satisfies "
+            f"{dependency.version!r}"
+        )
+
+    def resolve_all(
+        self,
+        dependencies: Sequence[ChartDependency],
+        chart_directory: Optional[Path] = None,
+    ) -> List[ChartDependency]:
+        """
+        :param dependencies: The dependencies of a chart
+        :param chart_directory: The directory of the chart, which the paths of \
+            local dependencies are relative to
+
+        :returns: Copies of the dependencies with their resolved versions
+
+        :raises DependencyResolutionError: If any dependency can't be resolved
+        """
+        resolved = []
+        for dependency in dependencies:
+            resolved_dependency = copy(dependency)
+            resolved_dependency.version = self.resolve(dependency, chart_directory)
+            resolved.append(resolved_dependency)
+        return resolved
+
+    def write_lock(
+        self, dependencies: Sequence[ChartDependency], chart_directory: Path
+    ) -> List[ChartDependency]:
+        """
+        Resolves the dependencies of a chart and writes them to the *Chart.lock*
+        of the chart, so that ``helm dependency build`` downloads these versions
+        rather than resolving them again
+
+        :param dependencies: The dependencies of the chart
+        :param chart_directory: The directory of the chart
+
+        :returns: Copies of the dependencies with their resolved versions
+
+        :raises DependencyResolutionError: If any dependency can't be resolved
+        """
+        resolved = self.resolve_all(dependencies, chart_directory)
+        lock = {
+            "dependencies": [
+                {
+                    "name": dependency.name,
+                    "repository": dependency.repository,
+                    "version": dependency.version,
+                }
+                for dependency in resolved
+            ],
+            "digest": get_lock_digest(dependencies, resolved),
+            "generated": datetime.now(timezone.utc).isoformat(),
+        }
+        with open(chart_directory / "Chart.lock", "w") as lock_file:
+            yaml.safe_dump(lock, lock_file, default_flow_style=False)
+        return resolved
+
+
+SHARED_DEPENDENCY_RESOLVER = DependencyResolver()
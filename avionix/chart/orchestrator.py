@@ -0,0 +1,342 @@
+import asyncio
+from logging import error, info
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+from avionix.chart.chart_builder import ChartBuilder
+from avionix.errors import ReleaseOrchestrationError
+
+_SUCCEEDED = "succeeded"
+_FAILED = "failed"
+_SKIPPED = "skipped"
+
+
+class ReleaseResult:
+    """
+    The outcome of one release run by a :class:`ReleaseOrchestrator`
+
+    :param name: The name of the release
+    :param status: "succeeded", "failed" or "skipped", releases are skipped when a \
+        release they depend on did not succeed, or after a failure when failing fast
+    :param started: When the helm commands of the release started, in seconds since \
+        the orchestrator started, None if skipped
+    :param seconds: How long the helm commands of the release took, None if skipped
+    :param error: The error raised by a failed release
+    """
+
+    def __init__(
+        self,
+        name: str,
+        status: str,
+        started: Optional[float] = None,
+        seconds: Optional[float] = None,
+        error: Optional[BaseException] = None,
+    ):
+        self.name = name
+        self.status = status
+        self.started = started
+        self.seconds = seconds
+        self.error = error
+
+    def __repr__(self):
+        seconds = "" if self.seconds is None else f", seconds={self.seconds:.3f}"
+        return f"{type(self).__name__}({self.name!r}, {self.status!r}{seconds})"
+
+
+class OrchestrationReport:
+    """
+    The outcome of every release run by a :class:`ReleaseOrchestrator`
+
+    :param results: The result of each release, keyed by release name in the order \
+        the releases were given in
+    :param seconds: How long running all of the releases took
+    """
+
+    def __init__(self, results: Dict[str, ReleaseResult], seconds: float):
+        self.results = results
+        self.seconds = seconds
+
+    def __get_names(self, status: str) -> List[str]:
+        return [
+            name for name, result in self.results.items() if result.status == status
+        ]
+
+    @property
+    def succeeded(self) -> List[str]:
+        return self.__get_names(_SUCCEEDED)
+
+    @property
+    def failed(self) -> List[str]:
+        return self.__get_names(_FAILED)
+
+    @property
+    def skipped(self) -> List[str]:
+        return self.__get_names(_SKIPPED)
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}(succeeded={len(self.succeeded)}, "
+            f"failed={len(self.failed)}, skipped={len(self.skipped)}, "
+            f"seconds={self.seconds:.3f})"
+        )
+
+
+class ReleaseOrchestrator:
+    """
+    Installs, upgrades or uninstalls many charts, running releases that don't depend
+    on each other at the same time
+
+    Releases are named after the charts of their builders. A release only starts
+    once every release it depends on succeeded, for instance custom resource
+    definitions before the operators using them, or databases before the apps using
+    them. Uninstalling goes the other way around, a release is only uninstalled once
+    every release depending on it is
+
+    :param chart_builders: The builders of the charts
+    :param dependencies: The names of the releases each release depends on, keyed \
+        by release name
+    :param max_concurrency: The most releases running at the same time
+    :param fail_fast: Whether to stop starting releases after any release fails. \
+        Otherwise only the releases depending on a failed release are skipped
+
+    :Example:
+
+    >>> orchestrator = ReleaseOrchestrator(
+    >>>     [crds, operator, database, app],
+    >>>     dependencies={"operator": ["crds"], "app": ["database", "operator"]},
+    >>>     max_concurrency=8,
+    >>> )
+    >>> report = orchestrator.install_charts()
+    """
+
+    def __init__(
+        self,
+        chart_builders: Sequence[ChartBuilder],
+        dependencies: Optional[Dict[str, List[str]]] = None,
+        max_concurrency: int = 8,
+        fail_fast: bool = True,
+    ):
+        if max_concurrency < 1:
+            raise ValueError(
+                f"max_concurrency must be at least 1, got {max_concurrency}"
+            )
+        self.chart_builders: Dict[str, ChartBuilder] = {}
+        for builder in chart_builders:
+            name = builder.chart_info.name
+            if name in self.chart_builders:
+                raise ValueError(f"Release {name!r} is given more than once")
+            self.chart_builders[name] = builder
+        self.dependencies: Dict[str, List[str]] = {
+            name: [] for name in self.chart_builders
+        }
+        for name, required_names in (dependencies or {}).items():
+            for required_name in [name] + list(required_names):
+                if required_name not in self.chart_builders:
+                    raise ValueError(f"Unknown release {required_name!r}")
+            self.dependencies[name] = list(required_names)
+        self.__check_for_cycles()
+        self.max_concurrency = max_concurrency
+        self.fail_fast = fail_fast
+
+    def __check_for_cycles(self):
+        # Kahn's algorithm, releases left over once no release is free are in cycles
+        remaining = {name: len(set(names)) for name, names in self.dependencies.items()}
+        dependents = self.__get_dependents()
+        free = [name for name, count in remaining.items() if not count]
+        while free:
+            name = free.pop()
+            del remaining[name]
+            for dependent in dependents[name]:
+                remaining[dependent] -= 1
+                if not remaining[dependent]:
+                    free.append(dependent)
+        if remaining:
+            raise ValueError(
+                f"The dependencies of releases {', '.join(sorted(remaining))} form "
+                f"a cycle"
+            )
+
+    def __get_dependents(self) -> Dict[str, List[str]]:
+        dependents: Dict[str, List[str]] = {name: [] for name in self.chart_builders}
+        for name, required_names in self.dependencies.items():
+            for required_name in set(required_names):
+                dependents[required_name].append(name)
+        return dependents
+
+    async def __run(
+        self,
+        action: Callable[[ChartBuilder, Optional[dict]], Awaitable[None]],
+        options: Optional[Dict[str, Optional[str]]],
+        requirements: Dict[str, List[str]],
+    ) -> OrchestrationReport:
+        # Created here so that they belong to the running event loop on Python 3.9
+        # and lower
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        finished = {name: asyncio.Event() for name in self.chart_builders}
+        results: Dict[str, ReleaseResult] = {}
+        failed = False
+        started = time.perf_counter()
+
+        async def run_release(name: str):
+            nonlocal failed
+            for required_name in requirements[name]:
+                await finished[required_name].wait()
+            try:
+                if any(
+                    results[required_name].status != _SUCCEEDED
+                    for required_name in requirements[name]
+                ):
+                    results[name] = ReleaseResult(name, _SKIPPED)
+                    return
+                async with semaphore:
+                    if failed and self.fail_fast:
+                        results[name] = ReleaseResult(name, _SKIPPED)
+                        return
+                    info(f"Starting release {name}")
+                    release_started = time.perf_counter()
+                    release_error: Optional[Exception] = None
+                    try:
+                        # Each release gets its own copy, as helm options are
+                        # removed from them once handled
+                        await action(
+                            self.chart_builders[name],
+                            None if options is None else dict(options),
+                        )
+                    except Exception as err:
+                        failed = True
+                        error(f"Release {name} failed: {err}")
+                        status, release_error = _FAILED, err
+                    else:
+                        status = _SUCCEEDED
+                    finished_at = time.perf_counter()
+                    results[name] = ReleaseResult(
+                        name,
+                        status,
+                        release_started - started,
+                        finished_at - release_started,
+                        release_error,
+                    )
+            finally:
+                finished[name].set()
+
+        await asyncio.gather(*(run_release(name) for name in self.chart_builders))
+        report = OrchestrationReport(
+            {name: results[name] for name in self.chart_builders},
+            time.perf_counter() - started,
+        )
+        if report.failed:
+            raise ReleaseOrchestrationError(
+                f"Releases {', '.join(report.failed)} failed, "
+                f"{len(report.skipped)} skipped",
+                report,
+            )
+        return report
+
+    async def install_charts_async(
+        self, options: Optional[Dict[str, Optional[str]]] = None
+    ) -> OrchestrationReport:
+        """
+        Installs every chart, each release after the releases it depends on
+
+        :param options: A dictionary of command line arguments to pass to helm for \
+            every release
+
+        :returns: The result and timing of each release
+        :raises ReleaseOrchestrationError: If any release failed, with the report \
+            as its report attribute
+        """
+        return await self.__run(
+            lambda builder, options: builder.install_chart_async(options),
+            options,
+            self.dependencies,
+        )
+
+    async def upgrade_charts_async(
+        self, options: Optional[Dict[str, Optional[str]]] = None
+    ) -> OrchestrationReport:
+        """
+        Upgrades every chart, each release after the releases it depends on
+
+        :param options: A dictionary of command line arguments to pass to helm for \
+            every release
+
+        :returns: The result and timing of each release
+        :raises ReleaseOrchestrationError: If any release failed, with the report \
+            as its report attribute
+        """
+        return await self.__run(
+            lambda builder, options: builder.upgrade_chart_async(options),
+            options,
+            self.dependencies,
+        )
+
+    async def apply_charts_async(
+        self, options: Optional[Dict[str, Optional[str]]] = None
+    ) -> OrchestrationReport:
+        """
+        Installs or upgrades every chart with a single ``helm upgrade --install``
+        each, each release after the releases it depends on
+
+        :param options: A dictionary of command line arguments to pass to helm for \
+            every release
+
+        :returns: The result and timing of each release
+        :raises ReleaseOrchestrationError: If any release failed, with the report \
+            as its report attribute
+        """
+        return await self.__run(
+            lambda builder, options: builder.apply_chart_async(options),
+            options,
+            self.dependencies,
+        )
+
+    async def uninstall_charts_async(
+        self, options: Optional[Dict[str, Optional[str]]] = None
+    ) -> OrchestrationReport:
+        """
+        Uninstalls every chart, each release after the releases depending on it
+
+        :param options: A dictionary of command line arguments to pass to helm for \
+            every release
+
+        :returns: The result and timing of each release
+        :raises ReleaseOrchestrationError: If any release failed, with the report \
+            as its report attribute
+        """
+        return await self.__run(
+            lambda builder, options: builder.uninstall_chart_async(options),
+            options,
+            self.__get_dependents(),
+        )
+
+    def install_charts(
+        self, options: Optional[Dict[str, Optional[str]]] = None
+    ) -> OrchestrationReport:
+        """
+        Like :meth:`install_charts_async`, running its own event loop
+        """
+        return asyncio.run(self.install_charts_async(options))
+
+    def upgrade_charts(
+        self, options: Optional[Dict[str, Optional[str]]] = None
+    ) -> OrchestrationReport:
+        """
+        Like :meth:`upgrade_charts_async`, running its own event loop
+        """
+        return asyncio.run(self.upgrade_charts_async(options))
+
+    def apply_charts(
+        self, options: Optional[Dict[str, Optional[str]]] = None
+    ) -> OrchestrationReport:
+        """
+        Like :meth:`apply_charts_async`, running its own event loop
+        """
+        return asyncio.run(self.apply_charts_async(options))
+
+    def uninstall_charts(
+        self, options: Optional[Dict[str, Optional[str]]] = None
+    ) -> OrchestrationReport:
+        """
+        Like :meth:`uninstall_charts_async`, running its own event loop
+        """
+        return asyncio.run(self.uninstall_charts_async(options))
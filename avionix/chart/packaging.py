@@ -0,0 +1,49 @@
+"""
+Packaging of charts into the gzipped tar archives that ``helm package`` produces
+
+The archives are reproducible: the files are added in sorted order, with fixed
+modification times, permissions and owners, and the gzip header holds no time or
+file name, so the same files always give the same bytes
+"""
+
+import gzip
+from io import BytesIO
+import tarfile
+from typing import Dict
+
+# Helm only reads the files of an archive, so every entry gets the same metadata
+_FILE_MODE = 0o644
+_MODIFICATION_TIME = 0
+_COMPRESSION_LEVEL = 9
+
+
+def create_chart_archive(chart_name: str, files: Dict[str, bytes]) -> bytes:
+    """
+    :param chart_name: The name of the chart, the files are placed in a directory \
+        with this name in the archive, as helm expects
+    :param files: The content of each file of the chart, keyed by its path relative \
+        to the chart directory, such as *templates/Deployment-0.yaml*
+
+    :returns: The bytes of the .tgz archive
+    """
+    archive = BytesIO()
+    with gzip.GzipFile(
+        filename="",
+        mode="wb",
+        compresslevel=_COMPRESSION_LEVEL,
+        fileobj=archive,
+        mtime=_MODIFICATION_TIME,
+    ) as compressed:
+        with tarfile.open(
+            fileobj=compressed, mode="w", format=tarfile.PAX_FORMAT
+        ) as tar:
+            for path in sorted(files):
+                content = files[path]
+                info = tarfile.TarInfo(f"{chart_name}/{path}")
+                info.size = len(content)
+                info.mode = _FILE_MODE
+                info.mtime = _MODIFICATION_TIME
+                info.uid = info.gid = 0
+                info.uname = info.gname = ""
+                tar.addfile(info, BytesIO(content))
+    return archive.getvalue()
@@ -0,0 +1,59 @@
+"""
+Digests of generated charts, stored in an annotation of the chart of a release so
+that an upgrade that wouldn't change the release can be skipped
+"""
+
+from hashlib import sha256
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+# The annotation of Chart.yaml holding the digest of the rest of the chart
+DIGEST_ANNOTATION = "avionix.io/digest"
+
+# Written by helm with the time it resolved the dependencies, which are already
+# part of Chart.yaml and charts
+_IGNORED_FILES = ("Chart.lock",)
+
+# Options naming values files, whose content is part of the release
+_VALUES_FILE_OPTIONS = ("f", "values")
+
+
+def _update(digest, name: str, content: bytes):
+    digest.update(f"{name}\0{len(content)}\0".encode("utf-8"))
+    digest.update(content)
+
+
+def get_chart_digest(
+    chart_directory: Path,
+    options: Optional[Dict[str, Optional[str]]] = None,
+    chart_yaml: Optional[bytes] = None,
+) -> str:
+    """
+    :param chart_directory: The directory of a generated chart, with the \
+        dependencies in its *charts* directory if they were downloaded
+    :param options: The command line arguments passed to helm, which can also \
+        change the release
+    :param chart_yaml: The content of *Chart.yaml* to use instead of the file, \
+        such as without the digest annotation the file may already have
+
+    :returns: A digest of every file of the chart, other than *Chart.lock*, and of \
+        the options and the values files they name
+    """
+    digest = sha256()
+    for directory, directories, files in os.walk(chart_directory):
+        directories.sort()
+        for file_name in sorted(files):
+            path = Path(directory) / file_name
+            relative_path = path.relative_to(chart_directory).as_posix()
+            if relative_path in _IGNORED_FILES:
+                continue
+            if relative_path == "Chart.yaml" and chart_yaml is not None:
+                _update(digest, relative_path, chart_yaml)
+            else:
+                _update(digest, relative_path, path.read_bytes())
+    for option, value in sorted((options or {}).items()):
+        _update(digest, f"--{option}", (value or "").encode("utf-8"))
+        if option in _VALUES_FILE_OPTIONS and value and os.path.isfile(value):
+            _update(digest, value, Path(value).read_bytes())
+    return f"sha256:{digest.hexdigest()}"
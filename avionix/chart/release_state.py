@@ -0,0 +1,266 @@
+"""
+The helm releases installed in the cluster, shared by every ChartBuilder of a process
+so that checking whether a release is installed doesn't run helm each time
+"""
+
+import asyncio
+from threading import Lock
+import time
+from typing import Dict, List, Optional, Tuple
+
+from avionix.chart.utils import (
+    HelmRelease,
+    get_helm_release,
+    get_helm_release_async,
+    list_helm_releases,
+    list_helm_releases_async,
+)
+
+# Releases without a namespace are kept under None, helm looks them up in the
+# namespace of the kubernetes context
+_ReleaseKey = Tuple[Optional[str], str]
+
+
+def _get_key(name: str, namespace: Optional[str]) -> _ReleaseKey:
+    return namespace, name
+
+
+class ReleaseStateCache:
+    """
+    The releases installed in the cluster. Each release is looked up on its own with
+    ``helm status``, so a lookup takes the same time however many releases are
+    installed, and is kept for *ttl* seconds or until :meth:`invalidate` is called.
+    :meth:`load` looks up every release at once, for when many releases are about to
+    be checked. Installing, upgrading and uninstalling through a ChartBuilder updates
+    the cache directly rather than looking the release up again
+
+    Releases without a namespace are looked up in the namespace of the kubernetes
+    context, and are kept apart from releases given a namespace, since which
+    namespace that is isn't known. :meth:`load` doesn't tell whether they are
+    installed for the same reason
+
+    :param ttl: How many seconds a release that was looked up is used for before \
+        looking it up again
+    """
+
+    def __init__(self, ttl: float = 10.0):
+        self.ttl = ttl
+        # Each release looked up, None for releases that are not installed, with
+        # when it was looked up
+        self.__releases: Dict[_ReleaseKey, Tuple[Optional[HelmRelease], float]] = {}
+        self.__loaded_at: Optional[float] = None
+        # When releases were last invalidated, so that releases that were being
+        # looked up at the time are not kept
+        self.__invalidated_at: Dict[_ReleaseKey, float] = {}
+        self.__all_invalidated_at = float("-inf")
+        self.__lock = Lock()
+        self.__lookups: Dict[
+            _ReleaseKey,
+            Tuple[asyncio.AbstractEventLoop, "asyncio.Future[Optional[HelmRelease]]"],
+        ] = {}
+
+    def _find_release(
+        self, name: str, namespace: Optional[str]
+    ) -> Optional[HelmRelease]:
+        return get_helm_release(name, namespace)
+
+    async def _find_release_async(
+        self, name: str, namespace: Optional[str]
+    ) -> Optional[HelmRelease]:
+        return await get_helm_release_async(name, namespace)
+
+    def _list_releases(self) -> List[HelmRelease]:
+        return list_helm_releases(all_namespaces=True, all_statuses=True)
+
+    async def _list_releases_async(self) -> List[HelmRelease]:
+        return await list_helm_releases_async(all_namespaces=True, all_statuses=True)
+
+    def __get_invalidated_at(self, key: _ReleaseKey) -> float:
+        return max(
+            self.__invalidated_at.get(key, self.__all_invalidated_at),
+            self.__all_invalidated_at,
+        )
+
+    def __get_cached(self, key: _ReleaseKey) -> Tuple[bool, Optional[HelmRelease]]:
+        now = time.monotonic()
+        entry = self.__releases.get(key)
+        if entry is not None and now - entry[1] < self.ttl:
+            return True, entry[0]
+        loaded_at = self.__loaded_at
+        if (
+            loaded_at is not None
+            and key[0] is not None
+            and now - loaded_at < self.ttl
+            and self.__get_invalidated_at(key) <= loaded_at
+        ):
+            # Every release was listed recently, and this one wasn't
+            return True, None
+        return False, None
+
+    def __is_outdated(self, key: _ReleaseKey, started: float) -> bool:
+        entry = self.__releases.get(key)
+        return started < self.__get_invalidated_at(key) or (
+            entry is not None and entry[1] > started
+        )
+
+    def __store(self, key: _ReleaseKey, release: Optional[HelmRelease], started: float):
+        with self.__lock:
+            if not self.__is_outdated(key, started):
+                self.__releases[key] = (release, started)
+
+    def get_release(
+        self, name: str, namespace: Optional[str] = None
+    ) -> Optional[HelmRelease]:
+        """
+        :param name: The name of the release
+        :param namespace: The namespace of the release
+
+        :returns: The release, or None if the release is not installed
+        """
+        key = _get_key(name, namespace)
+        cached, release = self.__get_cached(key)
+        if cached:
+            return release
+        started = time.monotonic()
+        release = self._find_release(name, key[0])
+        self.__store(key, release, started)
+        return release
+
+    async def get_release_async(
+        self, name: str, namespace: Optional[str] = None
+    ) -> Optional[HelmRelease]:
+        """
+        Like :meth:`get_release`, but runs helm without blocking the event loop
+        """
+        key = _get_key(name, namespace)
+        cached, release = self.__get_cached(key)
+        if cached:
+            return release
+        loop = asyncio.get_running_loop()
+        # Coroutines looking up the same release at the same time share one helm
+        # command
+        lookup = self.__lookups.get(key)
+        if lookup is None or lookup[0] is not loop:
+            lookup = (loop, asyncio.ensure_future(self.__look_up_async(key)))
+            self.__lookups[key] = lookup
+        return await asyncio.shield(lookup[1])
+
+    async def __look_up_async(self, key: _ReleaseKey) -> Optional[HelmRelease]:
+        try:
+            started = time.monotonic()
+            release = await self._find_release_async(key[1], key[0])
+            self.__store(key, release, started)
+            return release
+        finally:
+            del self.__lookups[key]
+
+    def is_installed(self, name: str, namespace: Optional[str] = None) -> bool:
+        """
+        :param name: The name of the release
+        :param namespace: The namespace of the release
+
+        :returns: True if the release is installed
+        """
+        return self.get_release(name, namespace) is not None
+
+    async def is_installed_async(
+        self, name: str, namespace: Optional[str] = None
+    ) -> bool:
+        """
+        Like :meth:`is_installed`, but runs helm without blocking the event loop
+        """
+        return await self.get_release_async(name, namespace) is not None
+
+    def __store_listed(self, releases: List[HelmRelease], started: float):
+        listed = {
+            (release.namespace, release.name): release
+            for release in releases
+            if release.status != "uninstalled"
+        }
+        with self.__lock:
+            if started < self.__all_invalidated_at:
+                return
+            for key in set(listed) | set(self.__releases):
+                if key[0] is not None and not self.__is_outdated(key, started):
+                    self.__releases[key] = (listed.get(key), started)
+            self.__loaded_at = started
+
+    def load(self):
+        """
+        Looks up every release of every namespace with a single
+        ``helm list --all-namespaces``, which is quicker than looking up many
+        releases one by one
+        """
+        started = time.monotonic()
+        self.__store_listed(self._list_releases(), started)
+
+    async def load_async(self):
+        """
+        Like :meth:`load`, but runs helm without blocking the event loop
+        """
+        started = time.monotonic()
+        self.__store_listed(await self._list_releases_async(), started)
+
+    def invalidate(self, name: Optional[str] = None, namespace: Optional[str] = None):
+        """
+        Looks releases up again the next time they are needed
+
+        :param name: The name of the release to look up again, every release if \
+            not given
+        :param namespace: The namespace of the release
+        """
+        now = time.monotonic()
+        with self.__lock:
+            if name is None:
+                self.__releases = {}
+                self.__invalidated_at = {}
+                self.__all_invalidated_at = now
+                self.__loaded_at = None
+                return
+            key = _get_key(name, namespace)
+            self.__releases.pop(key, None)
+            self.__invalidated_at[key] = now
+
+    def set_installed(
+        self, name: str, namespace: Optional[str] = None, digest: str = ""
+    ):
+        """
+        Records that a release was installed or upgraded, a release already known
+        moves on to its next revision
+
+        :param name: The name of the release
+        :param namespace: The namespace of the release
+        :param digest: The digest of the chart the release was installed with
+        """
+        key = _get_key(name, namespace)
+        with self.__lock:
+            entry = self.__releases.get(key)
+            release = None if entry is None else entry[0]
+            if release is None:
+                release = HelmRelease(name, key[0], digest=digest)
+            else:
+                release = HelmRelease(
+                    name,
+                    key[0],
+                    release.revision + 1,
+                    release.updated,
+                    "deployed",
+                    release.chart,
+                    release.app_version,
+                    digest,
+                )
+            self.__releases[key] = (release, time.monotonic())
+
+    def set_uninstalled(self, name: str, namespace: Optional[str] = None):
+        """
+        Records that a release was uninstalled
+
+        :param name: The name of the release
+        :param namespace: The namespace of the release
+        """
+        key = _get_key(name, namespace)
+        with self.__lock:
+            self.__releases[key] = (None, time.monotonic())
+
+
+SHARED_RELEASE_STATE = ReleaseStateCache()
@@ -0,0 +1,229 @@
+"""
+The chart repositories known to helm, read from the repository config file of helm
+rather than from ``helm repo list``, with what was read cached on disk until the
+file changes
+"""
+
+import asyncio
+from hashlib import sha256
+import json
+from logging import info
+import os
+from pathlib import Path
+import sys
+import tempfile
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+
+from avionix._process_utils import custom_check_output, custom_check_output_async
+from avionix.chart.utils import get_cache_directory, get_file_stamp
+
+# When the config file was last changed, and its size
+_Stamp = Tuple[int, int]
+
+
+def _get_config_home() -> Path:
+    # Where helm looks for its config, see helm env
+    if os.environ.get("HELM_CONFIG_HOME"):
+        return Path(os.environ["HELM_CONFIG_HOME"])
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Preferences" / "helm"
+    if sys.platform == "win32":
+        return Path(os.environ["APPDATA"]) / "helm"
+    config_home = os.environ.get("XDG_CONFIG_HOME") or str(Path.home() / ".config")
+    return Path(config_home) / "helm"
+
+
+def get_repository_config() -> Path:
+    """
+    :returns: The path of the repository config file helm uses, given by the \
+        *HELM_REPOSITORY_CONFIG* environment variable or found in the config \
+        directory of helm
+    """
+    if os.environ.get("HELM_REPOSITORY_CONFIG"):
+        return Path(os.environ["HELM_REPOSITORY_CONFIG"])
+    return _get_config_home() / "repositories.yaml"
+
+
+def get_repository_cache() -> Path:
+    """
+    :returns: The directory helm keeps the downloaded indexes of repositories in, \
+        given by the *HELM_REPOSITORY_CACHE* environment variable or found in the \
+        cache directory of helm
+    """
+    if os.environ.get("HELM_REPOSITORY_CACHE"):
+        return Path(os.environ["HELM_REPOSITORY_CACHE"])
+    if os.environ.get("HELM_CACHE_HOME"):
+        cache_home = Path(os.environ["HELM_CACHE_HOME"])
+    elif sys.platform == "darwin":
+        cache_home = Path.home() / "Library" / "Caches" / "helm"
+    elif sys.platform == "win32":
+        cache_home = Path(os.environ["TEMP"]) / "helm"
+    else:
+        cache_home = (
+            Path(os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache"))
+            / "helm"
+        )
+    return cache_home / "repository"
+
+
+def _read_config(config: Path) -> dict:
+    try:
+        with open(config) as config_file:
+            content = yaml.safe_load(config_file)
+    except FileNotFoundError:
+        return {}
+    return content or {}
+
+
+class HelmRepositoryCache:
+    """
+    The chart repositories known to helm, by name. They are read from the
+    repository config file of helm, and cached on disk, keyed by the location of
+    the config file, until the config file changes
+
+    :param cache_directory: The directory to cache the repositories in, defaults to \
+        :func:`get_cache_directory`
+    """
+
+    def __init__(self, cache_directory: Optional[Path] = None):
+        self.cache_directory = (
+            get_cache_directory() if cache_directory is None else cache_directory
+        )
+        self.__repositories: Dict[Path, Tuple[_Stamp, Dict[str, str]]] = {}
+        self.__lock = Lock()
+
+    def __get_cache_file(self, config: Path) -> Path:
+        key = sha256(str(config.resolve()).encode("utf-8")).hexdigest()[:16]
+        return self.cache_directory / f"repositories-{key}.json"
+
+    def __read_cache_file(self, config: Path, stamp: _Stamp) -> Optional[dict]:
+        try:
+            with open(self.__get_cache_file(config)) as cache_file:
+                cached = json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+        if cached.get("config") != str(config) or cached.get("stamp") != list(stamp):
+            return None
+        return cached["repositories"]
+
+    def __write_cache_file(
+        self, config: Path, stamp: _Stamp, repositories: Dict[str, str]
+    ):
+        cached = {"config": str(config), "stamp": stamp, "repositories": repositories}
+        try:
+            self.cache_directory.mkdir(parents=True, exist_ok=True)
+            # Written to a temporary file first so that readers never find part of
+            # a cache file
+            with tempfile.NamedTemporaryFile(
+                "w", dir=str(self.cache_directory), delete=False, suffix=".tmp"
+            ) as cache_file:
+                json.dump(cached, cache_file)
+            os.replace(cache_file.name, self.__get_cache_file(config))
+        except OSError as err:
+            # The repositories can still be read from the config file next time
+            info(f"Could not cache helm repositories: {err}")
+
+    def get_repositories(self, config: Optional[Path] = None) -> Dict[str, str]:
+        """
+        :param config: The repository config file of helm, defaults to \
+            :func:`get_repository_config`
+
+        :returns: The URL of each repository, keyed by repository name
+        """
+        config = get_repository_config() if config is None else config
+        stamp = get_file_stamp(config)
+        if stamp is None:
+            return {}
+        with self.__lock:
+            cached = self.__repositories.get(config)
+            if cached is not None and cached[0] == stamp:
+                return dict(cached[1])
+        repositories = self.__read_cache_file(config, stamp)
+        if repositories is None:
+            repositories = {
+                repository["name"]: repository["url"]
+                for repository in _read_config(config).get("repositories") or []
+            }
+            self.__write_cache_file(config, stamp, repositories)
+        with self.__lock:
+            self.__repositories[config] = (stamp, repositories)
+        return dict(repositories)
+
+    def __get_changed(
+        self, repositories: Dict[str, str], config: Path
+    ) -> Dict[str, Optional[str]]:
+        """
+        :returns: The URL known to helm of each repository that is missing or has \
+            another URL, None for repositories that are missing
+        """
+        known = self.get_repositories(config)
+        return {
+            name: known.get(name)
+            for name, url in repositories.items()
+            if known.get(name) != url
+        }
+
+    @staticmethod
+    def __get_add_command(
+        name: str, url: str, known_url: Optional[str], config: Path
+    ) -> List[str]:
+        command = ["helm", "repo", "add", name, url]
+        command += ["--repository-config", str(config.resolve())]
+        if known_url is not None:
+            # Only given when needed, as older versions of helm don't have it
+            command.append("--force-update")
+        return command
+
+    def add_repositories(
+        self, repositories: Dict[str, str], config: Optional[Path] = None
+    ) -> List[str]:
+        """
+        Adds the repositories that are missing or have another URL with
+        ``helm repo add``, which also downloads their indexes. Repositories that
+        already exist with another URL are given the new URL
+
+        :param repositories: The URL of each repository, keyed by repository name
+        :param config: The repository config file of helm, defaults to \
+            :func:`get_repository_config`
+
+        :returns: The names of the repositories that were added or changed
+        """
+        config = get_repository_config() if config is None else config
+        changed = self.__get_changed(repositories, config)
+        for name, known_url in changed.items():
+            custom_check_output(
+                self.__get_add_command(name, repositories[name], known_url, config)
+            )
+        if changed:
+            info(f"Added helm repositories {', '.join(changed)}")
+        return list(changed)
+
+    async def add_repositories_async(
+        self, repositories: Dict[str, str], config: Optional[Path] = None
+    ) -> List[str]:
+        """
+        Like :meth:`add_repositories`, but waits for helm without blocking the event
+        loop, adding the repositories at the same time
+        """
+        config = get_repository_config() if config is None else config
+        changed = await asyncio.get_running_loop().run_in_executor(
+            None, self.__get_changed, repositories, config
+        )
+        # helm locks its repository config while adding a repository
+        await asyncio.gather(
+            *(
+                custom_check_output_async(
+                    self.__get_add_command(name, repositories[name], known_url, config)
+                )
+                for name, known_url in changed.items()
+            )
+        )
+        if changed:
+            info(f"Added helm repositories {', '.join(changed)}")
+        return list(changed)
+
+
+SHARED_REPOSITORY_CACHE = HelmRepositoryCache()
@@ -0,0 +1,189 @@
+"""
+Semantic versions and the version constraints of chart dependencies, following the
+rules helm uses to resolve them
+"""
+
+import re
+from typing import Callable, List, Optional, Tuple
+
+# Major, minor and patch, then a key ordering prereleases before the release
+Version = Tuple[int, int, int, tuple]
+
+_RELEASE = (1,)
+
+_VERSION = re.compile(
+    r"^v?(\d+)(?:\.(\d+))?(?:\.(\d+))?"
+    r"(?:-([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?"
+    r"(?:\+[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*)?$"
+)
+
+_PARTIAL_VERSION = (
+    r"v?(?:\d+|[xX*])(?:\.(?:\d+|[xX*])){0,2}"
+    r"(?:-[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*)?"
+    r"(?:\+[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*)?"
+)
+
+_COMPARISON = re.compile(
+    r"\s*,?\s*(!=|>=|=>|<=|=<|~>|[=><~^])?\s*(" + _PARTIAL_VERSION + r")"
+)
+
+_HYPHEN_RANGE = re.compile(
+    r"(" + _PARTIAL_VERSION + r")\s+-\s+(" + _PARTIAL_VERSION + r")"
+)
+
+_Predicate = Callable[[Version], bool]
+
+
+def _get_prerelease_key(prerelease: Optional[str]) -> tuple:
+    if prerelease is None:
+        return _RELEASE
+    # Numeric identifiers have lower precedence than alphanumeric ones
+    return (0,) + tuple(
+        (0, int(identifier)) if identifier.isdigit() else (1, identifier)
+        for identifier in prerelease.split(".")
+    )
+
+
+def parse_version(version: str) -> Optional[Version]:
+    """
+    :param version: A semantic version, missing minor and patch versions are taken \
+        as 0
+
+    :returns: A key ordering versions by precedence, or None if the version isn't a \
+        semantic version
+    """
+    match = _VERSION.match(version.strip())
+    if match is None:
+        return None
+    major, minor, patch, prerelease = match.groups()
+    return (
+        int(major),
+        int(minor or 0),
+        int(patch or 0),
+        _get_prerelease_key(prerelease),
+    )
+
+
+def _bump(numbers: List[int], position: int) -> Version:
+    # The lowest version above every version starting with the numbers up to position
+    bumped = numbers[:position] + [numbers[position] + 1] + [0] * (2 - position)
+    return bumped[0], bumped[1], bumped[2], (0,)
+
+
+def _between(lower: Version, upper: Version) -> _Predicate:
+    return lambda version: lower <= version < upper
+
+
+def _parse_comparison(operator: str, partial_version: str) -> _Predicate:
+    partial_version = partial_version.lstrip("v").split("+")[0]
+    numbers_text, _, prerelease = partial_version.partition("-")
+    parts = numbers_text.split(".")
+    parts += ["x"] * (3 - len(parts))
+    # How many numbers are given before the first wildcard
+    given = next(
+        (position for position, part in enumerate(parts) if not part.isdigit()), 3
+    )
+    numbers = [int(part) for part in parts[:given]] + [0] * (3 - given)
+    lower: Version = (
+        numbers[0],
+        numbers[1],
+        numbers[2],
+        _get_prerelease_key(prerelease or None),
+    )
+
+    if operator in ("", "="):
+        if given == 0:
+            predicate: _Predicate = lambda version: True
+        elif given == 3:
+            predicate = lambda version: version == lower
+        else:
+            predicate = _between(lower, _bump(numbers, given - 1))
+    elif operator == "!=":
+        matches = _parse_comparison("=", partial_version)
+        predicate = lambda version: not matches(version)
+    elif operator == ">":
+        if given == 3:
+            predicate = lambda version: version > lower
+        elif given == 0:
+            predicate = lambda version: False
+        else:
+            upper = _bump(numbers, given - 1)
+            predicate = lambda version: version >= upper
+    elif operator in (">=", "=>"):
+        predicate = lambda version: version >= lower
+    elif operator == "<":
+        predicate = lambda version: version < lower
+    elif operator in ("<=", "=<"):
+        if given == 3:
+            predicate = lambda version: version <= lower
+        elif given == 0:
+            predicate = lambda version: True
+        else:
+            upper = _bump(numbers, given - 1)
+            predicate = lambda version: version < upper
+    elif operator in ("~", "~>"):
+        if given == 0:
+            predicate = lambda version: True
+        else:
+            predicate = _between(lower, _bump(numbers, 1 if given > 1 else 0))
+    else:
+        if given == 0:
+            predicate = lambda version: True
+        elif numbers[0] > 0 or given == 1:
+            predicate = _between(lower, _bump(numbers, 0))
+        elif numbers[1] > 0 or given == 2:
+            predicate = _between(lower, _bump(numbers, 1))
+        else:
+            predicate = _between(lower, _bump(numbers, 2))
+
+    if prerelease:
+        return predicate
+    # Prereleases are only matched by comparisons with a prerelease
+    return lambda version: version[3] == _RELEASE and predicate(version)
+
+
+def _parse_group(group: str) -> List[_Predicate]:
+    group = _HYPHEN_RANGE.sub(r">=\1, <=\2", group).strip()
+    if group in ("", "*", "x", "X"):
+        return [_parse_comparison("", "*")]
+    comparisons = []
+    position = 0
+    while position < len(group):
+        match = _COMPARISON.match(group, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Invalid version constraint {group!r}")
+        comparisons.append(_parse_comparison(match.group(1) or "", match.group(2)))
+        position = match.end()
+        # Comparisons are separated by commas or spaces
+        if position < len(group) and group[position] not in ", ":
+            raise ValueError(f"Invalid version constraint {group!r}")
+    return comparisons
+
+
+class VersionConstraint:
+    """
+    A version constraint such as ``^1.2.0`` or ``>=1.0.0 <2.0.0 || 3.x``, with
+    the syntax and meaning helm gives the versions of dependencies. Prereleases
+    only satisfy comparisons with a prerelease
+
+    :param constraint: The constraint
+
+    :raises ValueError: If the constraint isn't valid
+    """
+
+    def __init__(self, constraint: str):
+        self.constraint = constraint
+        self.__groups = [_parse_group(group) for group in constraint.split("||")]
+
+    def is_satisfied_by(self, version: Version) -> bool:
+        """
+        :param version: A version parsed by :func:`parse_version`
+
+        :returns: True if the version satisfies the constraint
+        """
+        return any(
+            all(comparison(version) for comparison in group) for group in self.__groups
+        )
+
+    def __repr__(self):
+        return f"VersionConstraint({self.constraint!r})"
@@ -1,12 +1,266 @@
-from typing import Optional
+import json
+import os
+from pathlib import Path
+import subprocess
+from typing import Dict, List, Optional, Tuple
 
-from avionix._process_utils import custom_check_output
-from avionix.testing.helpers import parse_output_to_dict
+from avionix._process_utils import custom_check_output, custom_check_output_async
+from avionix.chart.release_digest import DIGEST_ANNOTATION
 
+# The columns of the table printed by helm list, and the fields they come from
+HELM_LIST_COLUMNS = {
+    "NAME": "name",
+    "NAMESPACE": "namespace",
+    "REVISION": "revision",
+    "UPDATED": "updated",
+    "STATUS": "status",
+    "CHART": "chart",
+    "APP VERSION": "app_version",
+}
 
-def get_helm_installations(namespace: Optional[str] = None):
-    command = "helm list"
+# Printed by helm status for releases that don't exist
+_RELEASE_NOT_FOUND = b"release: not found"
+
+
+def get_cache_directory() -> Path:
+    """
+    :returns: The directory avionix caches files in, *avionix* in the directory \
+        given by the *XDG_CACHE_HOME* environment variable or *~/.cache*
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache_home) / "avionix"
+
+
+def get_file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    """
+    :returns: When the file was last changed, in nanoseconds, and its size, or None \
+        if it doesn't exist
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class HelmRelease:
+    """
+    A release as listed by ``helm list -o json``
+
+    :param name: The name of the release
+    :param namespace: The namespace of the release, None for a release recorded \
+        in the namespace of the kubernetes context without looking it up
+    :param revision: The number of times the release was installed or upgraded
+    :param updated: When the release was last installed or upgraded, as helm \
+        prints it
+    :param status: The status of the release, such as "deployed" or "failed"
+    :param chart: The name and version of the chart, such as *grafana-5.0.0*
+    :param app_version: The version of the application in the chart
+    :param digest: The digest of the chart avionix generated for the release, only \
+        known when the release was looked up with ``helm status``, see \
+        :func:`~avionix.chart.release_digest.get_chart_digest`
+    """
+
+    def __init__(
+        self,
+        name: str,
+        namespace: Optional[str],
+        revision: int = 1,
+        updated: str = "",
+        status: str = "deployed",
+        chart: str = "",
+        app_version: str = "",
+        digest: str = "",
+    ):
+        self.name = name
+        self.namespace = namespace
+        self.revision = revision
+        self.updated = updated
+        self.status = status
+        self.chart = chart
+        self.app_version = app_version
+        self.digest = digest
+
+    @classmethod
+    def from_json(cls, release: dict) -> "HelmRelease":
+        return cls(
+            release["name"],
+            release["namespace"],
+            int(release["revision"]),
+            release.get("updated", ""),
+            release.get("status", ""),
+            release.get("chart", ""),
+            release.get("app_version", ""),
+        )
+
+    @classmethod
+    def from_status_json(cls, release: dict) -> "HelmRelease":
+        """
+        :param release: A release as printed by ``helm status -o json``
+        """
+        metadata = release.get("chart", {}).get("metadata", {})
+        chart = f"{metadata['name']}-{metadata['version']}" if metadata else ""
+        info = release.get("info", {})
+        return cls(
+            release["name"],
+            release["namespace"],
+            int(release["version"]),
+            info.get("last_deployed", ""),
+            info.get("status", ""),
+            chart,
+            metadata.get("appVersion", ""),
+            (metadata.get("annotations") or {}).get(DIGEST_ANNOTATION, ""),
+        )
+
+    def __eq__(self, other):
+        return isinstance(other, HelmRelease) and vars(self) == vars(other)
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}({self.name!r}, {self.namespace!r}, "
+            f"revision={self.revision}, status={self.status!r})"
+        )
+
+
+def parse_helm_releases(output: str) -> List[HelmRelease]:
+    """
+    :param output: The output of ``helm list -o json``
+
+    :returns: The releases listed
+    """
+    if not output.strip():
+        return []
+    return [HelmRelease.from_json(release) for release in json.loads(output)]
+
+
+def get_release_columns(releases: List[HelmRelease]) -> Dict[str, Tuple[str, ...]]:
+    """
+    :param releases: Releases listed by helm
+
+    :returns: The values of each column of the table helm list prints, keyed by \
+        column name, or an empty dictionary when there are no releases
+    """
+    if not releases:
+        return {}
+    return {
+        column: tuple(str(getattr(release, field)) for release in releases)
+        for column, field in HELM_LIST_COLUMNS.items()
+    }
+
+
+def _get_helm_list_command(
+    namespace: Optional[str] = None,
+    all_namespaces: bool = False,
+    all_statuses: bool = False,
+) -> List[str]:
+    # helm list only lists the first 256 releases unless given a maximum, 0 lists
+    # every release
+    command = ["helm", "list", "--max", "0", "-o", "json"]
+    if all_statuses:
+        command.append("--all")
+    if all_namespaces:
+        command.append("--all-namespaces")
+    elif namespace is not None:
+        command += ["-n", namespace]
+    return command
+
+
+def list_helm_releases(
+    namespace: Optional[str] = None,
+    all_namespaces: bool = False,
+    all_statuses: bool = False,
+) -> List[HelmRelease]:
+    """
+    :param namespace: The namespace to list the releases of, defaults to the \
+        namespace of the kubernetes context
+    :param all_namespaces: Whether to list the releases of every namespace
+    :param all_statuses: Whether to list releases whatever their status, rather \
+        than only deployed and failed releases
+
+    :returns: The releases in the namespace
+    """
+    return parse_helm_releases(
+        custom_check_output(
+            _get_helm_list_command(namespace, all_namespaces, all_statuses)
+        )
+    )
+
+
+async def list_helm_releases_async(
+    namespace: Optional[str] = None,
+    all_namespaces: bool = False,
+    all_statuses: bool = False,
+) -> List[HelmRelease]:
+    """
+    Like :func:`list_helm_releases`, but waits for helm without blocking the event
+    loop
+    """
+    return parse_helm_releases(
+        await custom_check_output_async(
+            _get_helm_list_command(namespace, all_namespaces, all_statuses)
+        )
+    )
+
+
+def _get_helm_status_command(name: str, namespace: Optional[str] = None) -> List[str]:
+    command = ["helm", "status", name, "-o", "json"]
     if namespace is not None:
-        command += f" -n {namespace}"
-    output = custom_check_output(command)
-    return parse_output_to_dict(output)
+        command += ["-n", namespace]
+    return command
+
+
+def _parse_helm_status(output: str) -> Optional[HelmRelease]:
+    release = HelmRelease.from_status_json(json.loads(output))
+    # Releases uninstalled with --keep-history are kept until purged
+    return None if release.status == "uninstalled" else release
+
+
+def get_helm_release(
+    name: str, namespace: Optional[str] = None
+) -> Optional[HelmRelease]:
+    """
+    Looks up one release with ``helm status``, which takes the same time however
+    many releases are installed
+
+    :param name: The name of the release
+    :param namespace: The namespace of the release, defaults to the namespace of \
+        the kubernetes context
+
+    :returns: The release, or None if it is not installed
+    """
+    try:
+        output = custom_check_output(_get_helm_status_command(name, namespace))
+    except subprocess.CalledProcessError as err:
+        if _RELEASE_NOT_FOUND in err.output:
+            return None
+        raise
+    return _parse_helm_status(output)
+
+
+async def get_helm_release_async(
+    name: str, namespace: Optional[str] = None
+) -> Optional[HelmRelease]:
+    """
+    Like :func:`get_helm_release`, but waits for helm without blocking the event loop
+    """
+    try:
+        output = await custom_check_output_async(
+            _get_helm_status_command(name, namespace)
+        )
+    except subprocess.CalledProcessError as err:
+        if _RELEASE_NOT_FOUND in err.output:
+            return None
+        raise
+    return _parse_helm_status(output)
+
+
+def get_helm_installations(namespace: Optional[str] = None):
+    """
+    :returns: The releases in the namespace, in the shape of the table helm list \
+        prints, see :func:`get_release_columns`
+    """
+    return get_release_columns(list_helm_releases(namespace))
+
+
+async def get_helm_installations_async(namespace: Optional[str] = None):
+    return get_release_columns(await list_helm_releases_async(namespace))
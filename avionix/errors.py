@@ -56,3 +56,13 @@ class NamespaceDoesNotExist(AvionixError):
 
 class NamespaceBeingTerminatedError(AvionixError):
     pass
+
+
+class ReleaseOrchestrationError(AvionixError):
+    def __init__(self, msg: str, report):
+        super().__init__(msg)
+        self.report = report
+
+
+class DependencyResolutionError(AvionixError):
+    pass
@@ -37,6 +37,8 @@ class RuleWithOperations(HelmYaml):
         Default is "*".
     """
 
+    __slots__ = ("apiGroups", "apiVersions", "operations", "resources", "scope")
+
     def __init__(
         self,
         api_groups: List[str],
@@ -127,6 +129,19 @@ class ValidatingWebhook(HelmYaml):
         30 seconds. Default to 10 seconds.
     """
 
+    __slots__ = (
+        "name",
+        "admissionReviewVersions",
+        "clientConfig",
+        "sideEffects",
+        "failurePolicy",
+        "matchPolicy",
+        "namespaceSelector",
+        "objectSelector",
+        "rules",
+        "timeoutSeconds",
+    )
+
     def __init__(
         self,
         name: str,
@@ -164,6 +179,8 @@ class ValidatingWebhookConfiguration(AdmissionRegistration):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("webhooks",)
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -264,6 +281,20 @@ class MutatingWebhook(HelmYaml):
         30 seconds. Default to 10 seconds.
     """
 
+    __slots__ = (
+        "name",
+        "admissionReviewVersions",
+        "clientConfig",
+        "sideEffects",
+        "failurePolicy",
+        "matchPolicy",
+        "namespaceSelector",
+        "objectSelector",
+        "reinvocationPolicy",
+        "rules",
+        "timeoutSeconds",
+    )
+
     def __init__(
         self,
         name: str,
@@ -303,6 +334,8 @@ class MutatingWebhookConfiguration(AdmissionRegistration):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("webhooks",)
+
     def __init__(
         self,
         metadata: ObjectMeta,
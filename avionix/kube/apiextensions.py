@@ -13,6 +13,8 @@ from avionix.yaml.yaml_handling import HelmYaml
 class JSONSchemaPropsOrBool(HelmYaml):
     """"""
 
+    __slots__ = ()
+
     pass
 
 
@@ -41,6 +43,8 @@ class WebhookClientConfig(HelmYaml):
         Fragments ("#...") and query parameters ("?...") are not allowed, either.
     """
 
+    __slots__ = ("caBundle", "service", "url")
+
     def __init__(
         self,
         ca_bundle: Optional[str] = None,
@@ -55,12 +59,16 @@ class WebhookClientConfig(HelmYaml):
 class JSON(HelmYaml):
     """"""
 
+    __slots__ = ()
+
     pass
 
 
 class JSONSchemaPropsOrArray(HelmYaml):
     """"""
 
+    __slots__ = ()
+
     pass
 
 
@@ -70,6 +78,8 @@ class ExternalDocumentation(HelmYaml):
     :param description: None
     """
 
+    __slots__ = ("url", "description")
+
     def __init__(self, url: str, description: Optional[str] = None):
         self.url = url
         self.description = description
@@ -192,6 +202,45 @@ class JSONSchemaProps(HelmYaml):
         forbidden.
     """
 
+    __slots__ = (
+        "type",
+        "additionalItems",
+        "additionalProperties",
+        "allOf",
+        "anyOf",
+        "default",
+        "definitions",
+        "dependencies",
+        "description",
+        "enum",
+        "example",
+        "exclusiveMaximum",
+        "exclusiveMinimum",
+        "externalDocs",
+        "format",
+        "id",
+        "items",
+        "maxItems",
+        "maxLength",
+        "maxProperties",
+        "maximum",
+        "minItems",
+        "minLength",
+        "minProperties",
+        "minimum",
+        "multipleOf",
+        "not",
+        "nullable",
+        "oneOf",
+        "pattern",
+        "patternProperties",
+        "properties",
+        "required",
+        "title",
+        "uniqueItems",
+        "__dict__",
+    )
+
     def __init__(
         self,
         type: Optional[str] = None,
@@ -287,6 +336,8 @@ class CustomResourceValidation(HelmYaml):
         validation and pruning.
     """
 
+    __slots__ = ("openAPIV3Schema",)
+
     def __init__(self, open_apiv3_schema: JSONSchemaProps):
         self.openAPIV3Schema = open_apiv3_schema
 
@@ -312,6 +363,8 @@ class CustomResourceColumnDefinition(HelmYaml):
         priority greater than 0.
     """
 
+    __slots__ = ("name", "jsonPath", "type", "description", "format", "priority")
+
     def __init__(
         self,
         name: str,
@@ -353,6 +406,8 @@ class CustomResourceSubresourceScale(HelmYaml):
         string.
     """
 
+    __slots__ = ("labelSelectorPath", "specReplicasPath", "statusReplicasPath")
+
     def __init__(
         self,
         spec_replicas_path: str,
@@ -370,6 +425,8 @@ class CustomResourceSubresources(HelmYaml):
         subresource that returns an `autoscaling/v1` Scale object.
     """
 
+    __slots__ = ("scale",)
+
     def __init__(self, scale: CustomResourceSubresourceScale):
         self.scale = scale
 
@@ -395,6 +452,15 @@ class CustomResourceDefinitionVersion(HelmYaml):
         defined custom resource have.
     """
 
+    __slots__ = (
+        "name",
+        "additionalPrinterColumns",
+        "schema",
+        "served",
+        "storage",
+        "subresources",
+    )
+
     def __init__(
         self,
         name: str,
@@ -425,6 +491,8 @@ class WebhookConversion(HelmYaml):
         the webhook will fail.
     """
 
+    __slots__ = ("clientConfig", "conversionReviewVersions")
+
     def __init__(
         self, client_config: WebhookClientConfig, conversion_review_versions: List[str]
     ):
@@ -447,6 +515,8 @@ class CustomResourceConversion(HelmYaml):
         spec.preserveUnknownFields to be false, and spec.conversion.webhook to be set.
     """
 
+    __slots__ = ("webhook", "strategy")
+
     def __init__(self, webhook: WebhookConversion, strategy: str):
         self.webhook = webhook
         self.strategy = strategy
@@ -473,6 +543,8 @@ class CustomResourceDefinitionNames(HelmYaml):
         lowercase. Defaults to lowercased `kind`.
     """
 
+    __slots__ = ("categories", "kind", "plural", "listKind", "shortNames", "singular")
+
     def __init__(
         self,
         categories: List[str],
@@ -520,6 +592,15 @@ class CustomResourceDefinitionSpec(HelmYaml):
         for details.
     """
 
+    __slots__ = (
+        "group",
+        "names",
+        "scope",
+        "versions",
+        "conversion",
+        "preserveUnknownFields",
+    )
+
     def __init__(
         self,
         group: str,
@@ -547,6 +628,8 @@ class CustomResourceDefinition(ApiExtensions):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     def __init__(
         self,
         metadata: ObjectMeta,
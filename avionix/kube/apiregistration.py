@@ -18,6 +18,8 @@ class ServiceReference(HelmYaml):
         inclusive).
     """
 
+    __slots__ = ("name", "namespace", "port")
+
     def __init__(self, name: str, namespace: str, port: Optional[int] = None):
         self.name = name
         self.namespace = namespace
@@ -62,6 +64,16 @@ class APIServiceSpec(HelmYaml):
         delegate to the normal handler chain to be fulfilled.
     """
 
+    __slots__ = (
+        "group",
+        "groupPriorityMinimum",
+        "version",
+        "versionPriority",
+        "caBundle",
+        "insecureSkipTLSVerify",
+        "service",
+    )
+
     def __init__(
         self,
         group: str,
@@ -91,6 +103,8 @@ class APIService(ApiRegistration):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -16,6 +16,8 @@ class RollingUpdateStatefulSetStrategy(HelmYaml):
         be partitioned. Default value is 0.
     """
 
+    __slots__ = ("partition",)
+
     def __init__(self, partition: int):
         self.partition = partition
 
@@ -28,6 +30,8 @@ class StatefulSetUpdateStrategy(HelmYaml):
         RollingUpdate.
     """
 
+    __slots__ = ("rollingUpdate", "type")
+
     def __init__(
         self,
         rolling_update: Optional[RollingUpdateStatefulSetStrategy] = None,
@@ -78,6 +82,17 @@ class StatefulSetSpec(HelmYaml):
         Template.
     """
 
+    __slots__ = (
+        "template",
+        "podManagementPolicy",
+        "revisionHistoryLimit",
+        "selector",
+        "serviceName",
+        "volumeClaimTemplates",
+        "replicas",
+        "updateStrategy",
+    )
+
     def __init__(
         self,
         template: PodTemplateSpec,
@@ -109,6 +124,8 @@ class StatefulSet(Apps):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -132,6 +149,8 @@ class ControllerRevision(Apps):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("data", "revision")
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -167,6 +186,8 @@ class RollingUpdateDeployment(HelmYaml):
         during the update is at least 70% of desired pods.
     """
 
+    __slots__ = ("maxSurge", "maxUnavailable")
+
     def __init__(
         self,
         max_surge: Optional[Union[int, str]] = None,
@@ -192,6 +213,8 @@ class RollingUpdateDaemonSet(HelmYaml):
         during the update.
     """
 
+    __slots__ = ("maxUnavailable",)
+
     def __init__(self, max_unavailable: Union[int, str]):
         self.maxUnavailable = max_unavailable
 
@@ -204,6 +227,8 @@ class DaemonSetUpdateStrategy(HelmYaml):
         Default is RollingUpdate.
     """
 
+    __slots__ = ("rollingUpdate", "type")
+
     def __init__(
         self,
         rolling_update: Optional[RollingUpdateDaemonSet] = None,
@@ -235,6 +260,14 @@ class DaemonSetSpec(HelmYaml):
         new pods.
     """
 
+    __slots__ = (
+        "template",
+        "selector",
+        "minReadySeconds",
+        "revisionHistoryLimit",
+        "updateStrategy",
+    )
+
     def __init__(
         self,
         template: PodTemplateSpec,
@@ -262,6 +295,8 @@ class DaemonSet(Apps):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -291,6 +326,8 @@ class ReplicaSetSpec(HelmYaml):
         https://kubernetes.io/docs/concepts/workloads/controllers/replicationcontroller/#what-is-a-replicationcontroller  # noqa
     """
 
+    __slots__ = ("template", "selector", "minReadySeconds", "replicas")
+
     def __init__(
         self,
         template: PodTemplateSpec,
@@ -319,6 +356,8 @@ class ReplicaSet(Apps):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -338,6 +377,8 @@ class DeploymentStrategy(HelmYaml):
         RollingUpdate.
     """
 
+    __slots__ = ("rollingUpdate", "type")
+
     def __init__(
         self,
         rolling_update: Optional[RollingUpdateDeployment] = None,
@@ -373,6 +414,17 @@ class DeploymentSpec(HelmYaml):
         ones.
     """
 
+    __slots__ = (
+        "template",
+        "selector",
+        "minReadySeconds",
+        "paused",
+        "progressDeadlineSeconds",
+        "replicas",
+        "revisionHistoryLimit",
+        "strategy",
+    )
+
     def __init__(
         self,
         template: PodTemplateSpec,
@@ -404,6 +456,8 @@ class Deployment(Apps):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     def __init__(
         self,
         metadata: ObjectMeta,
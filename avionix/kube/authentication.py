@@ -17,6 +17,8 @@ class BoundObjectReference(HelmYaml):
     :param uid: UID of the referent.
     """
 
+    __slots__ = ("apiVersion", "kind", "name", "uid")
+
     def __init__(
         self, api_version: str, kind: str, name: str, uid: Optional[str] = None
     ):
@@ -43,6 +45,8 @@ class TokenRequestSpec(HelmYaml):
         duration so a client needs to check the 'expiration' field in a response.
     """
 
+    __slots__ = ("audiences", "boundObjectRef", "expirationSeconds")
+
     def __init__(
         self,
         audiences: List[str],
@@ -64,6 +68,8 @@ class TokenRequest(Authentication):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -85,6 +91,8 @@ class TokenReviewSpec(HelmYaml):
     :param token: Token is the opaque bearer token.
     """
 
+    __slots__ = ("audiences", "token")
+
     def __init__(self, audiences: List[str], token: str):
         self.audiences = audiences
         self.token = token
@@ -100,6 +108,8 @@ class TokenReview(Authentication):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -16,6 +16,8 @@ class CrossVersionObjectReference(Autoscaling):
     :param api_version: API version of the referent
     """
 
+    __slots__ = ("name",)
+
     def __init__(self, name: str, kind: str, api_version: Optional[str] = None):
         super().__init__(api_version)
         self.name = name
@@ -39,6 +41,13 @@ class HorizontalPodAutoscalerSpec(HelmYaml):
         specified the default autoscaling policy will be used.
     """
 
+    __slots__ = (
+        "maxReplicas",
+        "scaleTargetRef",
+        "minReplicas",
+        "targetCPUUtilizationPercentage",
+    )
+
     def __init__(
         self,
         max_replicas: int,
@@ -64,6 +73,8 @@ class HorizontalPodAutoscaler(Autoscaling):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     def __init__(
         self,
         metadata: ObjectMeta,
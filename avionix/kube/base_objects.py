@@ -15,6 +15,8 @@ class KubernetesBaseObject(HelmYaml):
     https://kubernetes.io/docs/concepts/overview/working-with-objects/kubernetes-objects/
     """
 
+    __slots__ = ("kind", "apiVersion", "metadata")
+
     _version_prefix = ""
     _base_object_name = "KubernetesBaseObject"
     _non_standard_version = ""
@@ -57,12 +59,16 @@ class Core(KubernetesBaseObject):
     https://kubernetes.io/docs/concepts/overview/working-with-objects/kubernetes-objects/
     """
 
+    __slots__ = ()
+
 
 class Apps(KubernetesBaseObject):
     """
     Base class for apps group
     """
 
+    __slots__ = ()
+
     _version_prefix = "apps/"
 
 
@@ -71,6 +77,8 @@ class AdmissionRegistration(KubernetesBaseObject):
     Base class for admission registration group
     """
 
+    __slots__ = ()
+
     _version_prefix = "admissionregistration.k8s.io/"
 
 
@@ -79,6 +87,8 @@ class ApiExtensions(KubernetesBaseObject):
     Base class for api extensions group
     """
 
+    __slots__ = ()
+
     _version_prefix = "apiextensions.k8s.io/"
 
 
@@ -87,6 +97,8 @@ class ApiRegistration(KubernetesBaseObject):
     Base class for api registration
     """
 
+    __slots__ = ()
+
     _version_prefix = "apiregistration.k8s.io/"
 
 
@@ -95,6 +107,8 @@ class Extensions(KubernetesBaseObject):
     Base class for api registration
     """
 
+    __slots__ = ()
+
     _version_prefix = "extensions/"
 
 
@@ -103,6 +117,8 @@ class Batch(KubernetesBaseObject):
     Base class for api registration
     """
 
+    __slots__ = ()
+
     _version_prefix = "batch/"
 
 
@@ -111,64 +127,90 @@ class RbacAuthorization(KubernetesBaseObject):
     Base class for rbac authorization
     """
 
+    __slots__ = ()
+
     _version_prefix = "rbac.authorization.k8s.io/"
 
 
 class Storage(KubernetesBaseObject):
 
+    __slots__ = ()
+
     _version_prefix = "storage.k8s.io/"
 
 
 class Authentication(KubernetesBaseObject):
 
+    __slots__ = ()
+
     _version_prefix = "authentication.k8s.io/"
 
 
 class Authorization(KubernetesBaseObject):
 
+    __slots__ = ()
+
     _version_prefix = "authorization.k8s.io/"
 
 
 class Autoscaling(KubernetesBaseObject):
 
+    __slots__ = ()
+
     _version_prefix = "autoscaling/"
 
 
 class Coordination(KubernetesBaseObject):
 
+    __slots__ = ()
+
     _version_prefix = "coordination.k8s.io/"
 
 
 class Networking(KubernetesBaseObject):
 
+    __slots__ = ()
+
     _version_prefix = "networking.k8s.io/"
 
 
 class Node(KubernetesBaseObject):
 
+    __slots__ = ()
+
     _version_prefix = "node.k8s.io/"
 
 
 class Scheduling(KubernetesBaseObject):
 
+    __slots__ = ()
+
     _version_prefix = "scheduling.k8s.io/"
 
 
 class Policy(KubernetesBaseObject):
 
+    __slots__ = ()
+
     _version_prefix = "policy/"
 
 
 class Certificates(KubernetesBaseObject):
 
+    __slots__ = ()
+
     _version_prefix = "certificates.k8s.io/"
 
 
 class Discovery(KubernetesBaseObject):
 
+    __slots__ = ()
+
     _version_prefix = "discovery.k8s.io/"
 
 
 class Meta(KubernetesBaseObject):
 
+    __slots__ = ()
+
     _version_prefix = "meta.k8s.io/"
@@ -54,6 +54,17 @@ class JobSpec(HelmYaml):
         failed. Defaults to 6
     """
 
+    __slots__ = (
+        "template",
+        "completions",
+        "manualSelector",
+        "parallelism",
+        "selector",
+        "ttlSecondsAfterFinished",
+        "activeDeadlineSeconds",
+        "backoffLimit",
+    )
+
     def __init__(
         self,
         template: PodTemplateSpec,
@@ -87,6 +98,8 @@ class Job(Batch):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     def __init__(
         self, metadata: ObjectMeta, spec: JobSpec, api_version: Optional[str] = None
     ):
@@ -104,6 +117,8 @@ class JobTemplateSpec(HelmYaml):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#metadata  # noqa
     """
 
+    __slots__ = ("metadata", "spec")
+
     def __init__(
         self, spec: JobSpec, metadata: Optional[ObjectMeta] = None,
     ):
@@ -135,6 +150,16 @@ class CronJobSpec(HelmYaml):
         does not apply to already started executions.  Defaults to false.
     """
 
+    __slots__ = (
+        "concurrencyPolicy",
+        "jobTemplate",
+        "schedule",
+        "startingDeadlineSeconds",
+        "failedJobsHistoryLimit",
+        "successfulJobsHistoryLimit",
+        "suspend",
+    )
+
     def __init__(
         self,
         job_template: JobTemplateSpec,
@@ -167,6 +192,8 @@ class CronJob(Batch):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     _non_standard_version = "v1beta1"
 
     def __init__(
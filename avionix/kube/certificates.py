@@ -25,6 +25,8 @@ class CertificateSigningRequestSpec(HelmYaml):
         https://tools.ietf.org/html/rfc5280#section-4.2.1.12
     """
 
+    __slots__ = ("request", "signerName", "usages")
+
     def __init__(
         self,
         request: str,
@@ -46,6 +48,8 @@ class CertificateSigningRequest(Certificates):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     _non_standard_version = "v1beta1"
 
     def __init__(
@@ -24,6 +24,14 @@ class LeaseSpec(HelmYaml):
         updated the lease.
     """
 
+    __slots__ = (
+        "acquireTime",
+        "holderIdentity",
+        "leaseDurationSeconds",
+        "leaseTransitions",
+        "renewTime",
+    )
+
     def __init__(
         self,
         acquire_time: Optional[time] = None,
@@ -51,6 +59,8 @@ class Lease(Coordination):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     def __init__(
         self, metadata: ObjectMeta, spec: LeaseSpec, api_version: Optional[str] = None
     ):
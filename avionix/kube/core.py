@@ -22,6 +22,8 @@ class ScopedResourceSelectorRequirement(HelmYaml):
         patch.
     """
 
+    __slots__ = ("operator", "scopeName", "values")
+
     def __init__(
         self, operator: str, scope_name: str, values: Optional[List[str]] = None
     ):
@@ -36,6 +38,8 @@ class ScopeSelector(HelmYaml):
         resources.
     """
 
+    __slots__ = ("matchExpressions",)
+
     def __init__(
         self,
         match_expressions: Optional[List[ScopedResourceSelectorRequirement]] = None,
@@ -50,6 +54,8 @@ class ObjectFieldSelector(HelmYaml):
         defaults to "v1".
     """
 
+    __slots__ = ("fieldPath", "apiVersion")
+
     def __init__(self, field_path: str, api_version: Optional[str] = None):
         self.fieldPath = field_path
         self.apiVersion = api_version
@@ -63,6 +69,8 @@ class ResourceFieldSelector(HelmYaml):
         "1"
     """
 
+    __slots__ = ("containerName", "resource", "divisor")
+
     def __init__(
         self, container_name: str, resource: str, divisor: Optional[str] = None
     ):
@@ -87,6 +95,8 @@ class DownwardAPIVolumeFile(HelmYaml):
         result can be other mode bits set.
     """
 
+    __slots__ = ("fieldRef", "path", "resourceFieldRef", "mode")
+
     def __init__(
         self,
         path: str,
@@ -105,6 +115,8 @@ class DownwardAPIProjection(HelmYaml):
     :param items: Items is a list of DownwardAPIVolume file
     """
 
+    __slots__ = ("items",)
+
     def __init__(self, items: List[DownwardAPIVolumeFile]):
         self.items = items
 
@@ -124,6 +136,15 @@ class LimitRangeItem(HelmYaml):
         represents the max burst for the named resource.
     """
 
+    __slots__ = (
+        "default",
+        "defaultRequest",
+        "max",
+        "min",
+        "type",
+        "maxLimitRequestRatio",
+    )
+
     def __init__(
         self,
         default: dict,
@@ -148,6 +169,8 @@ class ClientIPConfig(HelmYaml):
         ServiceAffinity == "ClientIP". Default value is 10800(for 3 hours).
     """
 
+    __slots__ = ("timeoutSeconds",)
+
     def __init__(self, timeout_seconds: int):
         self.timeoutSeconds = timeout_seconds
 
@@ -158,6 +181,8 @@ class SessionAffinityConfig(HelmYaml):
         affinity.
     """
 
+    __slots__ = ("clientIP",)
+
     def __init__(self, client_ip: ClientIPConfig):
         self.clientIP = client_ip
 
@@ -174,6 +199,8 @@ class ResourceQuotaSpec(HelmYaml):
         quota. If not specified, the quota matches all objects.
     """
 
+    __slots__ = ("hard", "scopeSelector", "scopes")
+
     def __init__(
         self,
         hard: dict,
@@ -197,6 +224,8 @@ class ResourceQuota(Core):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -220,6 +249,8 @@ class KeyToPath(HelmYaml):
         result can be other mode bits set.
     """
 
+    __slots__ = ("key", "path", "mode")
+
     def __init__(self, key: str, path: str, mode: Optional[int] = None):
         self.key = key
         self.path = path
@@ -240,6 +271,8 @@ class SecretProjection(HelmYaml):
         the '..' path or start with '..'.
     """
 
+    __slots__ = ("name", "optional", "items")
+
     def __init__(
         self,
         name: str,
@@ -261,6 +294,8 @@ class ExecAction(HelmYaml):
         live/healthy and non-zero is unhealthy.
     """
 
+    __slots__ = ("command",)
+
     def __init__(self, command: List[str]):
         self.command = command
 
@@ -272,6 +307,8 @@ class VolumeDevice(HelmYaml):
         will be mapped to.
     """
 
+    __slots__ = ("name", "devicePath")
+
     def __init__(self, name: str, device_path: str):
         self.name = name
         self.devicePath = device_path
@@ -285,6 +322,8 @@ class ConfigMapKeySelector(HelmYaml):
     :param optional: Specify whether the ConfigMap or its key must be defined
     """
 
+    __slots__ = ("name", "key", "optional")
+
     def __init__(self, name: str, key: str, optional: Optional[bool] = None):
         self.name = name
         self.key = key
@@ -299,6 +338,8 @@ class SecretKeySelector(HelmYaml):
     :param optional: Specify whether the Secret or its key must be defined
     """
 
+    __slots__ = ("name", "key", "optional")
+
     def __init__(self, name: str, key: str, optional: Optional[bool] = None):
         self.name = name
         self.key = key
@@ -318,6 +359,8 @@ class EnvVarSource(HelmYaml):
     :param secret_key_ref: Selects a key of a secret in the pod's namespace
     """
 
+    __slots__ = ("configMapKeyRef", "fieldRef", "resourceFieldRef", "secretKeyRef")
+
     def __init__(
         self,
         config_map_key_ref: Optional[ConfigMapKeySelector] = None,
@@ -344,6 +387,8 @@ class EnvVar(HelmYaml):
         value is not empty.
     """
 
+    __slots__ = ("name", "value", "valueFrom")
+
     def __init__(
         self,
         name: str,
@@ -367,6 +412,8 @@ class ResourceRequirements(HelmYaml):
         https://kubernetes.io/docs/concepts/configuration/manage-compute-resources-container/  # noqa
     """
 
+    __slots__ = ("limits", "requests")
+
     def __init__(self, limits: Optional[dict] = None, requests: Optional[dict] = None):
         self.limits = limits
         self.requests = requests
@@ -380,6 +427,8 @@ class SELinuxOptions(HelmYaml):
     :param user: User is a SELinux user label that applies to the container.
     """
 
+    __slots__ = ("level", "role", "type", "user")
+
     def __init__(
         self,
         level: Optional[str] = None,
@@ -407,6 +456,8 @@ class WindowsSecurityContextOptions(HelmYaml):
         takes precedence.
     """
 
+    __slots__ = ("gmsaCredentialSpec", "gmsaCredentialSpecName", "runAsUserName")
+
     def __init__(
         self,
         gmsa_credential_spec: str,
@@ -424,6 +475,8 @@ class Capabilities(HelmYaml):
     :param drop: Removed capabilities
     """
 
+    __slots__ = ("add", "drop")
+
     def __init__(
         self, add: Optional[List[str]] = None, drop: Optional[List[str]] = None
     ):
@@ -473,6 +526,19 @@ class SecurityContext(HelmYaml):
         the value specified in SecurityContext takes precedence.
     """
 
+    __slots__ = (
+        "allowPrivilegeEscalation",
+        "runAsGroup",
+        "runAsNonRoot",
+        "seLinuxOptions",
+        "windowsOptions",
+        "capabilities",
+        "privileged",
+        "procMount",
+        "readOnlyRootFilesystem",
+        "runAsUser",
+    )
+
     def __init__(
         self,
         allow_privilege_escalation: Optional[bool] = None,
@@ -505,6 +571,8 @@ class SecretEnvSource(HelmYaml):
     :param optional: Specify whether the Secret must be defined
     """
 
+    __slots__ = ("name", "optional")
+
     def __init__(self, name: str, optional: Optional[bool] = None):
         self.name = name
         self.optional = optional
@@ -517,6 +585,8 @@ class ConfigMapEnvSource(HelmYaml):
     :param optional: Specify whether the ConfigMap must be defined
     """
 
+    __slots__ = ("name", "optional")
+
     def __init__(self, name: str, optional: Optional[bool] = None):
         self.name = name
         self.optional = optional
@@ -530,6 +600,8 @@ class EnvFromSource(HelmYaml):
     :param secret_ref: The Secret to select from
     """
 
+    __slots__ = ("configMapRef", "prefix", "secretRef")
+
     def __init__(
         self,
         config_map_ref: Optional[ConfigMapEnvSource] = None,
@@ -548,6 +620,8 @@ class TCPSocketAction(HelmYaml):
     :param host: Optional: Host name to connect to, defaults to the pod IP.
     """
 
+    __slots__ = ("port", "host")
+
     def __init__(self, port: int, host: Optional[str] = None):
         self.port = port
         self.host = host
@@ -559,6 +633,8 @@ class HTTPHeader(HelmYaml):
     :param value: The header field value
     """
 
+    __slots__ = ("name", "value")
+
     def __init__(self, name: str, value: str):
         self.name = name
         self.value = value
@@ -576,6 +652,8 @@ class HTTPGetAction(HelmYaml):
     :param scheme: Scheme to use for connecting to the host. Defaults to HTTP.
     """
 
+    __slots__ = ("httpHeaders", "path", "port", "host", "scheme")
+
     def __init__(
         self,
         path: str,
@@ -600,6 +678,8 @@ class Handler(HelmYaml):
         not yet supported
     """
 
+    __slots__ = ("exec", "httpGet", "tcpSocket")
+
     def __init__(
         self,
         exec: Optional[ExecAction] = None,
@@ -630,6 +710,8 @@ class Lifecycle(HelmYaml):
         https://kubernetes.io/docs/concepts/containers/container-lifecycle-hooks/#container-hooks  # noqa
     """
 
+    __slots__ = ("postStart", "preStop")
+
     def __init__(
         self, post_start: Optional[Handler] = None, pre_stop: Optional[Handler] = None
     ):
@@ -651,6 +733,8 @@ class ContainerPort(HelmYaml):
     :param protocol: Protocol for port. Must be UDP, TCP, or SCTP. Defaults to "TCP".
     """
 
+    __slots__ = ("containerPort", "hostIP", "hostPort", "name", "protocol")
+
     def __init__(
         self,
         container_port: int,
@@ -685,6 +769,15 @@ class VolumeMount(HelmYaml):
         mutually exclusive.
     """
 
+    __slots__ = (
+        "name",
+        "mountPath",
+        "mountPropagation",
+        "readOnly",
+        "subPath",
+        "subPathExpr",
+    )
+
     def __init__(
         self,
         name: str,
@@ -724,6 +817,17 @@ class Probe(HelmYaml):
         https://kubernetes.io/docs/concepts/workloads/pods/pod-lifecycle#container-probes  # noqa
     """
 
+    __slots__ = (
+        "exec",
+        "httpGet",
+        "initialDelaySeconds",
+        "periodSeconds",
+        "tcpSocket",
+        "failureThreshold",
+        "successThreshold",
+        "timeoutSeconds",
+    )
+
     def __init__(
         self,
         exec: Optional[ExecAction] = None,
@@ -846,6 +950,31 @@ class Container(HelmYaml):
         image. Cannot be updated.
     """
 
+    __slots__ = (
+        "name",
+        "args",
+        "command",
+        "env",
+        "envFrom",
+        "image",
+        "imagePullPolicy",
+        "lifecycle",
+        "livenessProbe",
+        "ports",
+        "readinessProbe",
+        "resources",
+        "securityContext",
+        "startupProbe",
+        "stdin",
+        "stdinOnce",
+        "terminationMessagePath",
+        "terminationMessagePolicy",
+        "tty",
+        "volumeDevices",
+        "volumeMounts",
+        "workingDir",
+    )
+
     def __init__(
         self,
         name: str,
@@ -901,6 +1030,8 @@ class HostAlias(HelmYaml):
     :param ip: IP address of the host file entry.
     """
 
+    __slots__ = ("hostnames", "ip")
+
     def __init__(self, hostnames: List[str], ip: str):
         self.hostnames = hostnames
         self.ip = ip
@@ -912,6 +1043,8 @@ class Sysctl(HelmYaml):
     :param value: Value of a property to set
     """
 
+    __slots__ = ("name", "value")
+
     def __init__(self, name: str, value: str):
         self.name = name
         self.value = value
@@ -961,6 +1094,18 @@ class PodSecurityContext(HelmYaml):
         the value specified in SecurityContext takes precedence for that container.
     """
 
+    __slots__ = (
+        "fsGroup",
+        "runAsGroup",
+        "runAsNonRoot",
+        "seLinuxOptions",
+        "supplementalGroups",
+        "sysctls",
+        "windowsOptions",
+        "fsGroupChangePolicy",
+        "runAsUser",
+    )
+
     def __init__(
         self,
         fs_group: Optional[int] = None,
@@ -1019,6 +1164,8 @@ class TopologySpreadConstraint(HelmYaml):
         corresponding topology domain.
     """
 
+    __slots__ = ("labelSelector", "maxSkew", "topologyKey", "whenUnsatisfiable")
+
     def __init__(
         self,
         max_skew: int,
@@ -1038,6 +1185,8 @@ class PodDNSConfigOption(HelmYaml):
     :param value: None
     """
 
+    __slots__ = ("name", "value")
+
     def __init__(self, name: str, value: Optional[str] = None):
         self.name = name
         self.value = value
@@ -1057,6 +1206,8 @@ class PodDNSConfig(HelmYaml):
         paths will be removed.
     """
 
+    __slots__ = ("nameservers", "options", "searches")
+
     def __init__(
         self,
         nameservers: Optional[List[str]] = None,
@@ -1150,6 +1301,32 @@ class EphemeralContainer(HelmYaml):
         image. Cannot be updated.
     """
 
+    __slots__ = (
+        "name",
+        "image",
+        "ports",
+        "resources",
+        "startupProbe",
+        "targetContainerName",
+        "args",
+        "command",
+        "env",
+        "envFrom",
+        "imagePullPolicy",
+        "lifecycle",
+        "livenessProbe",
+        "readinessProbe",
+        "securityContext",
+        "stdin",
+        "stdinOnce",
+        "terminationMessagePath",
+        "terminationMessagePolicy",
+        "tty",
+        "volumeDevices",
+        "volumeMounts",
+        "workingDir",
+    )
+
     def __init__(
         self,
         name: str,
@@ -1207,6 +1384,8 @@ class LocalObjectReference(HelmYaml):
         https://kubernetes.io/docs/concepts/overview/working-with-objects/names/#names  # noqa
     """
 
+    __slots__ = ("name",)
+
     def __init__(self, name: str):
         self.name = name
 
@@ -1221,6 +1400,8 @@ class DownwardAPIVolumeSource(HelmYaml):
         set.
     """
 
+    __slots__ = ("items", "defaultMode")
+
     def __init__(
         self, items: List[DownwardAPIVolumeFile], default_mode: Optional[int] = None
     ):
@@ -1250,6 +1431,19 @@ class ScaleIOVolumeSource(HelmYaml):
         ThickProvisioned or ThinProvisioned. Default is ThinProvisioned.
     """
 
+    __slots__ = (
+        "gateway",
+        "protectionDomain",
+        "sslEnabled",
+        "storagePool",
+        "system",
+        "volumeName",
+        "fsType",
+        "readOnly",
+        "secretRef",
+        "storageMode",
+    )
+
     def __init__(
         self,
         gateway: str,
@@ -1294,6 +1488,8 @@ class CephFSVolumeSource(HelmYaml):
         https://examples.k8s.io/volumes/cephfs/README.md#how-to-use-it
     """
 
+    __slots__ = ("monitors", "path", "readOnly", "secretFile", "secretRef", "user")
+
     def __init__(
         self,
         monitors: List[str],
@@ -1320,6 +1516,8 @@ class HostPathVolumeSource(HelmYaml):
         https://kubernetes.io/docs/concepts/storage/volumes#hostpath
     """
 
+    __slots__ = ("path", "type")
+
     def __init__(self, path: str, type: Optional[str] = None):
         self.path = path
         self.type = type
@@ -1340,6 +1538,8 @@ class CinderVolumeSource(HelmYaml):
         to connect to OpenStack.
     """
 
+    __slots__ = ("fsType", "volumeID", "readOnly", "secretRef")
+
     def __init__(
         self,
         fs_type: str,
@@ -1363,6 +1563,8 @@ class PortworxVolumeSource(HelmYaml):
         ReadOnly setting in VolumeMounts.
     """
 
+    __slots__ = ("fsType", "volumeID", "readOnly")
+
     def __init__(self, fs_type: str, volume_id: str, read_only: Optional[bool] = None):
         self.fsType = fs_type
         self.volumeID = volume_id
@@ -1388,6 +1590,14 @@ class CSIVolumeSource(HelmYaml):
         false (read/write).
     """
 
+    __slots__ = (
+        "driver",
+        "fsType",
+        "volumeAttributes",
+        "nodePublishSecretRef",
+        "readOnly",
+    )
+
     def __init__(
         self,
         driver: str,
@@ -1423,6 +1633,8 @@ class StorageOSVolumeSource(HelmYaml):
         attempted.
     """
 
+    __slots__ = ("fsType", "volumeName", "volumeNamespace", "readOnly", "secretRef")
+
     def __init__(
         self,
         fs_type: str,
@@ -1446,6 +1658,8 @@ class PhotonPersistentDiskVolumeSource(HelmYaml):
     :param pd_id: ID that identifies Photon Controller persistent disk
     """
 
+    __slots__ = ("fsType", "pdID")
+
     def __init__(self, fs_type: str, pd_id: str):
         self.fsType = fs_type
         self.pdID = pd_id
@@ -1463,6 +1677,8 @@ class GlusterfsVolumeSource(HelmYaml):
         https://examples.k8s.io/volumes/glusterfs/README.md#create-a-pod
     """
 
+    __slots__ = ("endpoints", "path", "readOnly")
+
     def __init__(self, endpoints: str, path: str, read_only: Optional[bool] = None):
         self.endpoints = endpoints
         self.path = path
@@ -1481,6 +1697,8 @@ class AzureDiskVolumeSource(Core):
         ReadOnly setting in VolumeMounts.
     """
 
+    __slots__ = ("cachingMode", "diskName", "diskURI", "fsType", "readOnly")
+
     def __init__(
         self,
         caching_mode: str,
@@ -1505,6 +1723,8 @@ class AzureFileVolumeSource(HelmYaml):
         ReadOnly setting in VolumeMounts.
     """
 
+    __slots__ = ("secretName", "shareName", "readOnly")
+
     def __init__(
         self, secret_name: str, share_name: str, read_only: Optional[bool] = None
     ):
@@ -1532,6 +1752,8 @@ class SecretVolumeSource(HelmYaml):
         the '..' path or start with '..'.
     """
 
+    __slots__ = ("optional", "secretName", "defaultMode", "items")
+
     def __init__(
         self,
         optional: bool,
@@ -1559,6 +1781,8 @@ class EmptyDirVolumeSource(HelmYaml):
         http://kubernetes.io/docs/user-guide/volumes#emptydir
     """
 
+    __slots__ = ("medium", "sizeLimit")
+
     def __init__(self, medium: Optional[str] = None, size_limit: Optional[str] = None):
         self.medium = medium
         self.sizeLimit = size_limit
@@ -1579,6 +1803,8 @@ class QuobyteVolumeSource(HelmYaml):
     :param user: User to map volume access to Defaults to serivceaccount user
     """
 
+    __slots__ = ("registry", "tenant", "volume", "group", "readOnly", "user")
+
     def __init__(
         self,
         registry: str,
@@ -1621,6 +1847,17 @@ class RBDVolumeSource(HelmYaml):
         https://examples.k8s.io/volumes/rbd/README.md#how-to-use-it
     """
 
+    __slots__ = (
+        "fsType",
+        "image",
+        "monitors",
+        "keyring",
+        "pool",
+        "readOnly",
+        "secretRef",
+        "user",
+    )
+
     def __init__(
         self,
         fs_type: str,
@@ -1658,6 +1895,8 @@ class ServiceAccountTokenProjection(HelmYaml):
         must be at least 10 minutes.
     """
 
+    __slots__ = ("path", "audience", "expirationSeconds")
+
     def __init__(
         self,
         path: str,
@@ -1683,6 +1922,8 @@ class ConfigMapProjection(HelmYaml):
         contain the '..' path or start with '..'.
     """
 
+    __slots__ = ("name", "optional", "items")
+
     def __init__(
         self,
         name: str,
@@ -1703,6 +1944,8 @@ class VolumeProjection(HelmYaml):
         project
     """
 
+    __slots__ = ("configMap", "downwardAPI", "secret", "serviceAccountToken")
+
     def __init__(
         self,
         config_map: Optional[ConfigMapProjection] = None,
@@ -1725,6 +1968,8 @@ class ProjectedVolumeSource(HelmYaml):
         mode, like fsGroup, and the result can be other mode bits set.
     """
 
+    __slots__ = ("defaultMode", "sources")
+
     def __init__(
         self, sources: List[VolumeProjection], default_mode: Optional[int] = None
     ):
@@ -1743,6 +1988,8 @@ class VsphereVirtualDiskVolumeSource(HelmYaml):
     :param volume_path: Path that identifies vSphere volume vmdk
     """
 
+    __slots__ = ("fsType", "storagePolicyID", "storagePolicyName", "volumePath")
+
     def __init__(
         self,
         fs_type: str,
@@ -1764,6 +2011,8 @@ class FlockerVolumeSource(HelmYaml):
         dataset
     """
 
+    __slots__ = ("datasetName", "datasetUUID")
+
     def __init__(self, dataset_name: str, dataset_uuid: str):
         self.datasetName = dataset_name
         self.datasetUUID = dataset_uuid
@@ -1787,6 +2036,8 @@ class AWSElasticBlockStoreVolumeSource(HelmYaml):
         https://kubernetes.io/docs/concepts/storage/volumes#awselasticblockstore
     """
 
+    __slots__ = ("fsType", "volumeID", "partition", "readOnly")
+
     def __init__(
         self,
         fs_type: str,
@@ -1815,6 +2066,8 @@ class FlexVolumeSource(HelmYaml):
         secret, all secrets are passed to the plugin scripts.
     """
 
+    __slots__ = ("driver", "fsType", "options", "readOnly", "secretRef")
+
     def __init__(
         self,
         driver: str,
@@ -1843,6 +2096,8 @@ class FCVolumeSource(HelmYaml):
         combination of targetWWNs and lun must be set, but not both simultaneously.
     """
 
+    __slots__ = ("fsType", "lun", "readOnly", "targetWWNs", "wwids")
+
     def __init__(
         self,
         fs_type: str,
@@ -1884,6 +2139,20 @@ class ISCSIVolumeSource(HelmYaml):
         Defaults to false.
     """
 
+    __slots__ = (
+        "chapAuthDiscovery",
+        "chapAuthSession",
+        "fsType",
+        "initiatorName",
+        "iqn",
+        "lun",
+        "portals",
+        "secretRef",
+        "targetPortal",
+        "iscsiInterface",
+        "readOnly",
+    )
+
     def __init__(
         self,
         chap_auth_discovery: bool,
@@ -1930,6 +2199,8 @@ class GCEPersistentDiskVolumeSource(HelmYaml):
         https://kubernetes.io/docs/concepts/storage/volumes#gcepersistentdisk
     """
 
+    __slots__ = ("fsType", "pdName", "partition", "readOnly")
+
     def __init__(
         self,
         fs_type: str,
@@ -1954,6 +2225,8 @@ class NFSVolumeSource(HelmYaml):
         https://kubernetes.io/docs/concepts/storage/volumes#nfs
     """
 
+    __slots__ = ("path", "server", "readOnly")
+
     def __init__(self, path: str, server: str, read_only: Optional[bool] = None):
         self.path = path
         self.server = server
@@ -1979,6 +2252,8 @@ class ConfigMapVolumeSource(HelmYaml):
         contain the '..' path or start with '..'.
     """
 
+    __slots__ = ("name", "optional", "defaultMode", "items")
+
     def __init__(
         self,
         name: str,
@@ -2000,6 +2275,8 @@ class PersistentVolumeClaimVolumeSource(HelmYaml):
     :param read_only: Will force the ReadOnly setting in VolumeMounts. Default false.
     """
 
+    __slots__ = ("claimName", "readOnly")
+
     def __init__(self, claim_name: str, read_only: bool):
         self.claimName = claim_name
         self.readOnly = read_only
@@ -2015,6 +2292,8 @@ class GitRepoVolumeSource(HelmYaml):
         with the given name.
     """
 
+    __slots__ = ("repository", "revision", "directory")
+
     def __init__(self, repository: str, revision: str, directory: Optional[str] = None):
         self.repository = repository
         self.revision = revision
@@ -2095,6 +2374,38 @@ class Volume(HelmYaml):
         mounted on kubelets host machine
     """
 
+    __slots__ = (
+        "name",
+        "configMap",
+        "downwardAPI",
+        "emptyDir",
+        "gitRepo",
+        "hostPath",
+        "persistentVolumeClaim",
+        "projected",
+        "secret",
+        "awsElasticBlockStore",
+        "azureDisk",
+        "azureFile",
+        "cephfs",
+        "cinder",
+        "csi",
+        "fc",
+        "flexVolume",
+        "flocker",
+        "gcePersistentDisk",
+        "glusterfs",
+        "iscsi",
+        "nfs",
+        "photonPersistentDisk",
+        "portworxVolume",
+        "quobyte",
+        "rbd",
+        "scaleIO",
+        "storageos",
+        "vsphereVolume",
+    )
+
     def __init__(
         self,
         name: str,
@@ -2179,6 +2490,8 @@ class Toleration(HelmYaml):
         category.
     """
 
+    __slots__ = ("effect", "key", "tolerationSeconds", "value", "operator")
+
     def __init__(
         self,
         effect: Optional[str] = None,
@@ -2206,6 +2519,8 @@ class PodAffinityTerm(HelmYaml):
         to (matches against); null or empty list means "this pod's namespace"
     """
 
+    __slots__ = ("labelSelector", "namespaces", "topologyKey")
+
     def __init__(
         self,
         topology_key: str,
@@ -2225,6 +2540,8 @@ class WeightedPodAffinityTerm(HelmYaml):
         in the range 1-100.
     """
 
+    __slots__ = ("podAffinityTerm", "weight")
+
     def __init__(
         self, pod_affinity_term: PodAffinityTerm, weight: Optional[int] = None,
     ):
@@ -2254,6 +2571,11 @@ class PodAffinity(HelmYaml):
         satisfied.
     """
 
+    __slots__ = (
+        "preferredDuringSchedulingIgnoredDuringExecution",
+        "requiredDuringSchedulingIgnoredDuringExecution",
+    )
+
     def __init__(
         self,
         preferred_during_scheduling_ignored_during_execution: Optional[
@@ -2293,6 +2615,11 @@ class PodAntiAffinity(HelmYaml):
         must be satisfied.
     """
 
+    __slots__ = (
+        "preferredDuringSchedulingIgnoredDuringExecution",
+        "requiredDuringSchedulingIgnoredDuringExecution",
+    )
+
     def __init__(
         self,
         preferred_during_scheduling_ignored_during_execution: Optional[
@@ -2322,6 +2649,8 @@ class NodeSelectorRequirement(HelmYaml):
         replaced during a strategic merge patch.
     """
 
+    __slots__ = ("key", "operator", "values")
+
     def __init__(
         self, key: str, operator: str, values: Optional[List[str]] = None,
     ):
@@ -2336,6 +2665,8 @@ class NodeSelectorTerm(HelmYaml):
     :param match_expressions: A list of node selector requirements by node's labels.
     """
 
+    __slots__ = ("matchFields", "matchExpressions")
+
     def __init__(
         self,
         match_fields: Optional[List[NodeSelectorRequirement]] = None,
@@ -2352,6 +2683,8 @@ class PreferredSchedulingTerm(HelmYaml):
         in the range 1-100.
     """
 
+    __slots__ = ("preference", "weight")
+
     def __init__(
         self, preference: NodeSelectorTerm, weight: int,
     ):
@@ -2365,6 +2698,8 @@ class NodeSelector(HelmYaml):
         ORed.
     """
 
+    __slots__ = ("nodeSelectorTerms",)
+
     def __init__(self, node_selector_terms: List[NodeSelectorTerm]):
         self.nodeSelectorTerms = node_selector_terms
 
@@ -2388,6 +2723,11 @@ class NodeAffinity(HelmYaml):
         node.
     """
 
+    __slots__ = (
+        "preferredDuringSchedulingIgnoredDuringExecution",
+        "requiredDuringSchedulingIgnoredDuringExecution",
+    )
+
     def __init__(
         self,
         preferred_during_scheduling_ignored_during_execution: Optional[
@@ -2414,6 +2754,8 @@ class Affinity(HelmYaml):
     :param node_affinity: Describes node affinity scheduling rules for the pod.
     """
 
+    __slots__ = ("podAffinity", "podAntiAffinity", "nodeAffinity")
+
     def __init__(
         self,
         pod_affinity: Optional[PodAffinity] = None,
@@ -2431,6 +2773,8 @@ class PodReadinessGate(HelmYaml):
         list with matching type.
     """
 
+    __slots__ = ("conditionType",)
+
     def __init__(self, condition_type: str):
         self.conditionType = condition_type
 
@@ -2574,6 +2918,43 @@ class PodSpec(HelmYaml):
         pod. More info: https://kubernetes.io/docs/concepts/storage/volumes
     """
 
+    __slots__ = (
+        "containers",
+        "activeDeadlineSeconds",
+        "affinity",
+        "automountServiceAccountToken",
+        "dnsConfig",
+        "dnsPolicy",
+        "enableServiceLinks",
+        "ephemeralContainers",
+        "hostAliases",
+        "hostIPC",
+        "hostNetwork",
+        "hostPID",
+        "hostname",
+        "imagePullSecrets",
+        "initContainers",
+        "nodeName",
+        "nodeSelector",
+        "overhead",
+        "preemptionPolicy",
+        "priority",
+        "priorityClassName",
+        "readinessGates",
+        "restartPolicy",
+        "runtimeClassName",
+        "schedulerName",
+        "securityContext",
+        "serviceAccount",
+        "serviceAccountName",
+        "shareProcessNamespace",
+        "subdomain",
+        "terminationGracePeriodSeconds",
+        "tolerations",
+        "topologySpreadConstraints",
+        "volumes",
+    )
+
     def __init__(
         self,
         containers: List[Container],
@@ -2655,6 +3036,8 @@ class PodTemplateSpec(HelmYaml):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#spec-and-status  # noqa
     """
 
+    __slots__ = ("metadata", "spec")
+
     def __init__(self, metadata: ObjectMeta, spec: PodSpec):
         self.metadata = metadata
         self.spec = spec
@@ -2673,6 +3056,8 @@ class PodTemplate(Core):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("template",)
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -2691,6 +3076,8 @@ class SecretReference(HelmYaml):
         unique.
     """
 
+    __slots__ = ("name", "namespace")
+
     def __init__(self, name: str, namespace: Optional[str] = None):
         self.name = name
         self.namespace = namespace
@@ -2730,6 +3117,18 @@ class CSIPersistentVolumeSource(HelmYaml):
         Defaults to false (read/write).
     """
 
+    __slots__ = (
+        "driver",
+        "fsType",
+        "volumeAttributes",
+        "volumeHandle",
+        "controllerExpandSecretRef",
+        "controllerPublishSecretRef",
+        "nodePublishSecretRef",
+        "nodeStageSecretRef",
+        "readOnly",
+    )
+
     def __init__(
         self,
         driver: str,
@@ -2773,6 +3172,8 @@ class StorageOSPersistentVolumeSource(HelmYaml):
         attempted.
     """
 
+    __slots__ = ("fsType", "volumeName", "volumeNamespace", "readOnly", "secretRef")
+
     def __init__(
         self,
         fs_type: str,
@@ -2795,6 +3196,8 @@ class TopologySelectorLabelRequirement(HelmYaml):
         selected. Each entry in Values is ORed.
     """
 
+    __slots__ = ("key", "values")
+
     def __init__(self, key: str, values: List[str]):
         self.key = key
         self.values = values
@@ -2805,6 +3208,8 @@ class TopologySelectorTerm(HelmYaml):
     :param match_label_expressions: A list of topology selector requirements by labels.
     """
 
+    __slots__ = ("matchLabelExpressions",)
+
     def __init__(self, match_label_expressions: List[TopologySelectorLabelRequirement]):
         self.matchLabelExpressions = match_label_expressions
 
@@ -2831,6 +3236,8 @@ class ServiceAccount(Core):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("automountServiceAccountToken", "imagePullSecrets", "secrets")
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -2854,6 +3261,8 @@ class TypedLocalObjectReference(Core):
         For any other third-party types, APIGroup is required.
     """
 
+    __slots__ = ("name", "apiGroup")
+
     def __init__(self, name: str, api_group: Optional[str] = None):
         self.name = name
         self.apiGroup = api_group
@@ -2887,6 +3296,16 @@ class PersistentVolumeClaimSpec(HelmYaml):
         backing this claim.
     """
 
+    __slots__ = (
+        "accessModes",
+        "resources",
+        "dataSource",
+        "selector",
+        "storageClassName",
+        "volumeMode",
+        "volumeName",
+    )
+
     def __init__(
         self,
         access_modes: List[str],
@@ -2919,6 +3338,8 @@ class PersistentVolumeClaim(Core):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -2945,6 +3366,8 @@ class FlexPersistentVolumeSource(HelmYaml):
         secret, all secrets are passed to the plugin scripts.
     """
 
+    __slots__ = ("driver", "fsType", "options", "readOnly", "secretRef")
+
     def __init__(
         self,
         driver: str,
@@ -2975,6 +3398,8 @@ class CinderPersistentVolumeSource(HelmYaml):
         to connect to OpenStack.
     """
 
+    __slots__ = ("fsType", "volumeID", "readOnly", "secretRef")
+
     def __init__(
         self,
         fs_type: str,
@@ -3013,6 +3438,17 @@ class RBDPersistentVolumeSource(HelmYaml):
         https://examples.k8s.io/volumes/rbd/README.md#how-to-use-it
     """
 
+    __slots__ = (
+        "fsType",
+        "image",
+        "monitors",
+        "keyring",
+        "pool",
+        "readOnly",
+        "secretRef",
+        "user",
+    )
+
     def __init__(
         self,
         fs_type: str,
@@ -3056,6 +3492,19 @@ class ScaleIOPersistentVolumeSource(HelmYaml):
         ThickProvisioned or ThinProvisioned. Default is ThinProvisioned.
     """
 
+    __slots__ = (
+        "gateway",
+        "protectionDomain",
+        "sslEnabled",
+        "storagePool",
+        "system",
+        "volumeName",
+        "fsType",
+        "readOnly",
+        "secretRef",
+        "storageMode",
+    )
+
     def __init__(
         self,
         gateway: str,
@@ -3100,6 +3549,8 @@ class CephFSPersistentVolumeSource(HelmYaml):
         https://examples.k8s.io/volumes/cephfs/README.md#how-to-use-it
     """
 
+    __slots__ = ("monitors", "path", "readOnly", "secretFile", "secretRef", "user")
+
     def __init__(
         self,
         monitors: List[str],
@@ -3143,6 +3594,20 @@ class ISCSIPersistentVolumeSource(HelmYaml):
         Defaults to false.
     """
 
+    __slots__ = (
+        "chapAuthDiscovery",
+        "chapAuthSession",
+        "fsType",
+        "initiatorName",
+        "iqn",
+        "lun",
+        "portals",
+        "secretRef",
+        "targetPortal",
+        "iscsiInterface",
+        "readOnly",
+    )
+
     def __init__(
         self,
         chap_auth_discovery: bool,
@@ -3186,6 +3651,8 @@ class GlusterfsPersistentVolumeSource(HelmYaml):
         https://examples.k8s.io/volumes/glusterfs/README.md#create-a-pod
     """
 
+    __slots__ = ("endpoints", "path", "endpointsNamespace", "readOnly")
+
     def __init__(
         self,
         endpoints: str,
@@ -3209,6 +3676,8 @@ class LocalVolumeSource(HelmYaml):
         or block device (disk, partition, ...).
     """
 
+    __slots__ = ("fsType", "path")
+
     def __init__(self, fs_type: str, path: str):
         self.fsType = fs_type
         self.path = path
@@ -3225,6 +3694,8 @@ class AzureFilePersistentVolumeSource(HelmYaml):
         Account Name and Key default is the same as the Pod
     """
 
+    __slots__ = ("secretName", "shareName", "readOnly", "secretNamespace")
+
     def __init__(
         self,
         secret_name: str,
@@ -3243,6 +3714,8 @@ class VolumeNodeAffinity(HelmYaml):
     :param required: Required specifies hard node constraints that must be met.
     """
 
+    __slots__ = ("required",)
+
     def __init__(self, required: NodeSelector):
         self.required = required
 
@@ -3332,6 +3805,39 @@ class PersistentVolumeSpec(HelmYaml):
         mounted on kubelets host machine
     """
 
+    __slots__ = (
+        "accessModes",
+        "capacity",
+        "hostPath",
+        "awsElasticBlockStore",
+        "azureDisk",
+        "azureFile",
+        "cephfs",
+        "cinder",
+        "claimRef",
+        "csi",
+        "fc",
+        "flexVolume",
+        "flocker",
+        "gcePersistentDisk",
+        "glusterfs",
+        "iscsi",
+        "local",
+        "mountOptions",
+        "nfs",
+        "nodeAffinity",
+        "persistentVolumeReclaimPolicy",
+        "photonPersistentDisk",
+        "portworxVolume",
+        "quobyte",
+        "rbd",
+        "scaleIO",
+        "storageClassName",
+        "storageos",
+        "volumeMode",
+        "vsphereVolume",
+    )
+
     def __init__(
         self,
         access_modes: List[str],
@@ -3405,6 +3911,8 @@ class LoadBalancerIngress(HelmYaml):
         GCE or OpenStack load-balancers)
     """
 
+    __slots__ = ("hostname", "ip")
+
     def __init__(self, hostname: str, ip: str):
         self.hostname = hostname
         self.ip = ip
@@ -3420,6 +3928,8 @@ class Taint(HelmYaml):
     :param value: The taint value corresponding to the taint key.
     """
 
+    __slots__ = ("effect", "key", "timeAdded", "value")
+
     def __init__(
         self,
         effect: str,
@@ -3457,6 +3967,8 @@ class ConfigMapNodeConfigSource(HelmYaml):
         forbidden in Node.Spec, and required in Node.Status.
     """
 
+    __slots__ = ("name", "kubeletConfigKey", "namespace", "resourceVersion", "uid")
+
     def __init__(
         self,
         name: str,
@@ -3488,6 +4000,8 @@ class EndpointPort(HelmYaml):
         is TCP.
     """
 
+    __slots__ = ("name", "appProtocol", "port", "protocol")
+
     def __init__(
         self, name: str, app_protocol: str, port: int, protocol: Optional[str] = None
     ):
@@ -3509,6 +4023,8 @@ class EndpointAddress(HelmYaml):
     :param target_ref: Reference to object providing the endpoint.
     """
 
+    __slots__ = ("hostname", "ip", "nodeName", "targetRef")
+
     def __init__(
         self,
         hostname: str,
@@ -3533,6 +4049,8 @@ class EndpointSubset(HelmYaml):
     :param ports: Port numbers available on the related IP addresses.
     """
 
+    __slots__ = ("addresses", "notReadyAddresses", "ports")
+
     def __init__(
         self,
         addresses: List[EndpointAddress],
@@ -3561,6 +4079,8 @@ class Endpoints(Core):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("subsets",)
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -3578,6 +4098,8 @@ class EventSource(HelmYaml):
     :param host: Node name on which the event is generated.
     """
 
+    __slots__ = ("component", "host")
+
     def __init__(self, component: Optional[str] = None, host: Optional[str] = None):
         self.component = component
         self.host = host
@@ -3590,6 +4112,8 @@ class AttachedVolume(HelmYaml):
         be available
     """
 
+    __slots__ = ("name", "devicePath")
+
     def __init__(self, name: str, device_path: str):
         self.name = name
         self.devicePath = device_path
@@ -3600,6 +4124,8 @@ class NodeConfigSource(HelmYaml):
     :param config_map: ConfigMap is a reference to a Node's ConfigMap
     """
 
+    __slots__ = ("configMap",)
+
     def __init__(self, config_map: ConfigMapNodeConfigSource):
         self.configMap = config_map
 
@@ -3623,6 +4149,16 @@ class NodeSpec(HelmYaml):
         https://kubernetes.io/docs/concepts/nodes/node/#manual-node-administration
     """
 
+    __slots__ = (
+        "externalID",
+        "podCIDR",
+        "configSource",
+        "podCIDRs",
+        "providerID",
+        "taints",
+        "unschedulable",
+    )
+
     def __init__(
         self,
         external_id: str,
@@ -3654,6 +4190,8 @@ class Node(Core):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     def __init__(
         self, metadata: ObjectMeta, spec: NodeSpec, api_version: Optional[str] = None
     ):
@@ -3667,6 +4205,8 @@ class LimitRangeSpec(HelmYaml):
     :param limits: Limits is the list of LimitRangeItem objects that are enforced.
     """
 
+    __slots__ = ("limits",)
+
     def __init__(self, limits: List[LimitRangeItem]):
         self.limits = limits
 
@@ -3683,6 +4223,8 @@ class LimitRange(Core):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -3701,6 +4243,8 @@ class NamespaceSpec(HelmYaml):
         https://kubernetes.io/docs/tasks/administer-cluster/namespaces/
     """
 
+    __slots__ = ("finalizers",)
+
     def __init__(self, finalizers: Optional[List[str]] = None):
         self.finalizers = finalizers
 
@@ -3717,6 +4261,8 @@ class Namespace(Core):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -3736,6 +4282,8 @@ class EventSeries(HelmYaml):
         for 1.18
     """
 
+    __slots__ = ("count", "lastObservedTime", "state")
+
     def __init__(
         self,
         count: Optional[int] = None,
@@ -3778,6 +4326,23 @@ class Event(Core):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = (
+        "involvedObject",
+        "action",
+        "count",
+        "eventTime",
+        "firstTimestamp",
+        "lastTimestamp",
+        "message",
+        "reason",
+        "related",
+        "reportingComponent",
+        "reportingInstance",
+        "series",
+        "source",
+        "type",
+    )
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -3846,6 +4411,8 @@ class ServicePort(HelmYaml):
         https://kubernetes.io/docs/concepts/services-networking/service/#defining-a-service  # noqa
     """
 
+    __slots__ = ("port", "appProtocol", "name", "nodePort", "protocol", "targetPort")
+
     def __init__(
         self,
         port: int,
@@ -3958,6 +4525,24 @@ class ServiceSpec(HelmYaml):
         https://kubernetes.io/docs/concepts/services-networking/service/#publishing-services-service-types  # noqa
     """
 
+    __slots__ = (
+        "ports",
+        "clusterIP",
+        "externalIPs",
+        "externalName",
+        "externalTrafficPolicy",
+        "healthCheckNodePort",
+        "ipFamily",
+        "loadBalancerIP",
+        "loadBalancerSourceRanges",
+        "publishNotReadyAddresses",
+        "selector",
+        "sessionAffinity",
+        "sessionAffinityConfig",
+        "topologyKeys",
+        "type",
+    )
+
     def __init__(
         self,
         ports: List[ServicePort],
@@ -4005,6 +4590,8 @@ class Service(Core):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     def __init__(
         self, metadata: ObjectMeta, spec: ServiceSpec, api_version: Optional[str] = None
     ):
@@ -4036,6 +4623,8 @@ class ConfigMap(Core):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("data", "binaryData", "immutable")
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -4062,6 +4651,8 @@ class Binding(Core):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("target",)
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -4094,6 +4685,8 @@ class ReplicationControllerSpec(HelmYaml):
         https://kubernetes.io/docs/concepts/workloads/controllers/replicationcontroller#what-is-a-replicationcontroller  # noqa
     """
 
+    __slots__ = ("template", "selector", "minReadySeconds", "replicas")
+
     def __init__(
         self,
         template: PodTemplateSpec,
@@ -4122,6 +4715,8 @@ class ReplicationController(Core):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -4145,6 +4740,8 @@ class Pod(Core):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     def __init__(
         self, metadata: ObjectMeta, spec: PodSpec, api_version: Optional[str] = None
     ):
@@ -4176,6 +4773,8 @@ class Secret(Core):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("data", "immutable", "stringData", "type")
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -4206,6 +4805,8 @@ class PersistentVolume(Core):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     def __init__(
         self,
         metadata: ObjectMeta,
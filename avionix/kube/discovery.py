@@ -19,6 +19,8 @@ class EndpointConditions(HelmYaml):
         as ready.
     """
 
+    __slots__ = ("ready",)
+
     def __init__(self, ready: bool):
         self.ready = ready
 
@@ -50,6 +52,8 @@ class Endpoint(HelmYaml):
         corresponding node label.
     """
 
+    __slots__ = ("addresses", "conditions", "hostname", "targetRef", "topology")
+
     def __init__(
         self,
         addresses: List[str],
@@ -86,6 +90,8 @@ class EndpointSlice(Discovery):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("addressType", "endpoints", "ports")
+
     _non_standard_version = "v1beta1"
 
     def __init__(
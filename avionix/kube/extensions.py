@@ -23,6 +23,8 @@ class IngressTLS(HelmYaml):
         if left unspecified.
     """
 
+    __slots__ = ("secretName", "hosts")
+
     def __init__(self, secret_name: str, hosts: Optional[List[str]] = None):
         self.secretName = secret_name
         self.hosts = hosts
@@ -37,6 +39,8 @@ class IngressBackend(HelmYaml):
         servicePort must not be specified.
     """
 
+    __slots__ = ("resource", "serviceName", "servicePort")
+
     def __init__(
         self,
         service_name: str,
@@ -71,6 +75,8 @@ class HTTPIngressPath(HelmYaml):
         ImplementationSpecific.
     """
 
+    __slots__ = ("backend", "path", "pathType")
+
     def __init__(
         self,
         backend: IngressBackend,
@@ -87,6 +93,8 @@ class HTTPIngressRuleValue(HelmYaml):
     :param paths: A collection of paths that map requests to backends.
     """
 
+    __slots__ = ("paths",)
+
     def __init__(self, paths: List[HTTPIngressPath]):
         self.paths = paths
 
@@ -114,6 +122,8 @@ class IngressRule(HelmYaml):
         to equal to the suffix (removing the first label) of the wildcard rule.
     """
 
+    __slots__ = ("host", "http")
+
     def __init__(self, http: HTTPIngressRuleValue, host: Optional[str] = None):
         self.host = host
         self.http = http
@@ -143,6 +153,8 @@ class IngressSpec(HelmYaml):
         supports SNI.
     """
 
+    __slots__ = ("ingressClassName", "backend", "rules", "tls")
+
     def __init__(
         self,
         ingress_class_name: Optional[str] = None,
@@ -168,6 +180,8 @@ class Ingress(Extensions):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     _non_standard_version = "v1beta1"
 
     def __init__(
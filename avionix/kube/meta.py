@@ -37,6 +37,18 @@ class APIResource(Meta):
         resource's group)".
     """
 
+    __slots__ = (
+        "name",
+        "categories",
+        "group",
+        "namespaced",
+        "shortNames",
+        "singularName",
+        "storageVersionHash",
+        "verbs",
+        "version",
+    )
+
     def __init__(
         self,
         name: str,
@@ -84,6 +96,8 @@ class ManagedFieldsEntry(HelmYaml):
         it cannot be automatically converted.
     """
 
+    __slots__ = ("fieldsType", "fieldsV1", "manager", "operation", "time", "apiVersion")
+
     def __init__(
         self,
         fields_type: Optional[str] = None,
@@ -124,6 +138,8 @@ class OwnerReference(KubernetesBaseObject):
     :param api_version: API version of the referent.
     """
 
+    __slots__ = ("name", "controller", "blockOwnerDeletion", "uid")
+
     def __init__(
         self,
         name: str,
@@ -202,6 +218,18 @@ class ObjectMeta(HelmYaml):
         than one managing controller.
     """
 
+    __slots__ = (
+        "annotations",
+        "clusterName",
+        "finalizers",
+        "generateName",
+        "labels",
+        "managedFields",
+        "name",
+        "namespace",
+        "ownerReferences",
+    )
+
     def __init__(
         self,
         annotations: Optional[dict] = None,
@@ -236,6 +264,8 @@ class LabelSelectorRequirement(HelmYaml):
         merge patch.
     """
 
+    __slots__ = ("key", "operator", "values")
+
     def __init__(self, key: str, operator: str, values: Optional[List[str]] = None):
         self.key = key
         self.operator = operator
@@ -252,6 +282,8 @@ class LabelSelector(HelmYaml):
         requirements. The requirements are ANDed.
     """
 
+    __slots__ = ("matchLabels", "matchExpressions")
+
     def __init__(
         self,
         match_labels: Optional[dict] = None,
@@ -283,6 +315,8 @@ class ListMeta(HelmYaml):
         set or to be exact.
     """
 
+    __slots__ = ("continue", "remainingItemCount")
+
     def __init__(self, continue_: str, remaining_item_count: int):
         self["continue"] = continue_
         self.remainingItemCount = remaining_item_count
@@ -291,6 +325,8 @@ class ListMeta(HelmYaml):
 class Patch(HelmYaml):
     """"""
 
+    __slots__ = ()
+
     pass
 
 
@@ -308,6 +344,8 @@ class StatusCause(HelmYaml):
         value is empty there is no information available.
     """
 
+    __slots__ = ("field", "message", "reason")
+
     def __init__(self, field: str, message: str, reason: str):
         self.field = field
         self.message = message
@@ -330,6 +368,8 @@ class StatusDetails(Meta):
         described). More info: http://kubernetes.io/docs/user-guide/identifiers#uids
     """
 
+    __slots__ = ("name", "causes", "group", "retryAfterSeconds", "uid")
+
     def __init__(
         self,
         name: str,
@@ -354,6 +394,8 @@ class ServerAddressByClientCIDR(HelmYaml):
         the above CIDR. This can be a hostname, hostname:port, IP or IP:port.
     """
 
+    __slots__ = ("clientCIDR", "serverAddress")
+
     def __init__(self, client_cidr: str, server_address: str):
         self.clientCIDR = client_cidr
         self.serverAddress = server_address
@@ -367,6 +409,8 @@ class GroupVersionForDiscovery(HelmYaml):
         save the clients the trouble of splitting the GroupVersion.
     """
 
+    __slots__ = ("groupVersion", "version")
+
     def __init__(self, group_version: str, version: str):
         self.groupVersion = group_version
         self.version = version
@@ -393,6 +437,8 @@ class APIGroup(Meta):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("name", "preferredVersion", "serverAddressByClientCIDRs", "versions")
+
     def __init__(
         self,
         name: str,
@@ -414,6 +460,8 @@ class Preconditions(HelmYaml):
     :param uid: Specifies the target UID.
     """
 
+    __slots__ = ("resourceVersion", "uid")
+
     def __init__(
         self, resource_version: Optional[str] = None, uid: Optional[str] = None
     ):
@@ -452,6 +500,14 @@ class DeleteOptions(KubernetesBaseObject):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = (
+        "dryRun",
+        "orphanDependents",
+        "preconditions",
+        "propagationPolicy",
+        "gracePeriodSeconds",
+    )
+
     def __init__(
         self,
         dry_run: List[str],
@@ -487,6 +543,8 @@ class APIVersions(KubernetesBaseObject):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("serverAddressByClientCIDRs", "versions")
+
     def __init__(
         self,
         server_address_by_client_cidrs: List[ServerAddressByClientCIDR],
@@ -516,6 +574,8 @@ class Status(KubernetesBaseObject):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("code", "message", "reason", "details")
+
     def __init__(
         self,
         metadata: ListMeta,
@@ -536,6 +596,8 @@ class Status(KubernetesBaseObject):
 class MicroTime(HelmYaml):
     """"""
 
+    __slots__ = ()
+
     pass
 
 
@@ -550,6 +612,8 @@ class WatchEvent(HelmYaml):
     :param type: None
     """
 
+    __slots__ = ("object", "type")
+
     def __init__(self, object: str, type: str):
         self.object = object
         self.type = type
@@ -558,4 +622,6 @@ class WatchEvent(HelmYaml):
 class Time(HelmYaml):
     """"""
 
+    __slots__ = ()
+
     pass
@@ -19,6 +19,8 @@ class IPBlock(HelmYaml):
         will be rejected if they are outside the CIDR range
     """
 
+    __slots__ = ("cidr", "except")
+
     def __init__(self, cidr: str, except_: Optional[List[str]] = None):
         self.cidr = cidr
         self["except"] = except_
@@ -42,6 +44,8 @@ class NetworkPolicyPeer(HelmYaml):
         policy's own Namespace.
     """
 
+    __slots__ = ("ipBlock", "namespaceSelector", "podSelector")
+
     def __init__(
         self,
         ip_block: IPBlock,
@@ -62,6 +66,8 @@ class NetworkPolicyPort(HelmYaml):
         specified, this field defaults to TCP.
     """
 
+    __slots__ = ("port", "protocol")
+
     def __init__(self, port: Optional[int] = None, protocol: Optional[str] = None):
         self.port = port
         self.protocol = protocol
@@ -82,6 +88,8 @@ class NetworkPolicyIngressRule(HelmYaml):
         rule allows traffic only if the traffic matches at least one port in the list.
     """
 
+    __slots__ = ("from", "ports")
+
     def __init__(self, from_: List[NetworkPolicyPeer], ports: List[NetworkPolicyPort]):
         self["from"] = from_
         self.ports = ports
@@ -102,6 +110,8 @@ class NetworkPolicyEgressRule(HelmYaml):
         in the to list.
     """
 
+    __slots__ = ("ports", "to")
+
     def __init__(self, ports: List[NetworkPolicyPort], to: List[NetworkPolicyPeer]):
         self.ports = ports
         self.to = to
@@ -142,6 +152,8 @@ class NetworkPolicySpec(HelmYaml):
         field is beta-level in 1.8
     """
 
+    __slots__ = ("egress", "ingress", "podSelector", "policyTypes")
+
     def __init__(
         self,
         egress: Optional[List[NetworkPolicyEgressRule]],
@@ -166,6 +178,8 @@ class NetworkPolicy(Networking):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -190,6 +204,8 @@ class IngressClassSpec(HelmYaml):
         require extra parameters.
     """
 
+    __slots__ = ("controller", "parameters")
+
     def __init__(
         self, controller: str, parameters: Optional[TypedLocalObjectReference] = None
     ):
@@ -209,6 +225,8 @@ class IngressClass(Networking):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     _non_standard_version = "v1beta1"
 
     def __init__(
@@ -16,6 +16,8 @@ class Overhead(HelmYaml):
         running a pod.
     """
 
+    __slots__ = ("podFixed",)
+
     def __init__(self, pod_fixed: dict):
         self.podFixed = pod_fixed
 
@@ -32,6 +34,8 @@ class Scheduling(HelmYaml):
         rejected in admission.
     """
 
+    __slots__ = ("tolerations", "nodeSelector")
+
     def __init__(
         self, tolerations: List[Toleration], node_selector: Optional[dict] = None
     ):
@@ -65,6 +69,8 @@ class RuntimeClass(Node):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("handler", "scheduling", "overhead")
+
     _non_standard_version = "v1beta1"
 
     def __init__(
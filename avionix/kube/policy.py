@@ -16,6 +16,8 @@ class IDRange(HelmYaml):
     :param max: max is the end of the range, inclusive.
     """
 
+    __slots__ = ("max", "min")
+
     def __init__(self, min: int, max: int):
         self.max = max
         self.min = min
@@ -30,6 +32,8 @@ class SupplementalGroupsStrategyOptions(HelmYaml):
         same start and end. Required for MustRunAs.
     """
 
+    __slots__ = ("ranges", "rule")
+
     def __init__(self, rule: str, ranges: Optional[List[IDRange]] = None):
         self.ranges = ranges
         self.rule = rule
@@ -46,6 +50,8 @@ class RuntimeClassStrategyOptions(HelmYaml):
         allowedRuntimeClassNames list. A value of nil does not mutate the Pod.
     """
 
+    __slots__ = ("allowedRuntimeClassNames", "defaultRuntimeClassName")
+
     def __init__(
         self,
         allowed_runtime_class_names: List[str],
@@ -70,6 +76,8 @@ class PodDisruptionBudgetSpec(HelmYaml):
         disruption budget.
     """
 
+    __slots__ = ("maxUnavailable", "minAvailable", "selector")
+
     def __init__(
         self,
         max_unavailable: Optional[Union[int, str]] = None,
@@ -91,6 +99,8 @@ class PodDisruptionBudget(Policy):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     _non_standard_version = "v1beta1"
 
     def __init__(
@@ -114,6 +124,8 @@ class Eviction(Policy):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("deleteOptions",)
+
     _non_standard_version = "v1beta1"
 
     def __init__(
@@ -133,6 +145,8 @@ class HostPortRange(HelmYaml):
     :param min: min is the start of the range, inclusive.
     """
 
+    __slots__ = ("max", "min")
+
     def __init__(self, max: int, min: int):
         self.max = max
         self.min = min
@@ -148,6 +162,8 @@ class AllowedHostPath(HelmYaml):
         only if all volume mounts are readOnly.
     """
 
+    __slots__ = ("pathPrefix", "readOnly")
+
     def __init__(self, path_prefix: str, read_only: Optional[bool] = None):
         self.pathPrefix = path_prefix
         self.readOnly = read_only
@@ -162,6 +178,8 @@ class RunAsUserStrategyOptions(HelmYaml):
         end. Required for MustRunAs.
     """
 
+    __slots__ = ("ranges", "rule")
+
     def __init__(self, rule: str, ranges: Optional[List[IDRange]] = None):
         self.ranges = ranges
         self.rule = rule
@@ -172,6 +190,8 @@ class AllowedCSIDriver(HelmYaml):
     :param name: Name is the registered name of the CSI driver
     """
 
+    __slots__ = ("name",)
+
     def __init__(self, name: str):
         self.name = name
 
@@ -185,6 +205,8 @@ class SELinuxStrategyOptions(HelmYaml):
         https://kubernetes.io/docs/tasks/configure-pod-container/security-context/
     """
 
+    __slots__ = ("rule", "seLinuxOptions")
+
     def __init__(self, rule: str, se_linux_options: Optional[SELinuxOptions] = None):
         self.rule = rule
         self.seLinuxOptions = se_linux_options
@@ -195,6 +217,8 @@ class AllowedFlexVolume(HelmYaml):
     :param driver: driver is the name of the Flexvolume driver.
     """
 
+    __slots__ = ("driver",)
+
     def __init__(self, driver: str):
         self.driver = driver
 
@@ -208,6 +232,8 @@ class FSGroupStrategyOptions(HelmYaml):
         end. Required for MustRunAs.
     """
 
+    __slots__ = ("ranges", "rule")
+
     def __init__(self, rule: str, ranges: Optional[List[IDRange]] = None):
         self.ranges = ranges
         self.rule = rule
@@ -222,6 +248,8 @@ class RunAsGroupStrategyOptions(HelmYaml):
         end. Required for MustRunAs.
     """
 
+    __slots__ = ("ranges", "rule")
+
     def __init__(self, rule: str, ranges: Optional[List[IDRange]] = None):
         self.ranges = ranges
         self.rule = rule
@@ -308,6 +336,33 @@ class PodSecurityPolicySpec(HelmYaml):
         that no volumes may be used. To allow all volumes you may use '\\*'.
     """
 
+    __slots__ = (
+        "allowedCSIDrivers",
+        "allowedCapabilities",
+        "allowedFlexVolumes",
+        "allowedHostPaths",
+        "allowedProcMountTypes",
+        "defaultAddCapabilities",
+        "defaultAllowPrivilegeEscalation",
+        "fsGroup",
+        "hostIPC",
+        "hostPID",
+        "hostPorts",
+        "privileged",
+        "readOnlyRootFilesystem",
+        "requiredDropCapabilities",
+        "runAsGroup",
+        "runAsUser",
+        "runtimeClass",
+        "seLinux",
+        "supplementalGroups",
+        "allowPrivilegeEscalation",
+        "allowedUnsafeSysctls",
+        "forbiddenSysctls",
+        "hostNetwork",
+        "volumes",
+    )
+
     def __init__(
         self,
         fs_group: FSGroupStrategyOptions,
@@ -372,6 +427,8 @@ class PodSecurityPolicy(Policy):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     _non_standard_version = "v1beta1"
 
     def __init__(
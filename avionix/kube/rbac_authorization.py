@@ -28,6 +28,8 @@ class PolicyRule(HelmYaml):
         URL paths (such as "/api"),  but not both.
     """
 
+    __slots__ = ("apiGroups", "nonResourceURLs", "resourceNames", "resources", "verbs")
+
     def __init__(
         self,
         api_groups: List[str],
@@ -53,6 +55,8 @@ class Role(RbacAuthorization):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("rules",)
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -71,6 +75,8 @@ class RoleRef(HelmYaml):
     :param kind: Kind is the type of resource being referenced
     """
 
+    __slots__ = ("name", "apiGroup", "kind")
+
     def __init__(self, name: str, api_group: str, kind: str):
         self.name = name
         self.apiGroup = api_group
@@ -91,6 +97,8 @@ class Subject(HelmYaml):
         Authorizer should report an error.
     """
 
+    __slots__ = ("name", "kind", "apiGroup", "namespace")
+
     def __init__(
         self,
         name: str,
@@ -117,6 +125,8 @@ class RoleBinding(RbacAuthorization):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("roleRef", "subjects")
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -137,6 +147,8 @@ class AggregationRule(HelmYaml):
         selectors match, then the ClusterRole's permissions will be added
     """
 
+    __slots__ = ("clusterRoleSelectors",)
+
     def __init__(self, cluster_role_selectors: List[LabelSelector]):
         self.clusterRoleSelectors = cluster_role_selectors
 
@@ -155,6 +167,8 @@ class ClusterRole(RbacAuthorization):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("aggregationRule", "rules")
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -180,6 +194,8 @@ class ClusterRoleBinding(RbacAuthorization):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("roleRef", "subjects")
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -29,6 +29,8 @@ class ObjectReference(Core):
     :param api_version: API version of the referent.
     """
 
+    __slots__ = ("fieldPath", "name", "namespace", "resourceVersion", "uid")
+
     def __init__(
         self,
         field_path: str,
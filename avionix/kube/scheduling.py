@@ -32,6 +32,8 @@ class PriorityClass(Scheduling):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("globalDefault", "value", "description", "preemptionPolicy")
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -19,6 +19,8 @@ class VolumeNodeResources(HelmYaml):
         not specified, then the supported number of volumes on this node is unbounded.
     """
 
+    __slots__ = ("count",)
+
     def __init__(self, count: int):
         self.count = count
 
@@ -49,6 +51,8 @@ class CSINodeDriver(HelmYaml):
         topology keys. This can be empty if driver does not support topology.
     """
 
+    __slots__ = ("name", "allocatable", "nodeID", "topologyKeys")
+
     def __init__(
         self,
         name: str,
@@ -68,6 +72,8 @@ class CSINodeSpec(HelmYaml):
         node. If all drivers in the list are uninstalled, this can become empty.
     """
 
+    __slots__ = ("drivers",)
+
     def __init__(self, drivers: List[CSINodeDriver]):
         self.drivers = drivers
 
@@ -101,6 +107,16 @@ class StorageClass(Storage):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = (
+        "allowVolumeExpansion",
+        "allowedTopologies",
+        "parameters",
+        "provisioner",
+        "volumeBindingMode",
+        "mountOptions",
+        "reclaimPolicy",
+    )
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -135,6 +151,8 @@ class VolumeAttachmentSource(HelmYaml):
     :param persistent_volume_name: Name of the persistent volume to attach.
     """
 
+    __slots__ = ("inlineVolumeSpec", "persistentVolumeName")
+
     def __init__(
         self,
         inline_volume_spec: Optional[PersistentVolumeSpec] = None,
@@ -152,6 +170,8 @@ class VolumeAttachmentSpec(HelmYaml):
     :param node_name: The node that the volume should be attached to.
     """
 
+    __slots__ = ("attacher", "source", "nodeName")
+
     def __init__(
         self, attacher: str, source: VolumeAttachmentSource, node_name: str,
     ):
@@ -172,6 +192,8 @@ class VolumeAttachment(Storage):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     def __init__(
         self,
         metadata: ObjectMeta,
@@ -228,6 +250,8 @@ class CSIDriverSpec(HelmYaml):
         which mode that is, for example via a command line parameter of the driver.
     """
 
+    __slots__ = ("attachRequired", "volumeLifecycleModes", "podInfoOnMount")
+
     def __init__(
         self,
         attach_required: Optional[bool] = None,
@@ -249,6 +273,8 @@ class CSINode(Storage):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     def __init__(
         self, metadata: ObjectMeta, spec: CSINodeSpec, api_version: Optional[str] = None
     ):
@@ -272,6 +298,8 @@ class CSIDriver(Storage):
         https://git.k8s.io/community/contributors/devel/sig-architecture/api-conventions.md#resources  # noqa
     """
 
+    __slots__ = ("spec",)
+
     def __init__(
         self,
         metadata: ObjectMeta,
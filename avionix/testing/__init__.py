@@ -1,2 +1,2 @@
 # flake8: noqa
-from avionix.testing.helpers import kubectl_get
+from avionix.testing.helpers import kubectl_get, kubectl_get_resources
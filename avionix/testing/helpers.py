@@ -1,54 +1,45 @@
+import json
+from operator import itemgetter
 import re
 from subprocess import CalledProcessError
-from typing import Any, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from avionix._process_utils import custom_check_output
 
+# A column name is one or more words separated by single spaces, columns are
+# separated by at least two spaces or a tab
+_COLUMN_NAME = re.compile(r"\S+(?: \S+)*")
 
-def _space_split(output_line: str):
-    return [
-        value
-        for value in re.split(r"(\t|  +)", output_line)
-        if not re.match(r"^\s*$", value)
-    ]
-
-
-def _get_name_locations(names: List[str], name_string: str):
-    locs: List[Any] = []
-    last_pos = 0
-    for name in names:
-        last_pos = name_string.find(name, last_pos)
-        locs.append(last_pos)
-    for i, loc in enumerate(locs):
-        if i + 1 < len(locs):
-            locs[i] = (loc, locs[i + 1])
-            continue
-        locs[i] = (loc, len(name_string))
-    return locs
-
-
-def _split_using_locations(locations: List[Tuple[int, int]], values_string: str):
-    vals = []
-    for i, loc in enumerate(locations):
-        start = loc[0]
-        end = loc[1]
-        if i == len(locations) - 1:
-            vals.append(values_string[start:].strip())
-            continue
-        vals.append(values_string[start:end].strip())
-    return vals
-
-
-def parse_output_to_dict(output: str):
-    output_lines = output.split("\n")
-    names = _space_split(output_lines[0])
-    value_locations = _get_name_locations(names, output_lines[0])
+
+def parse_output_to_dict(output: str) -> Dict[str, Tuple[str, ...]]:
+    """
+    Parses a table printed by kubectl or helm, whose columns are aligned with the
+    names in its first line
+
+    :param output: The printed table
+
+    :returns: The values of each column, keyed by column name, or an empty \
+        dictionary when the table has no rows
+    """
+    # Helm pads its columns and separates them with tabs
+    output_lines = output.expandtabs().split("\n")
+    columns = list(_COLUMN_NAME.finditer(output_lines[0]))
+    if not columns:
+        return {}
+    ends = [column.start() for column in columns[1:]] + [None]
+    # Slices every value out of a line at once
+    get_values = itemgetter(
+        *(slice(column.start(), end) for column, end in zip(columns, ends))
+    )
     value_rows = []
     for line in output_lines[1:]:
         if line.strip():
-            values = _split_using_locations(value_locations, line)
-            value_rows.append(values)
-    return {names[i].strip(): row for i, row in enumerate(zip(*value_rows))}
+            values = get_values(line)
+            if len(columns) == 1:
+                value_rows.append((values.strip(),))
+                continue
+            value_rows.append(tuple(value.strip() for value in values))
+    return {column.group(): row for column, row in zip(columns, zip(*value_rows))}
 
 
 class KubectlGetException(Exception):
@@ -56,13 +47,88 @@ class KubectlGetException(Exception):
         super().__init__(msg)
 
 
-def kubectl_get(resource: str, namespace: Optional[str] = None, wide: bool = False):
+def kubectl_get(
+    resource: str, namespace: Optional[str] = None, wide: bool = False
+) -> Dict[str, Tuple[str, ...]]:
+    """
+    Gets objects with ``kubectl get``, giving the columns kubectl prints
+
+    :param resource: The resource to get, such as "pods" or "configmaps/config"
+    :param namespace: The namespace to get the objects from
+    :param wide: Whether to include the columns kubectl adds with ``-o wide``
+
+    :returns: The values of each column, keyed by column name, as given by \
+        :func:`parse_output_to_dict`
+    """
     try:
-        command = f"kubectl get {resource}"
+        command = ["kubectl", "get", resource]
         if namespace:
-            command += f" -n {namespace}"
+            command += ["-n", namespace]
         if wide:
-            command += " -o wide"
+            command += ["-o", "wide"]
         return parse_output_to_dict(custom_check_output(command))
     except CalledProcessError as err:
         raise KubectlGetException(err.output)
+
+
+class KubernetesResource:
+    """
+    An object as listed by ``kubectl get -o json``
+
+    :param kind: The kind of the object
+    :param name: The name of the object
+    :param namespace: The namespace of the object, None for objects without one
+    :param manifest: The whole object
+    """
+
+    def __init__(self, kind: str, name: str, namespace: Optional[str], manifest: dict):
+        self.kind = kind
+        self.name = name
+        self.namespace = namespace
+        self.manifest = manifest
+
+    @classmethod
+    def from_json(cls, manifest: dict) -> "KubernetesResource":
+        metadata = manifest.get("metadata", {})
+        return cls(
+            manifest.get("kind", ""),
+            metadata.get("name", ""),
+            metadata.get("namespace"),
+            manifest,
+        )
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.kind!r}, {self.name!r})"
+
+
+def parse_kubernetes_resources(output: str) -> List[KubernetesResource]:
+    """
+    :param output: The output of ``kubectl get -o json``, either a list or a \
+        single object
+
+    :returns: The objects listed
+    """
+    if not output.strip():
+        return []
+    listed = json.loads(output)
+    manifests = listed["items"] if "items" in listed else [listed]
+    return [KubernetesResource.from_json(manifest) for manifest in manifests]
+
+
+def kubectl_get_resources(
+    resource: str, namespace: Optional[str] = None
+) -> List[KubernetesResource]:
+    """
+    Like :func:`kubectl_get`, but gives every field of the objects rather than the
+    columns kubectl prints
+
+    :param resource: The resource to get, such as "pods" or "configmaps/config"
+    :param namespace: The namespace to get the objects from
+    """
+    try:
+        command = ["kubectl", "get", resource, "-o", "json"]
+        if namespace:
+            command += ["-n", namespace]
+        return parse_kubernetes_resources(custom_check_output(command))
+    except CalledProcessError as err:
+        raise KubectlGetException(err.output)
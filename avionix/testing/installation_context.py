@@ -45,11 +45,8 @@ class ChartInstallationContext:
             {} if extra_installation_args is None else {}
         )
 
-    def get_status_resources(self) -> Dict[str, Tuple[str]]:
-        resources = kubectl_get(self.status_resource)
-        if self.__status_field in resources:
-            return resources[self.__status_field]
-        return {}
+    def get_status_resources(self) -> Tuple[str, ...]:
+        return kubectl_get(self.status_resource).get(self.__status_field, ())
 
     def wait_for_uninstall(self):
         while True:
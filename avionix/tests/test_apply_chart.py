@@ -0,0 +1,133 @@
+import asyncio
+from pathlib import Path
+from subprocess import CalledProcessError, TimeoutExpired
+from typing import List, Optional
+
+import pytest
+
+from avionix import ChartBuilder
+from avionix.chart import chart_builder
+from avionix.chart.utils import HelmRelease
+from avionix.errors import ClusterUnavailableError, HelmError
+from avionix.tests.test_release_state import FakeReleaseStateCache
+
+
+class HelmCommands:
+    """
+    Records the helm commands run by ChartBuilder instead of running them, failing
+    with the given output if any
+    """
+
+    def __init__(self):
+        self.commands: List[List[str]] = []
+        self.timeouts: List[Optional[float]] = []
+        self.error_output: Optional[bytes] = None
+
+    def check_output(self, command: List[str], timeout: Optional[float] = None):
+        self.commands.append(command)
+        self.timeouts.append(timeout)
+        if self.error_output is not None:
+            raise CalledProcessError(1, command, self.error_output)
+        return ""
+
+    async def check_output_async(
+        self, command: List[str], timeout: Optional[float] = None
+    ):
+        return self.check_output(command, timeout)
+
+
+@pytest.fixture
+def helm(monkeypatch):
+    helm = HelmCommands()
+    monkeypatch.setattr(chart_builder, "custom_check_output", helm.check_output)
+    monkeypatch.setattr(
+        chart_builder, "custom_check_output_async", helm.check_output_async
+    )
+    return helm
+
+
+@pytest.fixture
+def release_state():
+    return FakeReleaseStateCache([])
+
+
+@pytest.fixture
+def builder(chart_info, config_map, release_state, tmp_path: Path):
+    return ChartBuilder(
+        chart_info,
+        [config_map],
+        output_directory=str(tmp_path),
+        namespace="test",
+        release_state=release_state,
+    )
+
+
+def test_apply_runs_helm_once(
+    builder: ChartBuilder, helm: HelmCommands, release_state: FakeReleaseStateCache
+):
+    builder.apply_chart({"atomic": None})
+    assert helm.commands == [
+        [
+            "helm",
+            "upgrade",
+            "--install",
+            builder.chart_info.name,
+            str(builder.chart_folder_path.resolve()),
+            "-n",
+            "test",
+            "--atomic",
+        ]
+    ]
+    # The release wasn't looked up, and is now known to be installed
+    assert release_state.lookup_count == 0
+    assert builder.is_installed
+    assert not builder.chart_folder_path.exists()
+
+
+def test_apply_async(
+    builder: ChartBuilder, helm: HelmCommands, release_state: FakeReleaseStateCache
+):
+    release_state.releases = [HelmRelease(builder.chart_info.name, "test")]
+    asyncio.run(builder.apply_chart_async())
+    assert len(helm.commands) == 1
+    assert helm.commands[0][:3] == ["helm", "upgrade", "--install"]
+    assert release_state.lookup_count == 0
+
+
+def test_apply_errors(
+    builder: ChartBuilder, helm: HelmCommands, release_state: FakeReleaseStateCache
+):
+    helm.error_output = b"Error: Kubernetes cluster unreachable"
+    with pytest.raises(ClusterUnavailableError):
+        builder.apply_chart()
+    helm.error_output = b"Error: UPGRADE FAILED: timed out waiting for the condition"
+    with pytest.raises(HelmError):
+        asyncio.run(builder.apply_chart_async())
+    # A failed release is left to helm rather than uninstalled
+    assert all(command[:2] == ["helm", "upgrade"] for command in helm.commands)
+    assert not builder.is_installed
+    assert release_state.lookup_count == 1
+
+
+def test_timeout(builder: ChartBuilder, helm: HelmCommands):
+    builder.apply_chart()
+    builder.timeout = 30
+    asyncio.run(builder.apply_chart_async())
+    builder.uninstall_chart(timeout=5)
+    assert helm.timeouts == [None, 30, 5]
+
+
+def test_timed_out_release_is_looked_up_again(
+    builder: ChartBuilder, release_state: FakeReleaseStateCache, monkeypatch
+):
+    def check_output(command: List[str], timeout: Optional[float] = None):
+        raise TimeoutExpired(command, timeout or 0)
+
+    monkeypatch.setattr(chart_builder, "custom_check_output", check_output)
+    release_state.set_installed(builder.chart_info.name, "test")
+    with pytest.raises(TimeoutExpired):
+        builder.apply_chart(timeout=1)
+    # helm may have been killed before changing the release
+    release_state.releases = [HelmRelease(builder.chart_info.name, "test")]
+    assert builder.is_installed
+    assert release_state.lookup_count == 1
@@ -1,14 +1,24 @@
+import asyncio
+import io
 import os
 from pathlib import Path
 import re
 import shutil
+import tarfile
 
-from avionix import ChartBuilder, ChartDependency, ChartInfo, ChartMaintainer
+import pytest
+import yaml
+
+from avionix import ChartBuilder, ChartDependency, ChartInfo, ChartMaintainer, Values
 from avionix._process_utils import custom_check_output
-from avionix.chart.chart_builder import get_helm_installations
+from avionix.chart.repositories import SHARED_REPOSITORY_CACHE
+from avionix.chart.utils import get_helm_installations
 from avionix.kube.apps import Deployment
+from avionix.kube.core import ConfigMap
+from avionix.kube.meta import ObjectMeta
 from avionix.testing import kubectl_get
 from avionix.testing.installation_context import ChartInstallationContext
+from avionix.tests.utils import get_test_deployment
 
 
 def test_chart_folder_building(test_deployment1: Deployment):
@@ -58,11 +68,17 @@ def test_chart_installation(config_map):
         assert config_maps["DATA"][0] == "1"
 
 
+@pytest.fixture
 def remove_stable_repo():
-    custom_check_output("helm repo remove stable")
+    yield
+    # Removed even when the test fails, as other tests expect helm not to know it
+    if "stable" in SHARED_REPOSITORY_CACHE.get_repositories():
+        custom_check_output(["helm", "repo", "remove", "stable"])
 
 
-def test_chart_w_dependencies(grafana_dependency, dependency_chart_info):
+def test_chart_w_dependencies(
+    grafana_dependency, dependency_chart_info, remove_stable_repo
+):
     builder = ChartBuilder(dependency_chart_info, [])
     with ChartInstallationContext(builder, timeout=60):
         # Check helm release
@@ -77,11 +93,9 @@ def test_chart_w_dependencies(grafana_dependency, dependency_chart_info):
     with ChartInstallationContext(builder, timeout=60):
         assert builder.is_installed
 
-    remove_stable_repo()
-
 
 def test_chart_w_multiple_dependencies_repo_not_present(
-    grafana_dependency, kube2iam_dependency
+    grafana_dependency, kube2iam_dependency, remove_stable_repo
 ):
     builder = ChartBuilder(
         ChartInfo(
@@ -97,8 +111,6 @@ def test_chart_w_multiple_dependencies_repo_not_present(
     with ChartInstallationContext(builder):
         assert builder.is_installed
 
-    remove_stable_repo()
-
 
 def test_install_local_dependency():
     # Create "fake" chart
@@ -164,7 +176,9 @@ def test_helm_upgrade(chart_info):
         assert helm_installation["NAMESPACE"][0] == "default"
 
 
-def test_helm_upgrade_w_dependencies(chart_info, grafana_dependency):
+def test_helm_upgrade_w_dependencies(
+    chart_info, grafana_dependency, remove_stable_repo
+):
     builder = ChartBuilder(
         ChartInfo(
             api_version="3.2.4",
@@ -183,8 +197,6 @@ def test_helm_upgrade_w_dependencies(chart_info, grafana_dependency):
         assert helm_installation["STATUS"][0] == "deployed"
         assert helm_installation["NAMESPACE"][0] == "default"
 
-    remove_stable_repo()
-
 
 def test_installing_two_components(
     config_map, config_map2, chart_info: ChartInfo,
@@ -203,3 +215,362 @@ def test_installing_two_components(
         for i in range(2):
             assert config_maps["NAME"][i] == f"test-config-map-{i + 1}"
             assert config_maps["DATA"][i] == "1"
+
+
+def get_packed_objects():
+    objects = []
+    for i in range(6):
+        objects.append(get_test_deployment(i))
+        objects.append(
+            ConfigMap(
+                ObjectMeta(name=f"config-{i}", namespace="other" if i % 2 else None),
+                {"key": f"value-{i}"},
+            )
+        )
+    return objects
+
+
+def read_packed_templates(chart_info, tmp_path, **options):
+    objects = get_packed_objects()
+    templates = ChartBuilder(
+        chart_info, objects, output_directory=str(tmp_path), **options
+    ).generate_chart()
+    return (
+        objects,
+        {
+            path.name: list(yaml.safe_load_all(path.read_text()))
+            for path in templates.iterdir()
+        },
+    )
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_pack_templates_by_kind(chart_info, tmp_path, stream: bool):
+    objects, templates = read_packed_templates(
+        chart_info, tmp_path, pack_templates="kind", stream=stream
+    )
+    assert templates == {
+        "Deployment.yaml": [obj.to_dict() for obj in objects[::2]],
+        "ConfigMap.yaml": [obj.to_dict() for obj in objects[1::2]],
+    }
+
+
+def test_pack_templates_by_namespace(chart_info, tmp_path):
+    objects, templates = read_packed_templates(
+        chart_info, tmp_path, pack_templates="namespace"
+    )
+    assert templates == {
+        "release-namespace.yaml": [
+            obj.to_dict() for obj in objects if obj.metadata.namespace is None
+        ],
+        "namespace-other.yaml": [
+            obj.to_dict() for obj in objects if obj.metadata.namespace == "other"
+        ],
+    }
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_pack_templates_by_size(chart_info, tmp_path, stream: bool):
+    pack_size = 1000
+    objects, templates = read_packed_templates(
+        chart_info, tmp_path, pack_templates="size", pack_size=pack_size, stream=stream
+    )
+    names = [f"templates-{i}.yaml" for i in range(len(templates))]
+    assert sorted(templates) == sorted(names)
+    documents = [document for name in names for document in templates[name]]
+    assert documents == [obj.to_dict() for obj in objects]
+    templates_directory = tmp_path / chart_info.name / "templates"
+    for name in names[:-1]:
+        assert (templates_directory / name).stat().st_size >= pack_size
+
+
+def test_unknown_packing_mode(chart_info):
+    with pytest.raises(ValueError):
+        ChartBuilder(chart_info, [], pack_templates="unknown")
+
+
+def get_modification_times(chart_directory: Path):
+    return {
+        path.relative_to(chart_directory).as_posix(): path.stat().st_mtime_ns
+        for path in chart_directory.glob("**/*")
+        if path.is_file()
+    }
+
+
+def read_chart_files(chart_directory: Path):
+    return {
+        name: (chart_directory / name).read_bytes()
+        for name in get_modification_times(chart_directory)
+    }
+
+
+def get_regeneration_report(builder: ChartBuilder):
+    builder.generate_chart()
+    report = builder.regeneration_report
+    assert report is not None
+    return report
+
+
+def test_incremental_generation(chart_info, tmp_path):
+    objects = get_packed_objects()
+    builder = ChartBuilder(
+        chart_info, objects, output_directory=str(tmp_path), incremental=True
+    )
+    report = get_regeneration_report(builder)
+    assert len(report.added) == len(objects) + 2
+    assert not report.changed and not report.removed
+    (builder.chart_folder_path / "charts").mkdir()
+    (builder.chart_folder_path / "charts" / "dependency.tgz").write_bytes(b"")
+    modification_times = get_modification_times(builder.chart_folder_path)
+
+    # Nothing changed, so no file is touched
+    report = get_regeneration_report(builder)
+    assert report.touched == 0
+    assert len(report.unchanged) == len(objects) + 2
+    assert get_modification_times(builder.chart_folder_path) == modification_times
+
+    objects[0].metadata.name = "renamed-deployment"
+    builder.kubernetes_objects = objects[:-1]
+    report = get_regeneration_report(builder)
+    assert report.changed == ["templates/Deployment-0.yaml"]
+    assert report.removed == ["templates/ConfigMap-5.yaml"]
+    assert not report.added
+    assert not (builder.chart_folder_path / "templates" / "ConfigMap-5.yaml").exists()
+    # Files created by helm are kept
+    assert (builder.chart_folder_path / "charts" / "dependency.tgz").exists()
+    templates = builder.chart_folder_path / "templates"
+    assert (templates / "Deployment-0.yaml").read_text() == str(objects[0])
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_incremental_generation_matches_full_generation(
+    chart_info, tmp_path, stream: bool
+):
+    def read_chart(incremental: bool):
+        builder = ChartBuilder(
+            chart_info,
+            get_packed_objects(),
+            output_directory=str(tmp_path / str(incremental)),
+            pack_templates="size",
+            pack_size=1000,
+            stream=stream,
+            incremental=incremental,
+        )
+        builder.generate_chart()
+        return read_chart_files(builder.chart_folder_path)
+
+    assert read_chart(True) == read_chart(False)
+
+
+def test_template_names_from_metadata(chart_info, tmp_path):
+    objects = get_packed_objects()
+    unnamed = ConfigMap(ObjectMeta(), {"key": "value"})
+    duplicate = ConfigMap(ObjectMeta(name="config-0"), {"key": "other"})
+    builder = ChartBuilder(
+        chart_info,
+        objects + [unnamed, unnamed, duplicate],
+        output_directory=str(tmp_path),
+        template_names="name",
+    )
+    templates = builder.generate_chart()
+    names = {path.name: path.read_text() for path in templates.iterdir()}
+    assert names["Deployment_test-deployment-0.yaml"] == str(objects[0])
+    assert names["ConfigMap_config-0.yaml"] == str(objects[1])
+    assert names["ConfigMap_other_config-1.yaml"] == str(objects[3])
+    assert names["ConfigMap.yaml"] == names["ConfigMap-1.yaml"] == str(unnamed)
+    assert names["ConfigMap_config-0-1.yaml"] == str(duplicate)
+    assert len(names) == len(objects) + 3
+
+
+def test_template_names_are_stable(chart_info, tmp_path):
+    objects = get_packed_objects()
+    builder = ChartBuilder(
+        chart_info,
+        objects,
+        output_directory=str(tmp_path),
+        incremental=True,
+        template_names="name",
+    )
+    builder.generate_chart()
+    builder.kubernetes_objects = [get_test_deployment(10)] + objects
+    report = get_regeneration_report(builder)
+    assert report.added == ["templates/Deployment_test-deployment-10.yaml"]
+    assert report.touched == 1
+
+
+def test_unknown_template_naming_mode(chart_info):
+    with pytest.raises(ValueError):
+        ChartBuilder(chart_info, [], template_names="unknown")
+
+
+class BrokenConfigMap(ConfigMap):
+    def to_dict(self):
+        raise RuntimeError("Can't serialize")
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_atomic_generation(chart_info, tmp_path, stream: bool):
+    def read_chart(atomic: bool):
+        builder = ChartBuilder(
+            chart_info,
+            get_packed_objects(),
+            output_directory=str(tmp_path / str(atomic)),
+            stream=stream,
+            atomic=atomic,
+        )
+        builder.generate_chart()
+        return read_chart_files(builder.chart_folder_path)
+
+    atomic_chart = read_chart(True)
+    assert atomic_chart == read_chart(False)
+    # Generating again replaces the chart
+    assert read_chart(True) == atomic_chart
+    assert os.listdir(tmp_path / "True") == [chart_info.name]
+
+
+def test_atomic_generation_permissions(chart_info, tmp_path):
+    builder = ChartBuilder(chart_info, [], output_directory=str(tmp_path), atomic=True)
+    builder.generate_chart()
+    (tmp_path / "expected").mkdir()
+    assert (
+        builder.chart_folder_path.stat().st_mode
+        == (tmp_path / "expected").stat().st_mode
+    )
+
+
+def test_atomic_generation_leaves_umask_alone(chart_info, tmp_path, monkeypatch):
+    # The umask is shared by every thread, so changing it even briefly would give
+    # files created meanwhile by other threads the wrong mode
+    def umask(mask: int):
+        raise AssertionError("The umask was changed")
+
+    monkeypatch.setattr(os, "umask", umask)
+    builder = ChartBuilder(chart_info, [], output_directory=str(tmp_path), atomic=True)
+    builder.generate_chart()
+    builder.generate_chart()
+
+
+def test_parallel_atomic_generation(chart_info, tmp_path):
+    def read_chart(atomic: bool):
+        builder = ChartBuilder(
+            chart_info,
+            get_packed_objects(),
+            output_directory=str(tmp_path / str(atomic)),
+            atomic=atomic,
+            workers=2,
+        )
+        builder.generate_chart()
+        return read_chart_files(builder.chart_folder_path)
+
+    assert read_chart(True) == read_chart(False)
+
+
+def test_failed_atomic_generation_keeps_chart(chart_info, tmp_path):
+    objects = get_packed_objects()
+    builder = ChartBuilder(
+        chart_info, objects, output_directory=str(tmp_path), atomic=True
+    )
+    builder.generate_chart()
+    chart = read_chart_files(builder.chart_folder_path)
+    builder.kubernetes_objects = objects + [
+        BrokenConfigMap(ObjectMeta(name="broken"), {})
+    ]
+    with pytest.raises(RuntimeError):
+        builder.generate_chart()
+    assert read_chart_files(builder.chart_folder_path) == chart
+    assert os.listdir(tmp_path) == [chart_info.name]
+
+
+def test_incremental_atomic_generation(chart_info):
+    with pytest.raises(ValueError):
+        ChartBuilder(chart_info, [], incremental=True, atomic=True)
+
+
+def test_package_chart(chart_info, tmp_path):
+    objects = get_packed_objects()
+    builder = ChartBuilder(
+        chart_info, objects, output_directory=str(tmp_path), template_names="name"
+    )
+    archive = builder.package_chart()
+    # Nothing is written to disk
+    assert not builder.chart_folder_path.exists()
+    assert builder.package_chart() == archive
+    for kube_object in objects:
+        kube_object.invalidate()
+    assert builder.package_chart() == archive
+
+    builder.generate_chart()
+    chart = read_chart_files(builder.chart_folder_path)
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        members = tar.getmembers()
+        assert [member.name for member in members] == sorted(
+            f"{chart_info.name}/{name}" for name in chart
+        )
+        for member in members:
+            assert member.mtime == member.uid == member.gid == 0
+            assert member.mode == 0o644
+            file = tar.extractfile(member)
+            assert file is not None
+            assert file.read() == chart[member.name.split("/", 1)[1]]
+
+
+def test_package_chart_changes_with_objects(chart_info):
+    objects = get_packed_objects()
+    builder = ChartBuilder(chart_info, objects)
+    archive = builder.package_chart()
+    objects[0].metadata.name = "renamed"
+    assert builder.package_chart() != archive
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"stream": True},
+        {"pack_templates": "kind"},
+        {"pack_templates": "size", "pack_size": 1000},
+        {"template_names": "name"},
+        {"incremental": True},
+        {"atomic": True},
+    ],
+)
+def test_generate_chart_files(chart_info, tmp_path, options: dict):
+    builder = ChartBuilder(
+        chart_info,
+        get_packed_objects(),
+        output_directory=str(tmp_path),
+        values=Values({"key": "value"}),
+        **options,
+    )
+    files = builder.generate_chart_files()
+    assert not builder.chart_folder_path.exists()
+    assert {"Chart.yaml", "values.yaml"} < set(files)
+    builder.generate_chart()
+    assert files == read_chart_files(builder.chart_folder_path)
+
+
+def test_installing_releases_concurrently(chart_info):
+    builders = [
+        ChartBuilder(
+            ChartInfo(api_version="3.2.4", name=f"test-{i}", version="0.1.0"),
+            [ConfigMap(ObjectMeta(name=f"test-config-map-{i}"), {"key": "value"})],
+        )
+        for i in range(3)
+    ]
+
+    async def install_all():
+        await asyncio.gather(*(builder.install_chart_async() for builder in builders))
+        return await asyncio.gather(
+            *(builder.is_installed_async() for builder in builders)
+        )
+
+    async def uninstall_all():
+        await asyncio.gather(*(builder.uninstall_chart_async() for builder in builders))
+
+    try:
+        assert asyncio.run(install_all()) == [True] * len(builders)
+        config_maps = kubectl_get("configmaps")
+        for i in range(len(builders)):
+            assert f"test-config-map-{i}" in config_maps["NAME"]
+    finally:
+        asyncio.run(uninstall_all())
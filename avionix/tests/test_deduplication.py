@@ -0,0 +1,71 @@
+import pytest
+
+from avionix import ChartBuilder, ObjectMeta, Value
+from avionix.kube.core import ConfigMap, Pod, PodSpec, Probe, TCPSocketAction
+from avionix.tests.utils import get_pod_with_options, get_test_deployment
+from avionix.yaml.deduplication import SubtreeDeduplicator
+from avionix.yaml.emitters import EMITTERS, get_emitter
+from avionix.yaml.yaml_handling import memoized
+
+
+def get_objects():
+    probe = Probe(tcp_socket=TCPSocketAction(8080), period_seconds=5)
+    pod = get_pod_with_options(readiness_probe=probe, command=["echo", "word " * 30])
+    return [
+        get_test_deployment(1),
+        get_test_deployment(1),
+        get_test_deployment(2),
+        pod,
+        # The same containers at another depth
+        Pod(ObjectMeta(name="other-pod"), PodSpec(pod.spec.containers * 2)),
+        get_pod_with_options(readiness_probe=probe, name="probed"),
+        ConfigMap(ObjectMeta(name="config"), {"value": Value("my_value")}),
+    ]
+
+
+@pytest.mark.parametrize("emitter", list(EMITTERS))
+def test_text_matches_emitter(emitter: str):
+    objects = get_objects()
+    texts = SubtreeDeduplicator(emitter).get_texts(objects)
+    emit = get_emitter(emitter)
+    assert texts == [emit(kube_object.to_dict()) for kube_object in objects]
+
+
+def test_report():
+    deduplicator = SubtreeDeduplicator("pyyaml")
+    deduplicator.get_texts([get_test_deployment(1) for _ in range(3)])
+    report = deduplicator.report
+    # The deployments are identical, so only their first copy is written
+    assert report.reused_blocks == 2
+    assert report.bytes_saved == 2 * len(str(get_test_deployment(1)))
+    assert report.seconds_saved > 0
+    assert report.repeated_blocks > 0
+
+
+def test_json_is_not_deduplicated():
+    deduplicator = SubtreeDeduplicator("json")
+    deduplicator.get_texts([get_test_deployment(1) for _ in range(3)])
+    assert deduplicator.report.reused_blocks == 0
+
+
+def test_text_is_memoized():
+    deployment = get_test_deployment(1)
+    with memoized():
+        (text,) = SubtreeDeduplicator().get_texts([deployment])
+        assert str(deployment) is text
+
+
+def test_chart_generation(chart_info):
+    objects = get_objects()
+
+    def read_files(deduplicate: bool):
+        builder = ChartBuilder(chart_info, objects, deduplicate=deduplicate)
+        return builder, builder.generate_chart_files()
+
+    builder, deduplicated_files = read_files(True)
+    assert builder.deduplication_report.reused_blocks > 0
+    for kube_object in objects:
+        kube_object.invalidate()
+    builder, files = read_files(False)
+    assert builder.deduplication_report is None
+    assert deduplicated_files == files
@@ -0,0 +1,149 @@
+import asyncio
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pytest
+
+from avionix import ChartBuilder, ChartDependency
+from avionix.chart import chart_builder
+from avionix.chart.dependency_cache import DependencyCache
+from avionix.chart.dependency_resolver import DependencyResolver
+from avionix.chart.utils import HelmRelease
+from avionix.tests.test_release_state import FakeReleaseStateCache
+
+STABLE = "https://charts.helm.sh/stable"
+ARCHIVE = b"grafana-5.5.2 archive"
+
+
+@pytest.fixture
+def cache(tmp_path: Path):
+    return DependencyCache(tmp_path / "cache")
+
+
+@pytest.fixture
+def charts(tmp_path: Path):
+    charts = tmp_path / "chart" / "charts"
+    charts.mkdir(parents=True)
+    (charts / "grafana-5.5.2.tgz").write_bytes(ARCHIVE)
+    return charts
+
+
+def test_store_and_vendor(
+    cache: DependencyCache, charts: Path, tmp_path: Path, grafana_dependency
+):
+    cache.store([grafana_dependency], charts)
+    vendored = tmp_path / "other" / "charts"
+    assert cache.vendor([grafana_dependency], vendored) == []
+    assert (vendored / "grafana-5.5.2.tgz").read_bytes() == ARCHIVE
+
+
+def test_vendor_returns_missing_dependencies(
+    cache: DependencyCache, charts: Path, grafana_dependency, kube2iam_dependency
+):
+    cache.store([grafana_dependency], charts)
+    missing = cache.vendor([grafana_dependency, kube2iam_dependency], charts)
+    assert missing == [kube2iam_dependency]
+
+
+def test_archives_are_stored_once(cache: DependencyCache, grafana_dependency):
+    mirror = ChartDependency("grafana", "5.5.2", "https://mirror.example.com", "mirror")
+    cache.add_archive(grafana_dependency, ARCHIVE)
+    cache.add_archive(mirror, ARCHIVE)
+    assert len(list((cache.cache_directory / "blobs").rglob("*.tgz"))) == 1
+    assert cache.get_archive(mirror) == ARCHIVE
+    # The same chart from another repository is another dependency
+    other = ChartDependency("grafana", "5.5.2", "https://other.example.com", "other")
+    assert cache.get_archive(other) is None
+
+
+def test_corrupted_archive_is_missing(cache: DependencyCache, grafana_dependency):
+    cache.add_archive(grafana_dependency, ARCHIVE)
+    blob = next((cache.cache_directory / "blobs").rglob("*.tgz"))
+    blob.write_bytes(b"truncated")
+    assert cache.get_archive(grafana_dependency) is None
+    cache.add_archive(grafana_dependency, ARCHIVE)
+    assert cache.get_archive(grafana_dependency) is None
+
+
+@pytest.mark.parametrize(
+    "dependency",
+    [
+        ChartDependency("grafana", "^5.5.0", STABLE, "stable"),
+        ChartDependency("grafana", "5.5.x", STABLE, "stable"),
+        ChartDependency("grafana", "5.5.2", "file://../grafana", "local"),
+        ChartDependency("grafana", "5.5.2", STABLE, "stable", is_local=True),
+    ],
+)
+def test_uncacheable_dependencies(cache: DependencyCache, dependency):
+    cache.add_archive(dependency, ARCHIVE)
+    assert cache.get_archive(dependency) is None
+    assert not cache.cache_directory.exists()
+
+
+@pytest.fixture
+def commands(monkeypatch):
+    """
+    Records the helm commands run by ChartBuilder instead of running them
+    """
+    commands: List[List[str]] = []
+
+    def check_output(command: List[str], timeout: Optional[float] = None):
+        commands.append(command)
+        return ""
+
+    async def check_output_async(command: List[str], timeout: Optional[float] = None):
+        return check_output(command)
+
+    monkeypatch.setattr(chart_builder, "custom_check_output", check_output)
+    monkeypatch.setattr(chart_builder, "custom_check_output_async", check_output_async)
+    return commands
+
+
+def test_install_with_cached_dependencies(
+    cache: DependencyCache,
+    dependency_chart_info,
+    grafana_dependency,
+    config_map,
+    commands: List[List[str]],
+    tmp_path: Path,
+):
+    cache.add_archive(grafana_dependency, ARCHIVE)
+    builder = ChartBuilder(
+        dependency_chart_info,
+        [config_map],
+        output_directory=str(tmp_path),
+        keep_chart=True,
+        release_state=FakeReleaseStateCache([]),
+        dependency_cache=cache,
+        dependency_resolver=DependencyResolver(tmp_path / "helm", tmp_path / "indexes"),
+    )
+    options: Dict[str, Optional[str]] = {"dependency-update": None}
+    builder.install_chart(options)
+    assert len(commands) == 1
+    assert "--dependency-update" not in commands[0]
+    assert (builder.chart_folder_path / "charts" / "grafana-5.5.2.tgz").exists()
+    assert options == {"dependency-update": None}
+
+
+def test_upgrade_with_cached_dependencies(
+    cache: DependencyCache,
+    dependency_chart_info,
+    grafana_dependency,
+    config_map,
+    commands: List[List[str]],
+    tmp_path: Path,
+):
+    cache.add_archive(grafana_dependency, ARCHIVE)
+    builder = ChartBuilder(
+        dependency_chart_info,
+        [config_map],
+        output_directory=str(tmp_path),
+        release_state=FakeReleaseStateCache(
+            [HelmRelease(dependency_chart_info.name, "default")]
+        ),
+        dependency_cache=cache,
+        dependency_resolver=DependencyResolver(tmp_path / "helm", tmp_path / "indexes"),
+    )
+    asyncio.run(builder.upgrade_chart_async({"dependency-update": None}))
+    assert len(commands) == 1
+    assert commands[0][:2] == ["helm", "upgrade"]
@@ -0,0 +1,250 @@
+from hashlib import sha256
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+import yaml
+
+from avionix import ChartBuilder, ChartDependency, ChartInfo
+from avionix.chart import chart_builder, dependency_resolver
+from avionix.chart.dependency_cache import DependencyCache
+from avionix.chart.dependency_resolver import DependencyResolver, get_lock_digest
+from avionix.chart.repositories import HelmRepositoryCache
+from avionix.chart.semver import VersionConstraint, parse_version
+from avionix.errors import DependencyResolutionError
+from avionix.tests.test_release_state import FakeReleaseStateCache
+
+STABLE = "https://charts.helm.sh/stable"
+GRAFANA_VERSIONS = ["5.0.0", "5.5.2", "5.6.0-beta.1", "5.10.1", "6.0.0", "latest"]
+
+
+@pytest.mark.parametrize(
+    "constraint,version,satisfied",
+    [
+        ("5.5.2", "5.5.2", True),
+        ("5.5.2", "5.5.3", False),
+        ("", "1.0.0", True),
+        ("*", "1.0.0", True),
+        ("5.x", "5.10.1", True),
+        ("5.5.x", "5.6.0", False),
+        ("^5.5.0", "5.10.1", True),
+        ("^5.5.0", "6.0.0", False),
+        ("^0.2.3", "0.2.9", True),
+        ("^0.2.3", "0.3.0", False),
+        ("^0.0.3", "0.0.4", False),
+        ("~5.5.0", "5.5.9", True),
+        ("~5.5.0", "5.6.0", False),
+        (">=5.0.0 <6.0.0", "5.10.1", True),
+        (">=5.0.0, <6.0.0", "6.0.0", False),
+        (">5.5", "5.5.9", False),
+        (">5.5", "5.6.0", True),
+        ("<=5.5", "5.5.9", True),
+        ("!=5.5.2", "5.5.2", False),
+        ("5.0.0 - 5.5.2", "5.5.2", True),
+        ("5.0.0 - 5.5.2", "5.5.3", False),
+        ("4.x || 6.x", "6.0.0", True),
+        ("4.x || 6.x", "5.0.0", False),
+        ("^5.5.0", "5.6.0-beta.1", False),
+        (">=5.6.0-alpha", "5.6.0-beta.1", True),
+    ],
+)
+def test_version_constraints(constraint: str, version: str, satisfied: bool):
+    parsed = parse_version(version)
+    assert parsed is not None
+    assert VersionConstraint(constraint).is_satisfied_by(parsed) is satisfied
+
+
+def test_version_precedence():
+    versions = ["1.0.0", "1.0.0-beta.11", "1.0.0-alpha", "1.0.0-beta.2", "1.0.0-rc.1"]
+    assert sorted(versions, key=lambda version: parse_version(version) or ()) == [
+        "1.0.0-alpha",
+        "1.0.0-beta.2",
+        "1.0.0-beta.11",
+        "1.0.0-rc.1",
+        "1.0.0",
+    ]
+
+
+@pytest.mark.parametrize("constraint", ["latest", ">>1.0.0", "1.2.3.4", "^1 foo"])
+def test_invalid_version_constraints(constraint: str):
+    with pytest.raises(ValueError):
+        VersionConstraint(constraint)
+
+
+def write_index(index: Path, versions: List[str]):
+    entries = [
+        {"name": "grafana", "version": version, "urls": [f"grafana-{version}.tgz"]}
+        for version in versions
+    ]
+    index.write_text(
+        yaml.safe_dump({"apiVersion": "v1", "entries": {"grafana": entries}})
+    )
+
+
+@pytest.fixture
+def helm(tmp_path: Path, monkeypatch):
+    """
+    A helm config knowing the stable repository, with its index downloaded
+    """
+    helm = tmp_path / "helm"
+    (helm / "repository").mkdir(parents=True)
+    config = helm / "repositories.yaml"
+    config.write_text(
+        yaml.safe_dump({"repositories": [{"name": "stable", "url": STABLE}]})
+    )
+    monkeypatch.setenv("HELM_REPOSITORY_CONFIG", str(config))
+    write_index(helm / "repository" / "stable-index.yaml", GRAFANA_VERSIONS)
+    return helm
+
+
+@pytest.fixture
+def resolver(helm: Path, tmp_path: Path):
+    return DependencyResolver(
+        helm / "repository",
+        tmp_path / "indexes",
+        HelmRepositoryCache(tmp_path / "repositories"),
+    )
+
+
+@pytest.mark.parametrize(
+    "constraint,version",
+    [("^5.0.0", "5.10.1"), ("~5.5.0", "5.5.2"), ("*", "6.0.0"), ("5.5.2", "5.5.2")],
+)
+def test_resolve(resolver: DependencyResolver, constraint: str, version: str):
+    dependency = ChartDependency("grafana", constraint, STABLE, "stable")
+    assert resolver.resolve(dependency) == version
+
+
+def test_resolve_by_repository_name(resolver: DependencyResolver):
+    dependency = ChartDependency("grafana", "^5.0.0", "@stable", "stable")
+    assert resolver.resolve(dependency) == "5.10.1"
+
+
+@pytest.mark.parametrize(
+    "dependency",
+    [
+        ChartDependency("grafana", "^7.0.0", STABLE, "stable"),
+        ChartDependency("loki", "*", STABLE, "stable"),
+        ChartDependency("grafana", "*", "https://grafana.github.io/helm-charts", "g"),
+        ChartDependency("grafana", "*", "@bitnami", "bitnami"),
+        ChartDependency("grafana", "not a version", STABLE, "stable"),
+    ],
+)
+def test_unresolvable_dependencies(resolver: DependencyResolver, dependency):
+    with pytest.raises(DependencyResolutionError):
+        resolver.resolve(dependency)
+
+
+def test_versions_are_cached(
+    helm: Path, resolver: DependencyResolver, tmp_path: Path, monkeypatch
+):
+    assert resolver.get_versions("stable", "grafana")[0] == "6.0.0"
+
+    def read_index(index: Path):
+        raise AssertionError("The versions should be read from the cache")
+
+    monkeypatch.setattr(dependency_resolver, "_read_index", read_index)
+    other_resolver = DependencyResolver(helm / "repository", tmp_path / "indexes")
+    assert other_resolver.get_versions("stable", "grafana") == [
+        "6.0.0",
+        "5.10.1",
+        "5.6.0-beta.1",
+        "5.5.2",
+        "5.0.0",
+    ]
+    monkeypatch.undo()
+    # Downloading the index again changes the versions
+    write_index(helm / "repository" / "stable-index.yaml", ["7.0.0"])
+    assert resolver.get_versions("stable", "grafana") == ["7.0.0"]
+
+
+def test_local_dependency(resolver: DependencyResolver, tmp_path: Path):
+    local_chart = tmp_path / "local-chart"
+    local_chart.mkdir()
+    (tmp_path / "chart").mkdir()
+    (local_chart / "Chart.yaml").write_text(
+        yaml.safe_dump({"name": "local-chart", "version": "0.1.0"})
+    )
+    dependency = ChartDependency(
+        "local-chart", "^0.1.0", "file://../local-chart", "local", is_local=True
+    )
+    assert resolver.resolve(dependency, tmp_path / "chart") == "0.1.0"
+
+
+def test_lock_digest():
+    dependency = ChartDependency("grafana", ">=5.0.0", STABLE, "stable")
+    resolved = ChartDependency("grafana", "5.5.2", STABLE, "stable")
+    # json.Marshal of the dependencies of Chart.yaml and Chart.lock, as helm hashes
+    # them
+    marshalled = (
+        '[[{"name":"grafana","version":"\\u003e=5.0.0","repository":"%s"}],'
+        '[{"name":"grafana","version":"5.5.2","repository":"%s"}]]' % (STABLE, STABLE)
+    )
+    assert get_lock_digest([dependency], [resolved]) == (
+        "sha256:" + sha256(marshalled.encode("utf-8")).hexdigest()
+    )
+
+
+def test_write_lock(resolver: DependencyResolver, tmp_path: Path):
+    dependencies = [ChartDependency("grafana", "^5.0.0", STABLE, "stable")]
+    resolved = resolver.write_lock(dependencies, tmp_path)
+    assert [dependency.version for dependency in resolved] == ["5.10.1"]
+    assert dependencies[0].version == "^5.0.0"
+    lock = yaml.safe_load((tmp_path / "Chart.lock").read_text())
+    assert lock["dependencies"] == [
+        {"name": "grafana", "repository": STABLE, "version": "5.10.1"}
+    ]
+    assert lock["digest"] == get_lock_digest(dependencies, resolved)
+
+
+@pytest.fixture
+def commands(monkeypatch):
+    commands: List[List[str]] = []
+
+    def check_output(command: List[str], timeout: Optional[float] = None):
+        commands.append(command)
+        return ""
+
+    monkeypatch.setattr(chart_builder, "custom_check_output", check_output)
+    return commands
+
+
+@pytest.fixture
+def builder(resolver: DependencyResolver, tmp_path: Path, config_map):
+    chart_info = ChartInfo(
+        api_version="3.2.4",
+        name="test",
+        version="0.1.0",
+        dependencies=[ChartDependency("grafana", "^5.0.0", STABLE, "stable")],
+    )
+    return ChartBuilder(
+        chart_info,
+        [config_map],
+        output_directory=str(tmp_path),
+        keep_chart=True,
+        release_state=FakeReleaseStateCache([]),
+        dependency_cache=DependencyCache(tmp_path / "cache"),
+        dependency_resolver=resolver,
+    )
+
+
+def test_install_builds_locked_dependencies(
+    builder: ChartBuilder, commands: List[List[str]]
+):
+    builder.install_chart({"dependency-update": None})
+    chart = str(builder.chart_folder_path.resolve())
+    assert commands[0] == ["helm", "dependency", "build", chart, "--skip-refresh"]
+    assert commands[1][:2] == ["helm", "install"]
+    assert "--dependency-update" not in commands[1]
+    assert (builder.chart_folder_path / "Chart.lock").exists()
+
+
+def test_install_with_resolved_cached_dependencies(
+    builder: ChartBuilder, commands: List[List[str]]
+):
+    builder.dependency_cache.add_archive(
+        ChartDependency("grafana", "5.10.1", STABLE, "stable"), b"archive"
+    )
+    builder.install_chart({"dependency-update": None})
+    assert len(commands) == 1
+    assert (builder.chart_folder_path / "charts" / "grafana-5.10.1.tgz").exists()
@@ -0,0 +1,288 @@
+import io
+import random
+import tracemalloc
+
+import pytest
+import yaml
+
+from avionix import ChartBuilder, ObjectMeta, Value, Values
+from avionix.kube.core import (
+    ConfigMap,
+    Container,
+    EnvVar,
+    Pod,
+    PodSpec,
+    Probe,
+    TCPSocketAction,
+)
+from avionix.options import DEFAULTS
+from avionix.tests.utils import get_pod_with_options, get_test_deployment
+from avionix.yaml.emitters import (
+    EMITTERS,
+    STREAM_EMITTERS,
+    get_emitter,
+    get_stream_emitter,
+)
+
+YAML_EMITTERS = [name for name in EMITTERS if name != "json"]
+
+SCALARS = [
+    "plain",
+    "",
+    "yes",
+    "no",
+    "on",
+    "null",
+    "~",
+    "1",
+    "1.0",
+    "0x1f",
+    "2020-01-01",
+    "x: y",
+    "- item",
+    "#comment",
+    "*alias",
+    "<<",
+    "=",
+    " leading space",
+    "trailing space ",
+    "multi\nline",
+    "unicode é",
+    "tab\tseparated",
+    "word " * 30,
+    "k" * 130,
+    "{{ .Values.my.value }}",
+    0,
+    1,
+    -12,
+    0.5,
+    1.5e20,
+    True,
+    False,
+    None,
+]
+
+
+def random_data(rand: random.Random, depth: int = 0):
+    choice = rand.random()
+    if depth > 3 or choice < 0.4:
+        return rand.choice(SCALARS)
+    if choice < 0.7:
+        return {
+            str(rand.choice(SCALARS)): random_data(rand, depth + 1)
+            for _ in range(rand.randint(0, 4))
+        }
+    return [random_data(rand, depth + 1) for _ in range(rand.randint(0, 4))]
+
+
+def get_documents():
+    shared_list = ["shared"]
+    documents = [
+        get_test_deployment(1).to_dict(),
+        get_pod_with_options(command=["echo", "word " * 30]).to_dict(),
+        ConfigMap(
+            ObjectMeta(name="test"),
+            {"my_value": Value("my_value"), "empty_string": ""},
+        ).to_dict(),
+        {"aliased": shared_list, "again": shared_list},
+        {"empty_dict": {}, "empty_list": [], 1: "integer key"},
+        [[["nested"], "list"], {"in": "list"}],
+    ]
+    documents.extend({scalar: scalar} for scalar in SCALARS if scalar is not None)
+    rand = random.Random(0)
+    documents.extend({"random": random_data(rand)} for _ in range(300))
+    return documents
+
+
+@pytest.mark.parametrize("emitter", YAML_EMITTERS)
+def test_yaml_emitters_match_pyyaml(emitter: str):
+    emit = get_emitter(emitter)
+    for document in get_documents():
+        assert emit(document) == yaml.dump(document)
+
+
+def has_repeated_collections(data, seen=None):
+    if seen is None:
+        seen = set()
+    if isinstance(data, (dict, list)):
+        if id(data) in seen:
+            return True
+        seen.add(id(data))
+        values = data.values() if isinstance(data, dict) else data
+        return any(has_repeated_collections(value, seen) for value in values)
+    return False
+
+
+def emit_to_stream(emitter: str, data) -> str:
+    stream = io.StringIO()
+    get_stream_emitter(emitter)(data, stream)
+    return stream.getvalue()
+
+
+@pytest.mark.parametrize("emitter", list(STREAM_EMITTERS))
+def test_stream_emitters_match_emitters(emitter: str):
+    emit = get_emitter(emitter)
+    for document in get_documents():
+        if has_repeated_collections(document):
+            continue
+        try:
+            text = emit(document)
+        except TypeError:
+            # json cannot sort keys of different types
+            with pytest.raises(TypeError):
+                emit_to_stream(emitter, document)
+        else:
+            assert emit_to_stream(emitter, document) == text
+
+
+@pytest.mark.parametrize("emitter", YAML_EMITTERS)
+def test_stream_emitters_copy_repeated_collections(emitter: str):
+    shared_list = ["shared"]
+    assert emit_to_stream(
+        emitter, {"aliased": shared_list, "again": shared_list}
+    ) == yaml.dump({"aliased": ["shared"], "again": ["shared"]})
+
+
+class NullStream(io.StringIO):
+    def write(self, text: str) -> int:
+        return len(text)
+
+
+def get_objects():
+    rand = random.Random(0)
+    probe = Probe(tcp_socket=TCPSocketAction(8080), period_seconds=5)
+    objects = [
+        get_test_deployment(1),
+        get_pod_with_options(readiness_probe=probe, command=["echo", "word " * 30]),
+        ConfigMap(
+            ObjectMeta(name="test", labels={}),
+            {
+                "my_value": Value("my_value"),
+                "_private": "hidden",
+                "empty": {"nested": [None, {}]},
+                "zero": 0,
+            },
+        ),
+    ]
+    objects.extend(
+        ConfigMap(ObjectMeta(name="random"), {"random": random_data(rand)})
+        for _ in range(100)
+    )
+    return objects
+
+
+@pytest.mark.parametrize("emitter", list(STREAM_EMITTERS))
+def test_streamed_objects_match_emitters(emitter: str):
+    emit = get_emitter(emitter)
+    for kube_object in get_objects():
+        stream = io.StringIO()
+        kube_object._write_text(stream, emitter)
+        assert stream.getvalue() == emit(kube_object.to_dict())
+
+
+def get_large_pod():
+    containers = [
+        Container(
+            f"container-{i}",
+            image="image",
+            env=[EnvVar(f"VARIABLE_{j}", "v" * 20) for j in range(10)],
+        )
+        for i in range(600)
+    ]
+    return Pod(ObjectMeta(name="large"), PodSpec(containers))
+
+
+def get_large_config_map():
+    return ConfigMap(
+        ObjectMeta(name="large"), {f"key-{i}": "v" * 100 for i in range(10000)}
+    )
+
+
+@pytest.mark.parametrize("emitter", list(STREAM_EMITTERS))
+@pytest.mark.parametrize(
+    "get_object,ratio", [(get_large_config_map, 2), (get_large_pod, 10)]
+)
+def test_streaming_peak_memory(emitter: str, get_object, ratio: int):
+    kube_object = get_object()
+    tracemalloc.start()
+    try:
+        kube_object._write_text(NullStream(), emitter)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    # Only the keys of the mapping being written are held at a time, not the
+    # output of to_dict
+    assert peak < len(get_emitter(emitter)(kube_object.to_dict())) / ratio
+
+
+def has_only_string_keys(data):
+    if isinstance(data, dict):
+        return all(
+            isinstance(key, str) and has_only_string_keys(value)
+            for key, value in data.items()
+        )
+    if isinstance(data, list):
+        return all(has_only_string_keys(value) for value in data)
+    return True
+
+
+def test_json_emitter_is_valid_yaml():
+    emit = get_emitter("json")
+    for document in get_documents():
+        # JSON object keys are always strings
+        if has_only_string_keys(document):
+            assert yaml.safe_load(emit(document)) == document
+
+
+@pytest.mark.parametrize("emitter", list(EMITTERS))
+def test_default_emitter_option(emitter: str, test_deployment1):
+    DEFAULTS["emitter"] = emitter
+    try:
+        assert str(test_deployment1) == get_emitter(emitter)(test_deployment1.to_dict())
+    finally:
+        DEFAULTS["emitter"] = "pyyaml"
+
+
+def test_unknown_emitter():
+    with pytest.raises(ValueError):
+        get_emitter("unknown")
+
+
+@pytest.mark.parametrize("emitter", list(EMITTERS))
+def test_chart_generation_with_emitter(emitter: str, chart_info, tmp_path):
+    deployment = get_test_deployment(1)
+    values = Values({"my_value": "some_value", "my": {"nested": {"value": 0}}})
+    templates = ChartBuilder(
+        chart_info,
+        [deployment],
+        output_directory=str(tmp_path),
+        values=values,
+        emitter=emitter,
+    ).generate_chart()
+
+    emit = get_emitter(emitter)
+    with open(templates / "Deployment-0.yaml") as template:
+        assert template.read() == emit(deployment.to_dict())
+    with open(templates.parent / "values.yaml") as values_file:
+        assert yaml.safe_load(values_file.read()) == values.values
+    with open(templates.parent / "Chart.yaml") as chart_yaml:
+        assert yaml.safe_load(chart_yaml.read()) == chart_info.to_dict()
+
+
+@pytest.mark.parametrize("emitter", list(EMITTERS))
+def test_streamed_chart_generation(emitter: str, chart_info, tmp_path):
+    def read_chart(stream: bool):
+        ChartBuilder(
+            chart_info,
+            [get_test_deployment(1), get_pod_with_options()],
+            output_directory=str(tmp_path / str(stream)),
+            values=Values({"my_value": "some_value"}),
+            emitter=emitter,
+            stream=stream,
+        ).generate_chart()
+        return {
+            str(path.relative_to(tmp_path / str(stream))): path.read_text()
+            for path in (tmp_path / str(stream)).glob("**/*.yaml")
+        }
+
+    assert read_chart(True) == read_chart(False)
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 
 from avionix import ChartBuilder
@@ -38,3 +40,23 @@ def test_raises_when_invalid_upgrade_parameter_passed(chart_info, config_map):
     builder.install_chart()
     with pytest.raises(HelmError):
         builder.upgrade_chart(options={"my-invalid-option": "hello"})
+
+
+def test_chart_not_installed_error_async(chart_info, config_map):
+    builder = ChartBuilder(chart_info, [config_map])
+    with pytest.raises(ChartNotInstalledError):
+        asyncio.run(builder.upgrade_chart_async())
+
+
+def test_already_installed_error_async(chart_info, config_map):
+    builder = ChartBuilder(chart_info, [config_map])
+    asyncio.run(builder.install_chart_async())
+    with pytest.raises(ChartAlreadyInstalledError):
+        asyncio.run(builder.install_chart_async())
+    asyncio.run(builder.uninstall_chart_async())
+
+
+def test_namespace_doesnt_exist_async(chart_info):
+    builder = ChartBuilder(chart_info, [], namespace="12345678")
+    with pytest.raises(NamespaceDoesNotExist):
+        asyncio.run(builder.install_chart_async())
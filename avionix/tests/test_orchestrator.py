@@ -0,0 +1,144 @@
+import asyncio
+from typing import Dict, List, Optional
+
+import pytest
+
+from avionix import ChartBuilder, ChartInfo
+from avionix.chart import ReleaseOrchestrator
+from avionix.errors import HelmError, ReleaseOrchestrationError
+
+
+class RecordingChartBuilder(ChartBuilder):
+    """
+    Records when helm would run instead of running it, to test the scheduling of
+    releases without a cluster
+    """
+
+    def __init__(self, name: str, events: List[str], fail: bool = False):
+        super().__init__(ChartInfo(api_version="3.2.4", name=name, version="0.1.0"), [])
+        self.__events = events
+        self.__fail = fail
+        self.options: Optional[dict] = None
+
+    async def __run(self, options: Optional[Dict[str, Optional[str]]]):
+        self.options = options
+        self.__events.append(f"start {self.chart_info.name}")
+        await asyncio.sleep(0.01)
+        self.__events.append(f"end {self.chart_info.name}")
+        if self.__fail:
+            raise HelmError(f"{self.chart_info.name} failed")
+
+    async def install_chart_async(self, options=None, timeout=None):
+        await self.__run(options)
+
+    async def uninstall_chart_async(self, options=None, timeout=None):
+        await self.__run(options)
+
+    async def apply_chart_async(self, options=None, timeout=None):
+        await self.__run(options)
+
+
+def get_builders(events: List[str], failing: str = ""):
+    return [
+        RecordingChartBuilder(name, events, fail=name == failing)
+        for name in ("crds", "operator", "database", "app", "monitoring")
+    ]
+
+
+DEPENDENCIES = {"operator": ["crds"], "app": ["database", "operator"]}
+
+
+def test_dependencies_install_first():
+    events: List[str] = []
+    report = ReleaseOrchestrator(get_builders(events), DEPENDENCIES).install_charts()
+    assert report.succeeded == ["crds", "operator", "database", "app", "monitoring"]
+    for name, required_names in DEPENDENCIES.items():
+        for required_name in required_names:
+            assert events.index(f"end {required_name}") < events.index(f"start {name}")
+    # Independent releases run at the same time
+    assert events.index("start monitoring") < events.index("end crds")
+    for result in report.results.values():
+        assert result.seconds is not None and result.seconds > 0
+        assert result.started is not None
+
+
+def test_apply_in_dependency_order():
+    events: List[str] = []
+    ReleaseOrchestrator(get_builders(events), DEPENDENCIES).apply_charts()
+    for name, required_names in DEPENDENCIES.items():
+        for required_name in required_names:
+            assert events.index(f"end {required_name}") < events.index(f"start {name}")
+
+
+def test_uninstall_in_reverse_order():
+    events: List[str] = []
+    ReleaseOrchestrator(get_builders(events), DEPENDENCIES).uninstall_charts()
+    for name, required_names in DEPENDENCIES.items():
+        for required_name in required_names:
+            assert events.index(f"end {name}") < events.index(f"start {required_name}")
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 2])
+def test_max_concurrency(max_concurrency: int):
+    events: List[str] = []
+    ReleaseOrchestrator(
+        get_builders(events), max_concurrency=max_concurrency
+    ).install_charts()
+    running = 0
+    for event in events:
+        running += 1 if event.startswith("start") else -1
+        assert running <= max_concurrency
+
+
+def test_fail_fast():
+    events: List[str] = []
+    with pytest.raises(ReleaseOrchestrationError) as error:
+        ReleaseOrchestrator(
+            get_builders(events, failing="crds"), DEPENDENCIES, max_concurrency=1
+        ).install_charts()
+    report = error.value.report
+    assert report.failed == ["crds"]
+    assert isinstance(report.results["crds"].error, HelmError)
+    assert report.skipped == ["operator", "database", "app", "monitoring"]
+    assert events == ["start crds", "end crds"]
+
+
+def test_failed_branch_is_skipped():
+    events: List[str] = []
+    with pytest.raises(ReleaseOrchestrationError) as error:
+        ReleaseOrchestrator(
+            get_builders(events, failing="crds"), DEPENDENCIES, fail_fast=False
+        ).install_charts()
+    report = error.value.report
+    assert report.failed == ["crds"]
+    assert report.skipped == ["operator", "app"]
+    assert report.succeeded == ["database", "monitoring"]
+
+
+def test_options_are_copied():
+    events: List[str] = []
+    builders = get_builders(events)
+    options: Dict[str, Optional[str]] = {"wait": None}
+    ReleaseOrchestrator(builders).install_charts(options)
+    for builder in builders:
+        assert builder.options == options and builder.options is not options
+
+
+@pytest.mark.parametrize(
+    "dependencies",
+    [
+        {"operator": ["unknown"]},
+        {"unknown": ["crds"]},
+        {"crds": ["crds"]},
+        {"crds": ["app"], "operator": ["crds"], "app": ["operator"]},
+    ],
+)
+def test_invalid_dependencies(dependencies: dict):
+    with pytest.raises(ValueError):
+        ReleaseOrchestrator(get_builders([]), dependencies)
+
+
+def test_duplicate_release():
+    events: List[str] = []
+    with pytest.raises(ValueError):
+        ReleaseOrchestrator(get_builders(events) + get_builders(events))
@@ -0,0 +1,200 @@
+import json
+from typing import Any, Dict, List
+
+import pytest
+
+from avionix.chart.utils import HelmRelease, get_release_columns, parse_helm_releases
+from avionix.testing import helpers
+from avionix.testing.helpers import (
+    kubectl_get,
+    kubectl_get_resources,
+    parse_kubernetes_resources,
+    parse_output_to_dict,
+)
+
+HELM_LIST_TABLE = (
+    "NAME    \tNAMESPACE\tREVISION\tUPDATED                             \t"
+    "STATUS  \tCHART         \tAPP VERSION\n"
+    "grafana \tdefault  \t2       \t2020-07-12 14:16:17.530935 -0400 EDT\t"
+    "deployed\tgrafana-5.0.0 \t7.0.3      \n"
+    "test    \ttest     \t1       \t2020-07-12 14:18:02.112301 -0400 EDT\t"
+    "failed  \ttest-0.1.0    \t           \n"
+)
+
+HELM_LIST_JSON = json.dumps(
+    [
+        {
+            "name": "grafana",
+            "namespace": "default",
+            "revision": "2",
+            "updated": "2020-07-12 14:16:17.530935 -0400 EDT",
+            "status": "deployed",
+            "chart": "grafana-5.0.0",
+            "app_version": "7.0.3",
+        },
+        {
+            "name": "test",
+            "namespace": "test",
+            "revision": "1",
+            "updated": "2020-07-12 14:18:02.112301 -0400 EDT",
+            "status": "failed",
+            "chart": "test-0.1.0",
+            "app_version": "",
+        },
+    ]
+)
+
+
+def test_parse_table():
+    assert parse_output_to_dict(
+        "NAMESPACE   NAME           READY   STATUS    RESTARTS   AGE\n"
+        "default     grafana-1234   1/1     Running   0          5m\n"
+        "test        app            0/1     Pending   0          10s\n"
+    ) == {
+        "NAMESPACE": ("default", "test"),
+        "NAME": ("grafana-1234", "app"),
+        "READY": ("1/1", "0/1"),
+        "STATUS": ("Running", "Pending"),
+        "RESTARTS": ("0", "0"),
+        "AGE": ("5m", "10s"),
+    }
+
+
+def test_parse_table_with_spaces_in_values():
+    assert parse_output_to_dict(
+        "NAME     ACCESS MODES   MESSAGE\n"
+        "volume   RWO            a  message  with  spaces\n"
+    ) == {
+        "NAME": ("volume",),
+        "ACCESS MODES": ("RWO",),
+        "MESSAGE": ("a  message  with  spaces",),
+    }
+
+
+def test_parse_table_one_column():
+    assert parse_output_to_dict("NAME\nfirst\nsecond\n") == {
+        "NAME": ("first", "second")
+    }
+
+
+def test_parse_table_without_rows():
+    assert parse_output_to_dict("NAME   READY\n") == {}
+    assert parse_output_to_dict("") == {}
+
+
+def test_helm_releases():
+    releases = parse_helm_releases(HELM_LIST_JSON)
+    assert releases == [
+        HelmRelease(
+            "grafana",
+            "default",
+            2,
+            "2020-07-12 14:16:17.530935 -0400 EDT",
+            "deployed",
+            "grafana-5.0.0",
+            "7.0.3",
+        ),
+        HelmRelease(
+            "test",
+            "test",
+            1,
+            "2020-07-12 14:18:02.112301 -0400 EDT",
+            "failed",
+            "test-0.1.0",
+        ),
+    ]
+    assert parse_helm_releases("") == parse_helm_releases("[]") == []
+
+
+def test_release_columns_match_table():
+    assert get_release_columns(
+        parse_helm_releases(HELM_LIST_JSON)
+    ) == parse_output_to_dict(HELM_LIST_TABLE)
+    assert get_release_columns([]) == {}
+
+
+def test_helm_status():
+    release = HelmRelease.from_status_json(
+        {
+            "name": "grafana",
+            "namespace": "default",
+            "version": 2,
+            "info": {
+                "first_deployed": "2020-07-12T14:10:02.112301-04:00",
+                "last_deployed": "2020-07-12T14:16:17.530935-04:00",
+                "status": "deployed",
+            },
+            "chart": {
+                "metadata": {
+                    "name": "grafana",
+                    "version": "5.0.0",
+                    "appVersion": "7.0.3",
+                }
+            },
+            "manifest": "",
+        }
+    )
+    assert release == HelmRelease(
+        "grafana",
+        "default",
+        2,
+        "2020-07-12T14:16:17.530935-04:00",
+        "deployed",
+        "grafana-5.0.0",
+        "7.0.3",
+    )
+
+
+def test_kubernetes_resources():
+    config_map = {
+        "apiVersion": "v1",
+        "kind": "ConfigMap",
+        "metadata": {"name": "config", "namespace": "default"},
+        "data": {"key": "value"},
+    }
+    node = {"apiVersion": "v1", "kind": "Node", "metadata": {"name": "node"}}
+    resources = parse_kubernetes_resources(
+        json.dumps({"apiVersion": "v1", "kind": "List", "items": [config_map, node]})
+    )
+    assert [
+        (resource.kind, resource.name, resource.namespace) for resource in resources
+    ] == [("ConfigMap", "config", "default"), ("Node", "node", None)]
+    assert resources[0].manifest == config_map
+    (resource,) = parse_kubernetes_resources(json.dumps(config_map))
+    assert resource.name == "config"
+
+
+@pytest.fixture
+def kubectl_output(monkeypatch):
+    commands: List[List[str]] = []
+    listing: Dict[str, Any] = {"output": "", "commands": commands}
+
+    def check_output(command, timeout=None):
+        commands.append(command)
+        return listing["output"]
+
+    monkeypatch.setattr(helpers, "custom_check_output", check_output)
+    return listing
+
+
+def test_kubectl_get(kubectl_output):
+    kubectl_output["output"] = (
+        "NAME       READY   STATUS    RESTARTS   AGE\n"
+        "test-pod   1/1     Running   0          5m\n"
+    )
+    assert kubectl_get("pods", namespace="test", wide=True) == {
+        "NAME": ("test-pod",),
+        "READY": ("1/1",),
+        "STATUS": ("Running",),
+        "RESTARTS": ("0",),
+        "AGE": ("5m",),
+    }
+    kubectl_output["output"] = json.dumps(
+        {"apiVersion": "v1", "kind": "Pod", "metadata": {"name": "test-pod"}}
+    )
+    (resource,) = kubectl_get_resources("pods/test-pod")
+    assert resource.name == "test-pod"
+    assert kubectl_output["commands"] == [
+        ["kubectl", "get", "pods", "-n", "test", "-o", "wide"],
+        ["kubectl", "get", "pods/test-pod", "-o", "json"],
+    ]
@@ -0,0 +1,126 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing import get_context
+
+import pytest
+
+from avionix import ChartBuilder, ObjectMeta
+from avionix.kube.core import ConfigMap, Container, Pod, PodSpec
+from avionix.options import DEFAULTS
+from avionix.tests.utils import get_test_deployment
+from avionix.yaml import parallel
+from avionix.yaml.emitters import EMITTERS, get_emitter
+from avionix.yaml.parallel import ParallelSerializer
+from avionix.yaml.yaml_handling import memoized
+
+
+class UnpicklableConfigMap(ConfigMap):
+    def __init__(self, name: str):
+        super().__init__(ObjectMeta(name=name), {"key": "value"})
+        self._callback = lambda: None
+
+
+def get_objects():
+    return [get_test_deployment(i % 3) for i in range(10)] + [
+        ConfigMap(ObjectMeta(name="config"), {"key": "value"})
+    ]
+
+
+@pytest.mark.parametrize("emitter", list(EMITTERS))
+@pytest.mark.parametrize("deduplicate", [True, False])
+def test_text_matches_emitter(emitter: str, deduplicate: bool):
+    objects = get_objects()
+    texts = ParallelSerializer(2, emitter, 3, deduplicate).get_texts(objects)
+    emit = get_emitter(emitter)
+    assert texts == [emit(kube_object.to_dict()) for kube_object in objects]
+
+
+def test_text_from_workers_is_not_memoized():
+    objects = get_objects()
+    with memoized():
+        texts = ParallelSerializer(2).get_texts(objects)
+        for kube_object, text in zip(objects, texts):
+            assert not kube_object._has_text(None)
+            assert str(kube_object) == text
+
+
+def test_memoized_text_is_not_rendered_again():
+    objects = get_objects()
+    with memoized():
+        memoized_text = str(objects[0])
+        texts = ParallelSerializer(2).get_texts(objects)
+        assert texts[0] is memoized_text
+
+
+def test_memoized_text_is_cleared():
+    container = Container("container", image="image")
+    pod = Pod(ObjectMeta(name="pod"), PodSpec([container]))
+    with memoized():
+        ParallelSerializer(2).get_texts([pod])
+        container.image = "other-image"
+        assert "other-image" in str(pod)
+
+
+def test_workers_are_reused():
+    objects = get_objects()
+    with ParallelSerializer(2) as serializer:
+        assert serializer.get_texts(objects) == serializer.get_texts(objects)
+    assert serializer.get_texts(objects[:2]) == [
+        get_emitter()(kube_object.to_dict()) for kube_object in objects[:2]
+    ]
+
+
+def test_unpicklable_objects():
+    objects = get_objects()
+    objects.insert(3, UnpicklableConfigMap("unpicklable"))
+    serializer = ParallelSerializer(2, chunk_size=4)
+    texts = serializer.get_texts(objects)
+    assert serializer.unpicklable == 1
+    assert texts == [get_emitter()(kube_object.to_dict()) for kube_object in objects]
+
+
+def test_report():
+    serializer = ParallelSerializer(2, chunk_size=5)
+    serializer.get_texts([get_test_deployment(1) for _ in range(10)])
+    # The first deployment of each of the two chunks is written
+    assert serializer.report is not None
+    assert serializer.report.reused_blocks == 8
+
+
+def test_invalid_workers():
+    with pytest.raises(ValueError):
+        ParallelSerializer(0)
+    with pytest.raises(ValueError):
+        ParallelSerializer(2, chunk_size=0)
+
+
+def test_chart_generation(chart_info):
+    objects = get_objects()
+    objects.append(UnpicklableConfigMap("unpicklable"))
+
+    def read_files(workers: int):
+        return ChartBuilder(
+            chart_info, objects, workers=workers, chunk_size=2
+        ).generate_chart_files()
+
+    parallel_files = read_files(4)
+    for kube_object in objects:
+        kube_object.invalidate()
+    assert parallel_files == read_files(1)
+
+
+def test_default_emitter_is_sent_to_workers(monkeypatch):
+    # Spawned workers start from a fresh interpreter, with the default DEFAULTS
+    monkeypatch.setattr(
+        parallel,
+        "ProcessPoolExecutor",
+        partial(ProcessPoolExecutor, mp_context=get_context("spawn")),
+    )
+    monkeypatch.setitem(DEFAULTS, "emitter", "json")
+    objects = get_objects()
+    serializer = ParallelSerializer(2, deduplicate=False)
+    monkeypatch.setitem(DEFAULTS, "emitter", "pyyaml")
+    emit = get_emitter("json")
+    assert serializer.get_texts(objects) == [
+        emit(kube_object.to_dict()) for kube_object in objects
+    ]
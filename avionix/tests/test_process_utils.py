@@ -0,0 +1,166 @@
+import asyncio
+import os
+from pathlib import Path
+from subprocess import CalledProcessError, TimeoutExpired
+import sys
+import time
+
+import pytest
+
+from avionix._process_utils import (
+    MAX_ERROR_OUTPUT,
+    custom_check_output,
+    custom_check_output_async,
+)
+
+
+def test_output_matches():
+    command = f"{sys.executable} --version"
+    assert asyncio.run(custom_check_output_async(command)) == custom_check_output(
+        command
+    )
+
+
+def test_failure_raises_called_process_error(tmp_path):
+    command = f"{sys.executable} {tmp_path / 'missing.py'}"
+    with pytest.raises(CalledProcessError) as async_error:
+        asyncio.run(custom_check_output_async(command))
+    with pytest.raises(CalledProcessError) as error:
+        custom_check_output(command)
+    assert async_error.value.returncode == error.value.returncode
+    # Errors are written to stderr, which follows stdout in the output
+    assert async_error.value.output == error.value.output
+    assert b"missing.py" in async_error.value.output
+
+
+def test_commands_run_concurrently(tmp_path):
+    script = tmp_path / "sleep.py"
+    script.write_text("import time\ntime.sleep(0.5)\n")
+    command = f"{sys.executable} {script}"
+
+    async def run_all():
+        return await asyncio.gather(
+            *(custom_check_output_async(command) for _ in range(10))
+        )
+
+    started = time.perf_counter()
+    asyncio.run(run_all())
+    assert time.perf_counter() - started < 5 * 0.5
+
+
+def test_arguments_are_not_split():
+    command = [sys.executable, "-c", "import sys; print(sys.argv[1])", "a b"]
+    assert custom_check_output(command) == "a b\n"
+    assert asyncio.run(custom_check_output_async(command)) == "a b\n"
+
+
+def test_stderr_is_not_part_of_output():
+    command = [
+        sys.executable,
+        "-c",
+        "import sys; sys.stderr.write('warning'); print('{}')",
+    ]
+    assert custom_check_output(command) == "{}\n"
+    assert asyncio.run(custom_check_output_async(command)) == "{}\n"
+
+
+def test_error_output_is_bounded():
+    size = 4 * MAX_ERROR_OUTPUT
+    command = [
+        sys.executable,
+        "-c",
+        f"import sys; print('x' * {size}); sys.stderr.write('y' * {size} + 'end'); "
+        "sys.exit(1)",
+    ]
+    for run in (
+        custom_check_output,
+        lambda c: asyncio.run(custom_check_output_async(c)),
+    ):
+        with pytest.raises(CalledProcessError) as error:
+            run(command)
+        assert len(error.value.stderr) < MAX_ERROR_OUTPUT + 100
+        assert error.value.stderr.endswith(b"yend")
+        # The output isn't bounded by default
+        assert error.value.output.startswith(b"x" * size)
+    output = custom_check_output(
+        [sys.executable, "-c", f"print('x' * {size}, end='z')"], max_output=10
+    )
+    assert output.endswith("\n" + "x" * 9 + "z")
+
+
+def test_timeout_kills_command():
+    command = [
+        sys.executable,
+        "-c",
+        "import time; print('started', flush=True); time.sleep(60)",
+    ]
+    started = time.perf_counter()
+    with pytest.raises(TimeoutExpired) as error:
+        custom_check_output(command, timeout=0.5)
+    assert error.value.output == b"started\n"
+    with pytest.raises(TimeoutExpired):
+        asyncio.run(custom_check_output_async(command, timeout=0.5))
+    assert time.perf_counter() - started < 5
+
+
+def test_cancelled_command_is_killed(tmp_path):
+    pid_file = tmp_path / "pid"
+    command = [
+        sys.executable,
+        "-c",
+        f"import os, time; open({str(pid_file)!r}, 'w').write(str(os.getpid())); "
+        "time.sleep(60)",
+    ]
+
+    async def cancel():
+        task = asyncio.ensure_future(custom_check_output_async(command))
+        while not pid_file.exists() or not pid_file.read_text():
+            await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel())
+    with pytest.raises(ProcessLookupError):
+        os.kill(int(pid_file.read_text()), 0)
+
+
+def is_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # A killed process whose parent exited is left a zombie until it is reaped
+    stat = Path(f"/proc/{pid}/stat")
+    return not stat.exists() or stat.read_text().rsplit(")", 1)[1].split()[0] != "Z"
+
+
+def has_exited(pid: int) -> bool:
+    # A killed process closes its files just before it exits
+    deadline = time.monotonic() + 1
+    while is_running(pid) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return not is_running(pid)
+
+
+def test_timeout_with_output_held_open(tmp_path):
+    # The command starts a process that keeps its output open, which is killed with
+    # the command
+    pid_file = tmp_path / "pid"
+    command = [
+        sys.executable,
+        "-c",
+        "import subprocess, sys, time; "
+        "child = subprocess.Popen([sys.executable, '-c', 'import time; "
+        "time.sleep(5)']); "
+        f"open({str(pid_file)!r}, 'w').write(str(child.pid)); "
+        "time.sleep(60)",
+    ]
+    started = time.perf_counter()
+    with pytest.raises(TimeoutExpired):
+        custom_check_output(command, timeout=0.5)
+    assert has_exited(int(pid_file.read_text()))
+    with pytest.raises(TimeoutExpired):
+        asyncio.run(custom_check_output_async(command, timeout=0.5))
+    assert has_exited(int(pid_file.read_text()))
+    assert time.perf_counter() - started < 4
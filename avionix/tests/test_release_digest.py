@@ -0,0 +1,206 @@
+import asyncio
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+import yaml
+
+from avionix import ChartBuilder, ObjectMeta
+from avionix.chart import chart_builder
+from avionix.chart.release_digest import DIGEST_ANNOTATION, get_chart_digest
+from avionix.chart.utils import HelmRelease
+from avionix.kube.core import ConfigMap
+from avionix.tests.test_release_state import FakeReleaseStateCache
+
+
+@pytest.fixture
+def chart(tmp_path: Path):
+    chart = tmp_path / "chart"
+    (chart / "templates").mkdir(parents=True)
+    (chart / "Chart.yaml").write_text("name: chart\n")
+    (chart / "templates" / "ConfigMap-0.yaml").write_text("kind: ConfigMap\n")
+    return chart
+
+
+def test_chart_digest(chart: Path, tmp_path: Path):
+    digest = get_chart_digest(chart)
+    assert digest.startswith("sha256:")
+    (chart / "Chart.lock").write_text("generated: now\n")
+    assert get_chart_digest(chart) == digest
+    (chart / "templates" / "ConfigMap-0.yaml").write_text("kind: Secret\n")
+    assert get_chart_digest(chart) != digest
+
+
+def test_chart_digest_options(chart: Path, tmp_path: Path):
+    values = tmp_path / "values.yaml"
+    values.write_text("replicas: 1\n")
+    digest = get_chart_digest(chart, {"f": str(values)})
+    assert get_chart_digest(chart) != digest
+    assert get_chart_digest(chart, {"f": str(values), "atomic": None}) != digest
+    values.write_text("replicas: 2\n")
+    assert get_chart_digest(chart, {"f": str(values)}) != digest
+
+
+def test_helm_status_digest():
+    release = HelmRelease.from_status_json(
+        {
+            "name": "grafana",
+            "namespace": "default",
+            "version": 2,
+            "info": {"status": "deployed"},
+            "chart": {
+                "metadata": {
+                    "name": "grafana",
+                    "version": "5.0.0",
+                    "annotations": {DIGEST_ANNOTATION: "sha256:0"},
+                }
+            },
+        }
+    )
+    assert release.digest == "sha256:0"
+
+
+@pytest.fixture
+def commands(monkeypatch):
+    commands: List[List[str]] = []
+
+    def check_output(command: List[str], timeout: Optional[float] = None):
+        commands.append(command)
+        return ""
+
+    async def check_output_async(command: List[str], timeout: Optional[float] = None):
+        return check_output(command)
+
+    monkeypatch.setattr(chart_builder, "custom_check_output", check_output)
+    monkeypatch.setattr(chart_builder, "custom_check_output_async", check_output_async)
+    return commands
+
+
+def get_builder(
+    chart_info,
+    config_map,
+    release_state: FakeReleaseStateCache,
+    tmp_path: Path,
+    **options,
+):
+    return ChartBuilder(
+        chart_info,
+        [config_map],
+        output_directory=str(tmp_path),
+        release_state=release_state,
+        skip_unchanged=True,
+        **options,
+    )
+
+
+def test_unchanged_upgrade_is_skipped(
+    chart_info, config_map, commands: List[List[str]], tmp_path: Path
+):
+    release_state = FakeReleaseStateCache([HelmRelease(chart_info.name, "default")])
+    builder = get_builder(chart_info, config_map, release_state, tmp_path)
+    builder.upgrade_chart()
+    assert len(commands) == 1
+    chart_yaml = yaml.safe_load((builder.chart_folder_path / "Chart.yaml").read_text())
+    digest = chart_yaml["annotations"][DIGEST_ANNOTATION]
+    release = release_state.get_release(chart_info.name)
+    assert release is not None and release.digest == digest
+
+    get_builder(chart_info, config_map, release_state, tmp_path).upgrade_chart()
+    assert len(commands) == 1
+    # Other options can change the release
+    builder.upgrade_chart({"set": "replicas=2"})
+    assert len(commands) == 2
+
+
+def test_changed_upgrade_is_not_skipped(
+    chart_info, config_map, commands: List[List[str]], tmp_path: Path
+):
+    release_state = FakeReleaseStateCache([HelmRelease(chart_info.name, "default")])
+    get_builder(chart_info, config_map, release_state, tmp_path).upgrade_chart()
+    changed_config_map = ConfigMap(
+        ObjectMeta(name="test-config-map"), data={"my_test_value": "no"}
+    )
+    get_builder(chart_info, changed_config_map, release_state, tmp_path).upgrade_chart()
+    assert len(commands) == 2
+
+
+def test_unchanged_incremental_rebuild_leaves_chart_yaml_alone(
+    chart_info, config_map, commands: List[List[str]], tmp_path: Path
+):
+    release_state = FakeReleaseStateCache([HelmRelease(chart_info.name, "default")])
+    builder = get_builder(
+        chart_info, config_map, release_state, tmp_path, incremental=True
+    )
+    builder.upgrade_chart()
+    chart_yaml = builder.chart_folder_path / "Chart.yaml"
+    modification_time = chart_yaml.stat().st_mtime_ns
+    builder = get_builder(
+        chart_info, config_map, release_state, tmp_path, incremental=True
+    )
+    builder.upgrade_chart()
+    assert len(commands) == 1
+    assert chart_yaml.stat().st_mtime_ns == modification_time
+    assert builder.regeneration_report is not None
+    assert "Chart.yaml" in builder.regeneration_report.unchanged
+    changed_config_map = ConfigMap(
+        ObjectMeta(name="test-config-map"), data={"my_test_value": "no"}
+    )
+    builder = get_builder(
+        chart_info, changed_config_map, release_state, tmp_path, incremental=True
+    )
+    builder.upgrade_chart()
+    assert len(commands) == 2
+    assert builder.regeneration_report is not None
+    assert "Chart.yaml" in builder.regeneration_report.changed
+
+
+def test_upgrade_of_failed_release_is_not_skipped(
+    chart_info, config_map, commands: List[List[str]], tmp_path: Path
+):
+    builder = get_builder(chart_info, config_map, FakeReleaseStateCache([]), tmp_path)
+    builder.generate_chart()
+    digest = get_chart_digest(builder.chart_folder_path)
+    builder.release_state = FakeReleaseStateCache(
+        [HelmRelease(chart_info.name, "default", status="failed", digest=digest)]
+    )
+    asyncio.run(builder.upgrade_chart_async())
+    assert len(commands) == 1
+
+
+def test_installed_release_digest(
+    chart_info, config_map, commands: List[List[str]], tmp_path: Path
+):
+    release_state = FakeReleaseStateCache([])
+    get_builder(chart_info, config_map, release_state, tmp_path).install_chart()
+    asyncio.run(
+        get_builder(
+            chart_info, config_map, release_state, tmp_path
+        ).upgrade_chart_async()
+    )
+    assert len(commands) == 1
+    assert commands[0][:2] == ["helm", "install"]
+
+
+@pytest.mark.parametrize("mode", ["atomic", "incremental"])
+def test_digest_is_written_by_chart_writer(
+    chart_info, config_map, commands: List[List[str]], tmp_path: Path, mode: str
+):
+    release_state = FakeReleaseStateCache([HelmRelease(chart_info.name, "default")])
+    builder = get_builder(
+        chart_info, config_map, release_state, tmp_path, **{mode: True}
+    )
+    builder.upgrade_chart()
+    chart_yaml = builder.chart_folder_path / "Chart.yaml"
+    assert DIGEST_ANNOTATION in yaml.safe_load(chart_yaml.read_text())["annotations"]
+    # The file written in its place is renamed over it, without leaving files behind
+    assert sorted(path.name for path in builder.chart_folder_path.iterdir()) == [
+        "Chart.yaml",
+        "templates",
+        "values.yaml",
+    ]
+    (tmp_path / "expected").touch()
+    assert chart_yaml.stat().st_mode == (tmp_path / "expected").stat().st_mode
+    get_builder(
+        chart_info, config_map, release_state, tmp_path, **{mode: True}
+    ).upgrade_chart()
+    assert len(commands) == 1
@@ -0,0 +1,165 @@
+import asyncio
+from subprocess import CalledProcessError
+from typing import List, Optional
+
+from avionix import ChartBuilder
+from avionix.chart import utils
+from avionix.chart.release_state import ReleaseStateCache
+from avionix.chart.utils import HelmRelease
+
+
+class FakeReleaseStateCache(ReleaseStateCache):
+    """
+    Looks up the given releases instead of running helm, counting how often helm
+    would have run. Releases without a namespace are looked up in the default
+    namespace, as for a kubernetes context without a namespace
+    """
+
+    def __init__(self, releases: List[HelmRelease], ttl: float = 10.0):
+        super().__init__(ttl)
+        self.releases = releases
+        self.lookup_count = 0
+        self.list_count = 0
+        self.looked_up_namespaces: List[Optional[str]] = []
+
+    def _find_release(
+        self, name: str, namespace: Optional[str]
+    ) -> Optional[HelmRelease]:
+        self.lookup_count += 1
+        self.looked_up_namespaces.append(namespace)
+        for release in self.releases:
+            if (release.name, release.namespace) == (name, namespace or "default"):
+                return release
+        return None
+
+    async def _find_release_async(
+        self, name: str, namespace: Optional[str]
+    ) -> Optional[HelmRelease]:
+        await asyncio.sleep(0.01)
+        return self._find_release(name, namespace)
+
+    def _list_releases(self) -> List[HelmRelease]:
+        self.list_count += 1
+        return self.releases
+
+
+def test_releases_are_looked_up_once():
+    cache = FakeReleaseStateCache(
+        [HelmRelease("app", "default"), HelmRelease("database", "storage")]
+    )
+    assert cache.is_installed("app")
+    assert cache.is_installed("app", "default")
+    assert cache.is_installed("database", "storage")
+    assert not cache.is_installed("database")
+    assert not cache.is_installed("database")
+    assert cache.get_release("app") == HelmRelease("app", "default")
+    assert cache.lookup_count == 4
+
+
+def test_context_namespace_is_left_to_helm(monkeypatch):
+    monkeypatch.setenv("HELM_NAMESPACE", "storage")
+    cache = FakeReleaseStateCache([HelmRelease("database", "default")])
+    assert cache.is_installed("database")
+    assert not cache.is_installed("database", "storage")
+    assert cache.looked_up_namespaces == [None, "storage"]
+
+
+def test_ttl():
+    cache = FakeReleaseStateCache([], ttl=0)
+    cache.is_installed("app")
+    cache.releases = [HelmRelease("app", "default")]
+    assert cache.is_installed("app")
+    assert cache.lookup_count == 2
+
+
+def test_invalidate():
+    cache = FakeReleaseStateCache([])
+    assert not cache.is_installed("app")
+    assert not cache.is_installed("database")
+    cache.releases = [HelmRelease("app", "default"), HelmRelease("database", "default")]
+    assert not cache.is_installed("app")
+    cache.invalidate("app")
+    assert cache.is_installed("app")
+    assert not cache.is_installed("database")
+    cache.invalidate()
+    assert cache.is_installed("database")
+    assert cache.lookup_count == 4
+
+
+def test_load_more_than_256_releases():
+    releases = [HelmRelease(f"release-{i}", f"namespace-{i % 3}") for i in range(1000)]
+    cache = FakeReleaseStateCache(releases)
+    cache.load()
+    assert all(
+        cache.is_installed(release.name, release.namespace) for release in releases
+    )
+    assert not cache.is_installed("release-1000", "namespace-1")
+    assert cache.list_count == 1
+    assert cache.lookup_count == 0
+    # Which namespace releases without one are in isn't listed
+    assert not cache.is_installed("release-0")
+    assert cache.lookup_count == 1
+    # An invalidated release is looked up again rather than taken as missing
+    cache.releases = releases + [HelmRelease("release-1000", "namespace-1")]
+    cache.invalidate("release-1000", "namespace-1")
+    assert cache.is_installed("release-1000", "namespace-1")
+    assert cache.lookup_count == 2
+
+
+def test_load_skips_uninstalled_releases():
+    cache = FakeReleaseStateCache([HelmRelease("app", "default", status="uninstalled")])
+    cache.load()
+    assert not cache.is_installed("app", "default")
+
+
+def test_local_updates():
+    cache = FakeReleaseStateCache([HelmRelease("app", "default")])
+    assert cache.is_installed("app")
+    cache.set_uninstalled("app")
+    assert not cache.is_installed("app")
+    cache.set_installed("database", "storage")
+    assert cache.get_release("database", "storage") == HelmRelease(
+        "database", "storage"
+    )
+    cache.set_installed("database", "storage")
+    release = cache.get_release("database", "storage")
+    assert release is not None and release.revision == 2
+    assert cache.lookup_count == 1
+
+
+def test_concurrent_lookups_share_helm_command():
+    cache = FakeReleaseStateCache([HelmRelease("app", "default")])
+
+    async def check_installed():
+        return await asyncio.gather(
+            *(cache.is_installed_async(name) for name in ("app", "other", "app"))
+        )
+
+    assert asyncio.run(check_installed()) == [True, False, True]
+    assert cache.lookup_count == 2
+
+
+def test_chart_builders_share_release_state(chart_info, config_map):
+    cache = FakeReleaseStateCache([HelmRelease(chart_info.name, "test")])
+    builders = [
+        ChartBuilder(chart_info, [config_map], namespace=namespace, release_state=cache)
+        for namespace in ("test", "test", None)
+    ]
+    assert builders[0].is_installed
+    assert asyncio.run(builders[1].is_installed_async())
+    assert not builders[2].is_installed
+    assert cache.lookup_count == 2
+
+
+def test_chart_builder_without_namespace(chart_info, config_map, monkeypatch):
+    commands = []
+
+    def check_output(command, timeout=None):
+        commands.append(command)
+        raise CalledProcessError(1, command, b"Error: release: not found")
+
+    monkeypatch.setattr(utils, "custom_check_output", check_output)
+    builder = ChartBuilder(chart_info, [config_map], release_state=ReleaseStateCache())
+    assert not builder.is_installed
+    # helm looks the release up in the namespace of the kubernetes context
+    assert commands == [["helm", "status", chart_info.name, "-o", "json"]]
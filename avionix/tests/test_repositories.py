@@ -0,0 +1,163 @@
+import asyncio
+from pathlib import Path
+from subprocess import CalledProcessError
+from typing import List, Optional
+
+import pytest
+import yaml
+
+from avionix import ChartDependency
+from avionix.chart import chart_dependency, repositories
+from avionix.chart.repositories import HelmRepositoryCache, get_repository_config
+
+STABLE = "https://charts.helm.sh/stable"
+BITNAMI = "https://charts.bitnami.com/bitnami"
+
+
+@pytest.fixture
+def config(tmp_path: Path):
+    config = tmp_path / "helm" / "repositories.yaml"
+    config.parent.mkdir()
+    config.write_text(
+        yaml.safe_dump(
+            {
+                "apiVersion": "",
+                "repositories": [{"name": "stable", "url": STABLE, "username": "user"}],
+            }
+        )
+    )
+    return config
+
+
+@pytest.fixture
+def commands(monkeypatch):
+    """
+    Records the helm commands run instead of running them, adding repositories to
+    the repository config as helm repo add does
+    """
+    commands: List[List[str]] = []
+
+    def check_output(command: List[str], timeout: Optional[float] = None):
+        commands.append(command)
+        name, url = command[3:5]
+        config = Path(command[command.index("--repository-config") + 1])
+        content = yaml.safe_load(config.read_text())
+        content["repositories"] = [
+            entry for entry in content["repositories"] if entry["name"] != name
+        ] + [{"name": name, "url": url}]
+        config.write_text(yaml.safe_dump(content))
+        return ""
+
+    async def check_output_async(command: List[str], timeout: Optional[float] = None):
+        return check_output(command)
+
+    monkeypatch.setattr(repositories, "custom_check_output", check_output)
+    monkeypatch.setattr(repositories, "custom_check_output_async", check_output_async)
+    return commands
+
+
+def test_repository_config_location(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv("HELM_REPOSITORY_CONFIG", str(tmp_path / "repositories.yaml"))
+    assert get_repository_config() == tmp_path / "repositories.yaml"
+    monkeypatch.delenv("HELM_REPOSITORY_CONFIG")
+    monkeypatch.setenv("HELM_CONFIG_HOME", str(tmp_path))
+    assert get_repository_config() == tmp_path / "repositories.yaml"
+
+
+def test_get_repositories(config: Path, tmp_path: Path):
+    cache = HelmRepositoryCache(tmp_path / "cache")
+    assert cache.get_repositories(config) == {"stable": STABLE}
+    assert cache.get_repositories(tmp_path / "missing.yaml") == {}
+
+
+def test_repositories_are_cached_on_disk(config: Path, tmp_path: Path, monkeypatch):
+    HelmRepositoryCache(tmp_path / "cache").get_repositories(config)
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+
+    def read_config(config: Path):
+        raise AssertionError("The config should be read from the cache")
+
+    monkeypatch.setattr(repositories, "_read_config", read_config)
+    assert HelmRepositoryCache(tmp_path / "cache").get_repositories(config) == {
+        "stable": STABLE
+    }
+
+
+def test_cache_is_refreshed_when_config_changes(config: Path, tmp_path: Path):
+    cache = HelmRepositoryCache(tmp_path / "cache")
+    cache.get_repositories(config)
+    config.write_text(
+        yaml.safe_dump({"repositories": [{"name": "bitnami", "url": BITNAMI}]})
+    )
+    assert cache.get_repositories(config) == {"bitnami": BITNAMI}
+    assert HelmRepositoryCache(tmp_path / "cache").get_repositories(config) == {
+        "bitnami": BITNAMI
+    }
+
+
+def test_add_repositories(config: Path, tmp_path: Path, commands: List[List[str]]):
+    cache = HelmRepositoryCache(tmp_path / "cache")
+    added = cache.add_repositories(
+        {"stable": STABLE, "bitnami": BITNAMI, "other": "https://example.com"}, config
+    )
+    assert added == ["bitnami", "other"]
+    config_argument = ["--repository-config", str(config.resolve())]
+    assert commands == [
+        ["helm", "repo", "add", "bitnami", BITNAMI] + config_argument,
+        ["helm", "repo", "add", "other", "https://example.com"] + config_argument,
+    ]
+    assert cache.get_repositories(config) == {
+        "stable": STABLE,
+        "bitnami": BITNAMI,
+        "other": "https://example.com",
+    }
+    assert cache.add_repositories({"stable": STABLE, "bitnami": BITNAMI}, config) == []
+    assert len(commands) == 2
+
+
+def test_add_repositories_async(
+    config: Path, tmp_path: Path, commands: List[List[str]]
+):
+    cache = HelmRepositoryCache(tmp_path / "cache")
+    assert asyncio.run(
+        cache.add_repositories_async({"bitnami": BITNAMI, "other": STABLE}, config)
+    ) == ["bitnami", "other"]
+    assert len(commands) == 2
+    assert cache.get_repositories(config)["bitnami"] == BITNAMI
+
+
+def test_repository_url_is_replaced(
+    config: Path, tmp_path: Path, commands: List[List[str]]
+):
+    cache = HelmRepositoryCache(tmp_path / "cache")
+    assert cache.add_repositories({"stable": BITNAMI}, config) == ["stable"]
+    assert commands[0][-1] == "--force-update"
+    assert cache.get_repositories(config) == {"stable": BITNAMI}
+
+
+def test_failed_add_is_raised(config: Path, tmp_path: Path, monkeypatch):
+    def check_output(command: List[str], timeout: Optional[float] = None):
+        raise CalledProcessError(1, command, b"Error: looks like it is not valid")
+
+    monkeypatch.setattr(repositories, "custom_check_output", check_output)
+    cache = HelmRepositoryCache(tmp_path / "cache")
+    with pytest.raises(CalledProcessError):
+        cache.add_repositories({"bitnami": BITNAMI}, config)
+    assert cache.get_repositories(config) == {"stable": STABLE}
+
+
+def test_deprecated_add_repo(
+    config: Path, tmp_path: Path, commands: List[List[str]], monkeypatch
+):
+    monkeypatch.setenv("HELM_REPOSITORY_CONFIG", str(config))
+    cache = HelmRepositoryCache(tmp_path / "cache")
+    monkeypatch.setattr(chart_dependency, "SHARED_REPOSITORY_CACHE", cache)
+    dependency = ChartDependency("chart", "1.0.0", BITNAMI, "bitnami")
+    with pytest.warns(DeprecationWarning):
+        dependency.add_repo()
+    with pytest.warns(DeprecationWarning):
+        asyncio.run(dependency.add_repo_async())
+    assert [command[:5] for command in commands] == [
+        ["helm", "repo", "add", "bitnami", BITNAMI]
+    ]
+    assert cache.get_repositories(config)["bitnami"] == BITNAMI
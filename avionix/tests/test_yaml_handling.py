@@ -0,0 +1,276 @@
+import copy
+import importlib
+import inspect
+import pickle
+import pkgutil
+import tracemalloc
+
+import pytest
+
+import avionix.kube
+from avionix.kube.core import Container, ContainerPort, EnvVar
+from avionix.tests.utils import get_test_deployment
+from avionix.yaml.yaml_handling import HelmYaml, _get_plan, memoized
+
+
+class Simple(HelmYaml):
+    def __init__(self, value, nested=None):
+        self.value = value
+        self.nested = nested
+        self._private = "hidden"
+
+
+class UpperCase(HelmYaml):
+    def __init__(self, value: str):
+        self.value = value
+
+    def to_dict(self):
+        return {"value": self.value.upper()}
+
+
+def test_to_dict_cleaning():
+    simple = Simple(
+        0,
+        {
+            "kept": [False, "", "a"],
+            "_private_key": "hidden",
+            "empty_list": [None, {}, []],
+            "empty_object": Simple(None),
+            "zero": 0,
+        },
+    )
+    assert simple.to_dict() == {"nested": {"kept": [False, "", "a"]}}
+
+
+def test_to_dict_uses_overridden_to_dict():
+    simple = Simple([UpperCase("a"), Simple(UpperCase("b"))])
+    assert simple.to_dict() == {"value": [{"value": "A"}, {"value": {"value": "B"}}]}
+
+
+def test_to_dict_detached_from_object():
+    labels = {"type": "master"}
+    simple = Simple(labels)
+    simple.to_dict()["value"]["type"] = "worker"
+    assert labels == {"type": "master"}
+
+
+def test_plan_reused_across_instances():
+    container = Container("test", image="image", env=[EnvVar("a", "b")])
+    other_container = Container("other", image="image", env=[EnvVar("c", "d")])
+    assert other_container.to_dict() == {
+        "env": [{"name": "c", "value": "d"}],
+        "image": "image",
+        "name": "other",
+    }
+    assert _get_plan(Container) is _get_plan(type(container))
+
+    # Attributes added after construction are still picked up
+    container.ports = [ContainerPort(80)]
+    assert container.to_dict()["ports"] == [{"containerPort": 80}]
+
+
+def _peak_to_dict_memory(helm_yaml: HelmYaml):
+    tracemalloc.start()
+    helm_yaml.to_dict()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def _nested_simple(depth: int):
+    simple = Simple("leaf")
+    for _ in range(depth):
+        simple = Simple("value", [simple, {"labels": {"a": "b"}}])
+    return simple
+
+
+@pytest.mark.parametrize(
+    "get_object",
+    [
+        lambda size: Simple([get_test_deployment(i) for i in range(size)]),
+        _nested_simple,
+    ],
+)
+def test_to_dict_peak_memory_is_linear(get_object):
+    small = _peak_to_dict_memory(get_object(100))
+    large = _peak_to_dict_memory(get_object(200))
+    # Doubling the number of objects or the depth should double peak memory, a
+    # quadratic traversal would instead quadruple it
+    assert large < 2.5 * small
+
+
+def test_memoized_output_is_released_after_block():
+    deployments = [get_test_deployment(i) for i in range(200)]
+    # The first block attaches the empty memos that later blocks reuse
+    with memoized():
+        for deployment in deployments:
+            str(deployment)
+    tracemalloc.start()
+    try:
+        with memoized():
+            for deployment in deployments:
+                str(deployment)
+            held = tracemalloc.get_traced_memory()[0]
+        released = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert released < held / 20
+
+
+def test_output_memoized():
+    deployment = get_test_deployment(1)
+    with memoized():
+        assert str(deployment) is str(deployment)
+
+        dictionary = deployment.to_dict()
+        dictionary["spec"]["replicas"] = 5
+        assert deployment.to_dict()["spec"]["replicas"] == 1
+
+
+def test_output_not_memoized_outside_memoized_blocks():
+    deployment = get_test_deployment(1)
+    container = deployment.spec.template.spec.containers[0]
+    str(deployment)
+    container.env.append(EnvVar("added", "value"))
+    assert "name: added" in str(deployment)
+    deployment.metadata.labels["added"] = "label"
+    assert deployment.to_dict()["metadata"]["labels"]["added"] == "label"
+
+
+def test_memoized_blocks_start_from_current_objects():
+    simple = Simple(["a"])
+    with memoized():
+        assert simple.to_dict() == {"value": ["a"]}
+        with memoized():
+            assert str(simple) is str(simple)
+    simple.value.append("b")
+    with memoized():
+        assert simple.to_dict() == {"value": ["a", "b"]}
+
+
+def test_nested_change_clears_memoized_output():
+    deployment = get_test_deployment(1)
+    container = deployment.spec.template.spec.containers[0]
+    with memoized():
+        str(deployment)
+
+        container.image = "new-image"
+        assert "image: new-image" in str(deployment)
+
+        container["name"] = "new-name"
+        assert "name: new-name" in str(deployment)
+
+        del container.image
+        assert "image:" not in str(deployment)
+
+
+def test_shared_child_change_clears_all_parents():
+    env_var = EnvVar("name", "value")
+    first = Simple([env_var])
+    second = Simple({"env": env_var})
+    with memoized():
+        assert first.to_dict() == {"value": [{"name": "name", "value": "value"}]}
+        assert second.to_dict() == {
+            "value": {"env": {"name": "name", "value": "value"}}
+        }
+
+        env_var.value = "new-value"
+        assert first.to_dict() == {"value": [{"name": "name", "value": "new-value"}]}
+        assert second.to_dict() == {
+            "value": {"env": {"name": "name", "value": "new-value"}}
+        }
+
+
+def test_overridden_to_dict_change_clears_parents():
+    upper_case = UpperCase("a")
+    simple = Simple(upper_case)
+    with memoized():
+        assert simple.to_dict() == {"value": {"value": "A"}}
+        upper_case.value = "b"
+        assert simple.to_dict() == {"value": {"value": "B"}}
+
+
+def test_invalidate_after_in_place_change():
+    simple = Simple(["a"])
+    with memoized():
+        assert simple.to_dict() == {"value": ["a"]}
+        simple.value.append("b")
+        simple.invalidate()
+        assert simple.to_dict() == {"value": ["a", "b"]}
+
+
+def test_copies_do_not_share_memoized_output():
+    deployment = get_test_deployment(1)
+    with memoized():
+        text = str(deployment)
+        deployment_copy = copy.deepcopy(deployment)
+        assert str(pickle.loads(pickle.dumps(deployment))) == text
+        deployment_copy.metadata.name = "copy"
+        assert str(deployment) == text
+        assert "name: copy" in str(deployment_copy)
+
+
+def get_kube_classes():
+    for module_info in pkgutil.iter_modules(avionix.kube.__path__):
+        module = importlib.import_module(f"avionix.kube.{module_info.name}")
+        for _, kube_class in inspect.getmembers(module, inspect.isclass):
+            if issubclass(kube_class, HelmYaml) and kube_class is not HelmYaml:
+                yield kube_class
+
+
+def test_kube_objects_have_no_dict():
+    for kube_class in get_kube_classes():
+        # Keys such as x-kubernetes-preserve-unknown-fields are not valid slot names
+        if "__dict__" in kube_class.__slots__:
+            continue
+        assert kube_class.__dictoffset__ == 0, kube_class
+
+
+def test_undeclared_attributes_are_output():
+    container = Container("name", image="image")
+    container.customField = 1
+    container["otherField"] = {"key": "value"}
+    assert container.customField == 1
+    assert container.to_dict() == {
+        "name": "name",
+        "image": "image",
+        "customField": 1,
+        "otherField": {"key": "value"},
+    }
+    loaded = pickle.loads(pickle.dumps(container))
+    assert loaded.to_dict() == container.to_dict()
+    container_copy = copy.copy(container)
+    container_copy.customField = 2
+    assert container.customField == 1
+    del container.customField
+    assert "customField" not in container.to_dict()
+    with pytest.raises(AttributeError):
+        container.customField
+
+
+class ExtendedContainer(Container):
+    def __init__(self, name: str, extra: str):
+        super().__init__(name, image="image")
+        self.extra = extra
+        self._hidden = "hidden"
+
+
+def test_subclass_without_slots_outputs_all_attributes():
+    container = ExtendedContainer("name", "extra")
+    assert container.to_dict() == {"name": "name", "image": "image", "extra": "extra"}
+    container.extra = "changed"
+    assert container.to_dict()["extra"] == "changed"
+
+
+@pytest.mark.parametrize("protocol", range(pickle.HIGHEST_PROTOCOL + 1))
+def test_pickle_slots(protocol: int):
+    deployment = get_test_deployment(1)
+    text = str(deployment)
+    loaded = pickle.loads(pickle.dumps(deployment, protocol))
+    assert str(loaded) == text
+    loaded.metadata.name = "loaded"
+    assert "name: loaded" in str(loaded)
+    assert str(deployment) == text
+
+    container = pickle.loads(pickle.dumps(ExtendedContainer("a", "b"), protocol))
+    assert container.to_dict() == ExtendedContainer("a", "b").to_dict()
@@ -0,0 +1,231 @@
+"""
+Hash consing of the output of :class:`~avionix.yaml.yaml_handling.HelmYaml` objects
+
+Containers, probes, lists of environment variables and other blocks are often
+repeated across the workloads of a chart. Every mapping and list in the output of
+the templates of a chart is given a content key, so that blocks which are
+structurally identical share the same key. Each block that appears more than once
+is then written once for each position it appears at and the text is spliced into
+every other template that contains it
+"""
+
+from operator import itemgetter
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from avionix.options import DEFAULTS
+from avionix.yaml.emitters import (
+    _SCALAR_TYPES,
+    EMITTERS,
+    _FastYamlWriter,
+    _UnsupportedData,
+    get_emitter,
+)
+from avionix.yaml.yaml_handling import HelmYaml, _get_plan
+
+# The emitters whose output is the text of yaml.dump, which the deduplicating writer
+# reproduces
+_YAML_EMITTERS = frozenset(name for name in EMITTERS if name != "json")
+
+
+class DeduplicationReport:
+    """
+    The work saved by writing repeated blocks of the templates of a chart once
+
+    :param repeated_blocks: The number of distinct blocks that appear more than once
+    :param reused_blocks: The number of times text written for a block was reused
+    :param bytes_saved: The size of the reused text in bytes
+    :param seconds_saved: The time originally taken to write the reused text
+    :param seconds_hashing: The time taken to find the repeated blocks
+    """
+
+    def __init__(
+        self,
+        repeated_blocks: int = 0,
+        reused_blocks: int = 0,
+        bytes_saved: int = 0,
+        seconds_saved: float = 0.0,
+        seconds_hashing: float = 0.0,
+    ):
+        self.repeated_blocks = repeated_blocks
+        self.reused_blocks = reused_blocks
+        self.bytes_saved = bytes_saved
+        self.seconds_saved = seconds_saved
+        self.seconds_hashing = seconds_hashing
+
+    @property
+    def net_seconds_saved(self) -> float:
+        return self.seconds_saved - self.seconds_hashing
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}(repeated_blocks={self.repeated_blocks}, "
+            f"reused_blocks={self.reused_blocks}, bytes_saved={self.bytes_saved}, "
+            f"seconds_saved={self.seconds_saved:.6f}, "
+            f"seconds_hashing={self.seconds_hashing:.6f})"
+        )
+
+
+class _DeduplicatingYamlWriter(_FastYamlWriter):
+    def __init__(self, deduplicator: "SubtreeDeduplicator"):
+        super().__init__()
+        self.__deduplicator = deduplicator
+
+    def _check_collection(self, collection):
+        # Collections are only repeated in memoized output when a HelmYaml object is
+        # used more than once, and to_dict outputs a copy for each use
+        if not collection:
+            raise _UnsupportedData(collection)
+
+    def write_mapping(self, mapping: dict, indent: int, inline: bool = False):
+        self.__deduplicator._write_block(
+            self, super().write_mapping, mapping, indent, inline
+        )
+
+    def write_sequence(self, sequence: list, indent: int, inline: bool = False):
+        self.__deduplicator._write_block(
+            self, super().write_sequence, sequence, indent, inline
+        )
+
+
+class SubtreeDeduplicator:
+    """
+    Writes the text of HelmYaml objects, writing blocks that are repeated across the
+    objects only once
+
+    The text is the same as the text of the emitter, and is memoized on each object
+    within :func:`~avionix.yaml.yaml_handling.memoized` blocks like the text produced
+    by :func:`str`. Deduplication is only done for the yaml
+    emitters, objects are written by the emitter itself with the json emitter
+
+    :param emitter: The name of the emitter, defaults to DEFAULTS["emitter"]
+    """
+
+    def __init__(self, emitter: Optional[str] = None):
+        get_emitter(emitter)
+        self.emitter = emitter
+        self.report = DeduplicationReport()
+        self.__keys: Dict[Tuple[type, tuple], int] = {}
+        self.__counts: List[int] = []
+        self.__block_keys: Dict[int, int] = {}
+        self.__fragments: Dict[Tuple[int, int, bool], Tuple[str, int, float]] = {}
+        # Keeps the blocks in __block_keys alive so that their ids are not reused
+        self.__documents: List[dict] = []
+        # The output of each object whose blocks were counted, keyed by its id
+        self.__object_documents: Dict[int, dict] = {}
+
+    def __get_key(self, value: Any) -> Any:
+        value_type = type(value)
+        if value_type is dict or value_type is list:
+            key = self.__block_keys.get(id(value))
+            if key is None:
+                if value_type is dict:
+                    content: tuple = tuple(
+                        sorted(
+                            (
+                                (self.__get_key(item_key), self.__get_key(item))
+                                for item_key, item in value.items()
+                            ),
+                            key=itemgetter(0),
+                        )
+                    )
+                else:
+                    content = tuple(self.__get_key(item) for item in value)
+                key = self.__keys.get((value_type, content))
+                if key is None:
+                    key = self.__keys[(value_type, content)] = len(self.__counts)
+                    self.__counts.append(0)
+                self.__block_keys[id(value)] = key
+            self.__counts[key] += 1
+            # Keys of blocks are plain ints, scalars are wrapped in tuples
+            return key
+        if value_type in _SCALAR_TYPES:
+            # Type names keep True and 1 apart and can be sorted
+            return (value_type.__name__, value)
+        # Other values are never merged with anything else
+        return ("", id(value))
+
+    def _write_block(self, writer, write, block, indent: int, inline: bool):
+        key = self.__block_keys.get(id(block))
+        if key is None or self.__counts[key] < 2:
+            write(block, indent, inline)
+            return
+        fragment_key = (key, indent, inline)
+        fragment = self.__fragments.get(fragment_key)
+        if fragment is not None:
+            text, size, seconds = fragment
+            writer._chunks.append(text)
+            self.report.reused_blocks += 1
+            self.report.bytes_saved += size
+            self.report.seconds_saved += seconds
+            return
+        start = len(writer._chunks)
+        started = perf_counter()
+        write(block, indent, inline)
+        text = "".join(writer._chunks[start:])
+        del writer._chunks[start:]
+        writer._chunks.append(text)
+        self.__fragments[fragment_key] = (
+            text,
+            len(text.encode("utf-8")),
+            perf_counter() - started,
+        )
+
+    def __can_deduplicate(self, helm_yaml: HelmYaml) -> bool:
+        return (
+            (self.emitter or DEFAULTS["emitter"]) in _YAML_EMITTERS
+            and not _get_plan(type(helm_yaml)).uses_custom_to_dict
+            and not helm_yaml._has_text(self.emitter)
+        )
+
+    def __render(self, helm_yaml: HelmYaml) -> str:
+        writer = _DeduplicatingYamlWriter(self)
+        document = self.__object_documents.get(id(helm_yaml))
+        try:
+            writer.write_mapping(
+                helm_yaml._get_cached_dict() if document is None else document, 0
+            )
+        except _UnsupportedData:
+            return get_emitter(self.emitter)(helm_yaml.to_dict())
+        return writer.text
+
+    def get_texts(self, helm_yamls: Sequence[HelmYaml]) -> List[str]:
+        """
+        :param helm_yamls: The objects to write, for instance the templates of a chart
+
+        :returns: The text of each object
+        """
+        return list(self.iter_texts(helm_yamls))
+
+    def iter_texts(self, helm_yamls: Sequence[HelmYaml]) -> Iterator[str]:
+        """
+        Like :meth:`get_texts`, but writes the text of each object as it is taken
+        from the iterator, once the repeated blocks of all objects are found
+
+        :param helm_yamls: The objects to write, for instance the templates of a chart
+
+        :returns: The text of each object
+        """
+        pending = [
+            helm_yaml for helm_yaml in helm_yamls if self.__can_deduplicate(helm_yaml)
+        ]
+        documents = [helm_yaml._get_cached_dict() for helm_yaml in pending]
+        self.__documents.extend(documents)
+        self.__object_documents.update(
+            (id(helm_yaml), document) for helm_yaml, document in zip(pending, documents)
+        )
+        started = perf_counter()
+        repeated_before = sum(count > 1 for count in self.__counts)
+        for document in documents:
+            self.__get_key(document)
+        self.report.repeated_blocks += (
+            sum(count > 1 for count in self.__counts) - repeated_before
+        )
+        self.report.seconds_hashing += perf_counter() - started
+        return (
+            helm_yaml._get_text(
+                self.emitter,
+                self.__render if self.__can_deduplicate(helm_yaml) else None,
+            )
+            for helm_yaml in helm_yamls
+        )
@@ -0,0 +1,449 @@
+"""
+Emitters turn the dictionaries produced by :meth:`HelmYaml.to_dict` and the values in
+*values.yaml* into text
+
+Every emitter accepts the same data and all of the yaml emitters produce exactly the
+same text as :func:`yaml.dump`, so they can be swapped freely. The emitter used is
+chosen by name, either per :class:`~avionix.chart.ChartBuilder` or globally through
+``DEFAULTS["emitter"]`` in :mod:`avionix.options`
+
+* ``pyyaml``: :func:`yaml.dump` with the pure python dumper
+* ``libyaml``: :func:`yaml.dump` with the libyaml dumper when pyyaml was built with
+  libyaml, otherwise the same as ``pyyaml``. Documents with empty keys or double
+  quoted strings, which libyaml writes differently, are written by ``pyyaml``
+* ``fast``: an emitter specialized for the dictionaries, lists and scalars that
+  avionix produces, falling back to ``pyyaml`` for any document it cannot write
+* ``json``: JSON output, which helm accepts since JSON is valid yaml
+
+Each emitter can also write straight to an open file with :func:`get_stream_emitter`.
+The yaml emitters then feed the events of the document to the emitter of pyyaml one
+by one instead of building the whole text first, so the memory used does not grow
+with the size of the document. The document can also be made of
+:class:`LazyMapping` and :class:`LazySequence` objects, whose items are only worked
+out as they are written, so that the document itself is never built either
+"""
+
+from functools import lru_cache
+import json
+from json.encoder import encode_basestring_ascii
+import re
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from yaml import Dumper, dump
+from yaml.events import (
+    DocumentEndEvent,
+    DocumentStartEvent,
+    MappingEndEvent,
+    MappingStartEvent,
+    ScalarEvent,
+    SequenceEndEvent,
+    SequenceStartEvent,
+    StreamEndEvent,
+    StreamStartEvent,
+)
+from yaml.nodes import MappingNode, ScalarNode, SequenceNode
+
+from avionix.options import DEFAULTS
+
+try:
+    from yaml import CDumper as LibYamlDumper
+except ImportError:  # pragma: no cover
+    LibYamlDumper = Dumper  # type: ignore
+
+# The line width used by pyyaml, plain and single quoted scalars containing spaces
+# are folded when they run past it
+_BEST_WIDTH = 80
+
+# pyyaml writes empty mapping keys and keys this long or longer as complex keys
+# ("? key")
+_MAX_SIMPLE_KEY_LENGTH = 128
+
+_SCALAR_TYPES = (str, bool, int, float, type(None))
+
+
+def pyyaml_dump(data: Any) -> str:
+    return dump(data, Dumper=Dumper)
+
+
+# pyyaml can write strings of printable ascii characters with single quotes at worst
+_PRINTABLE_ASCII = re.compile(r"[\x20-\x7e]*\Z")
+
+
+@lru_cache(maxsize=8192)
+def _is_double_quoted_by_pyyaml(text: str) -> bool:
+    return dump(text, Dumper=Dumper)[:1] == '"'
+
+
+class LazyMapping:
+    """
+    A mapping that the stream emitters write without it being built first, its
+    values are only worked out as they are written. Subclasses give its keys, in any
+    order, and the value of each key, which may be lazy as well
+    """
+
+    __slots__ = ()
+
+    def keys(self) -> List[Any]:
+        raise NotImplementedError
+
+    def __getitem__(self, key: Any) -> Any:
+        raise NotImplementedError
+
+    def build(self) -> dict:
+        """
+        :returns: The mapping as a dictionary, for the emitters that can't stream it
+        """
+        raise NotImplementedError
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.keys())
+
+    def items(self) -> Iterator[Tuple[Any, Any]]:
+        return ((key, self[key]) for key in self.keys())
+
+
+class LazySequence:
+    """
+    A sequence that the stream emitters write without it being built first, like
+    :class:`LazyMapping`
+    """
+
+    __slots__ = ()
+
+    def __iter__(self) -> Iterator[Any]:
+        raise NotImplementedError
+
+    def build(self) -> list:
+        """
+        :returns: The sequence as a list, for the emitters that can't stream it
+        """
+        raise NotImplementedError
+
+
+_MAPPINGS = (dict, LazyMapping)
+_SEQUENCES = (list, LazySequence)
+
+
+def _build(data: Any) -> Any:
+    if isinstance(data, (LazyMapping, LazySequence)):
+        return data.build()
+    return data
+
+
+def _is_double_quoted(text: str) -> bool:
+    return not _PRINTABLE_ASCII.match(text) and _is_double_quoted_by_pyyaml(text)
+
+
+def _differs_in_libyaml(data: Any) -> bool:
+    if isinstance(data, _MAPPINGS):
+        return any(
+            key == "" or _differs_in_libyaml(key) or _differs_in_libyaml(value)
+            for key, value in data.items()
+        )
+    if isinstance(data, _SEQUENCES):
+        return any(_differs_in_libyaml(value) for value in data)
+    if isinstance(data, str):
+        return _is_double_quoted(data)
+    return False
+
+
+def libyaml_dump(data: Any) -> str:
+    if _differs_in_libyaml(data):
+        return pyyaml_dump(data)
+    return dump(data, Dumper=LibYamlDumper)
+
+
+def json_dump(data: Any) -> str:
+    return json.dumps(data, indent=2, sort_keys=True, default=str) + "\n"
+
+
+class _UnsupportedData(Exception):
+    """
+    Raised by the fast emitter for data it cannot write exactly like pyyaml
+    """
+
+
+@lru_cache(maxsize=8192)
+def _render_scalar(scalar_type: str, scalar: Any) -> str:
+    # The type is part of the cache key so that True and 1 are rendered separately
+    lines = dump(scalar, Dumper=Dumper).split("\n")
+    if lines[1:] not in ([""], ["...", ""]) or lines[0][:1] in ('"', "|", ">"):
+        # Multi-line and double quoted scalars can be broken across lines anywhere
+        raise _UnsupportedData(scalar)
+    return lines[0]
+
+
+class _FastYamlWriter:
+    def __init__(self):
+        self._chunks: List[str] = []
+        self._seen_collections: Set[int] = set()
+
+    @property
+    def text(self):
+        return "".join(self._chunks)
+
+    def _check_collection(self, collection):
+        # pyyaml writes empty collections in flow style and writes anchors and
+        # aliases for collections that appear more than once
+        if not collection or id(collection) in self._seen_collections:
+            raise _UnsupportedData(collection)
+        self._seen_collections.add(id(collection))
+
+    def __write_scalar(self, scalar: Any, column: int):
+        if type(scalar) not in _SCALAR_TYPES:
+            raise _UnsupportedData(scalar)
+        text = _render_scalar(type(scalar).__name__, scalar)
+        if " " in text and column + len(text) > _BEST_WIDTH:
+            raise _UnsupportedData(scalar)
+        self._chunks.append(text)
+        self._chunks.append("\n")
+
+    def write_mapping(self, mapping: dict, indent: int, inline: bool = False):
+        self._check_collection(mapping)
+        try:
+            keys = sorted(mapping)
+        except TypeError:
+            raise _UnsupportedData(mapping)
+        for key in keys:
+            if type(key) not in _SCALAR_TYPES:
+                raise _UnsupportedData(key)
+            key_text = _render_scalar(type(key).__name__, key)
+            if key == "" or len(key_text) >= _MAX_SIMPLE_KEY_LENGTH:
+                raise _UnsupportedData(key)
+            if not inline:
+                self._chunks.append(" " * indent)
+            inline = False
+            self._chunks.append(key_text)
+            value = mapping[key]
+            value_type = type(value)
+            if value_type is dict:
+                self._chunks.append(":\n")
+                self.write_mapping(value, indent + 2)
+            elif value_type is list:
+                self._chunks.append(":\n")
+                self.write_sequence(value, indent)
+            else:
+                self._chunks.append(": ")
+                self.__write_scalar(value, indent + len(key_text) + 2)
+
+    def write_sequence(self, sequence: list, indent: int, inline: bool = False):
+        self._check_collection(sequence)
+        for item in sequence:
+            if not inline:
+                self._chunks.append(" " * indent)
+            inline = False
+            self._chunks.append("- ")
+            item_type = type(item)
+            if item_type is dict:
+                self.write_mapping(item, indent + 2, inline=True)
+            elif item_type is list:
+                self.write_sequence(item, indent + 2, inline=True)
+            else:
+                self.__write_scalar(item, indent + 2)
+
+
+def fast_dump(data: Any) -> str:
+    writer = _FastYamlWriter()
+    try:
+        if type(data) is dict:
+            writer.write_mapping(data, 0)
+        elif type(data) is list:
+            writer.write_sequence(data, 0)
+        else:
+            raise _UnsupportedData(data)
+    except _UnsupportedData:
+        return pyyaml_dump(data)
+    return writer.text
+
+
+EMITTERS: Dict[str, Callable[[Any], str]] = {
+    "pyyaml": pyyaml_dump,
+    "libyaml": libyaml_dump,
+    "fast": fast_dump,
+    "json": json_dump,
+}
+
+
+def _is_plain(data: Any) -> bool:
+    data_type = type(data)
+    if data_type is dict or isinstance(data, LazyMapping):
+        return all(_is_plain(key) and _is_plain(value) for key, value in data.items())
+    if data_type is list or isinstance(data, LazySequence):
+        return all(_is_plain(value) for value in data)
+    return data_type in _SCALAR_TYPES
+
+
+def _emit_scalar(dumper, scalar: Any):
+    node = dumper.represent_data(scalar)
+    detected_tag = dumper.resolve(ScalarNode, node.value, (True, False))
+    default_tag = dumper.resolve(ScalarNode, node.value, (False, True))
+    implicit = (node.tag == detected_tag), (node.tag == default_tag)
+    dumper.emit(ScalarEvent(None, node.tag, implicit, node.value, style=node.style))
+
+
+def _emit_collection(dumper, data: Any):
+    # The same events as the serializer of pyyaml produces for yaml.dump, except
+    # that collections appearing more than once are written out again instead of
+    # being given anchors, just as they would be in the output of to_dict
+    data_type = type(data)
+    if data_type is dict or isinstance(data, LazyMapping):
+        tag = dumper.DEFAULT_MAPPING_TAG
+        implicit = tag == dumper.resolve(MappingNode, data, True)
+        dumper.emit(MappingStartEvent(None, tag, implicit, flow_style=False))
+        # Sorting the keys gives the same order as pyyaml, which sorts the items,
+        # since keys are unique
+        try:
+            keys = sorted(data)
+        except TypeError:
+            keys = list(data)
+        for key in keys:
+            _emit_collection(dumper, key)
+            _emit_collection(dumper, data[key])
+        dumper.emit(MappingEndEvent())
+    elif data_type is list or isinstance(data, LazySequence):
+        tag = dumper.DEFAULT_SEQUENCE_TAG
+        implicit = tag == dumper.resolve(SequenceNode, data, True)
+        dumper.emit(SequenceStartEvent(None, tag, implicit, flow_style=False))
+        for value in data:
+            _emit_collection(dumper, value)
+        dumper.emit(SequenceEndEvent())
+    else:
+        _emit_scalar(dumper, data)
+
+
+def _stream_yaml(data: Any, stream: IO[str], dumper_class: type):
+    dumper = dumper_class(stream, default_flow_style=False)
+    try:
+        dumper.emit(StreamStartEvent())
+        dumper.emit(DocumentStartEvent(explicit=None))
+        _emit_collection(dumper, data)
+        dumper.emit(DocumentEndEvent(explicit=None))
+        dumper.emit(StreamEndEvent())
+    finally:
+        dumper.dispose()
+
+
+def pyyaml_stream(data: Any, stream: IO[str]):
+    if not _is_plain(data):
+        # Anything else may be given anchors by pyyaml
+        stream.write(pyyaml_dump(_build(data)))
+        return
+    _stream_yaml(data, stream, Dumper)
+
+
+def libyaml_stream(data: Any, stream: IO[str]):
+    if not _is_plain(data) or _differs_in_libyaml(data):
+        pyyaml_stream(data, stream)
+        return
+    _stream_yaml(data, stream, LibYamlDumper)
+
+
+def _json_float(number: float) -> str:
+    if number != number:
+        return "NaN"
+    if number in (float("inf"), float("-inf")):
+        return "Infinity" if number > 0 else "-Infinity"
+    return float.__repr__(number)
+
+
+def _json_scalar(scalar: Any) -> str:
+    if isinstance(scalar, str):
+        return encode_basestring_ascii(scalar)
+    if scalar is None:
+        return "null"
+    if scalar is True:
+        return "true"
+    if scalar is False:
+        return "false"
+    if isinstance(scalar, int):
+        return int.__repr__(scalar)
+    if isinstance(scalar, float):
+        return _json_float(scalar)
+    return encode_basestring_ascii(str(scalar))
+
+
+def _json_key(key: Any) -> str:
+    if isinstance(key, str):
+        return encode_basestring_ascii(key)
+    if isinstance(key, (int, float)) or key is None:
+        # Other keys are written as strings of their json text
+        return encode_basestring_ascii(_json_scalar(key))
+    raise TypeError(
+        f"keys must be str, int, float, bool or None, not {type(key).__name__}"
+    )
+
+
+def _write_json(data: Any, stream: IO[str], indent: str):
+    # Writes the same text as json.dumps(data, indent=2, sort_keys=True, default=str)
+    # one scalar at a time, where json sorts a copy of the items of every mapping
+    if isinstance(data, _MAPPINGS):
+        keys = sorted(data)
+        if not keys:
+            stream.write("{}")
+            return
+        inner_indent = indent + "  "
+        separator = "{\n" + inner_indent
+        for key in keys:
+            stream.write(separator)
+            stream.write(_json_key(key))
+            stream.write(": ")
+            _write_json(data[key], stream, inner_indent)
+            separator = ",\n" + inner_indent
+        stream.write("\n" + indent + "}")
+    elif isinstance(data, (list, tuple, LazySequence)):
+        inner_indent = indent + "  "
+        separator = "[\n" + inner_indent
+        for value in data:
+            stream.write(separator)
+            _write_json(value, stream, inner_indent)
+            separator = ",\n" + inner_indent
+        # Nothing was written for an empty sequence
+        stream.write("[]" if separator[0] == "[" else "\n" + indent + "]")
+    else:
+        stream.write(_json_scalar(data))
+
+
+def json_stream(data: Any, stream: IO[str]):
+    _write_json(data, stream, "")
+    stream.write("\n")
+
+
+STREAM_EMITTERS: Dict[str, Callable[[Any, IO[str]], None]] = {
+    "pyyaml": pyyaml_stream,
+    "libyaml": libyaml_stream,
+    # The fast emitter has to see the whole document before writing any of it
+    "fast": libyaml_stream,
+    "json": json_stream,
+}
+
+
+def _check_emitter_name(name: Optional[str]) -> str:
+    if name is None:
+        name = DEFAULTS["emitter"]
+    if name not in EMITTERS:
+        raise ValueError(
+            f"Unknown emitter {name!r}, choose one of {', '.join(sorted(EMITTERS))}"
+        )
+    return name
+
+
+def get_emitter(name: Optional[str] = None) -> Callable[[Any], str]:
+    """
+    :param name: The name of the emitter, if not given ``DEFAULTS["emitter"]`` is used
+
+    :returns: A function that takes a dictionary and returns its text
+    """
+    return EMITTERS[_check_emitter_name(name)]
+
+
+def get_stream_emitter(name: Optional[str] = None) -> Callable[[Any, IO[str]], None]:
+    """
+    :param name: The name of the emitter, if not given ``DEFAULTS["emitter"]`` is used
+
+    :returns: A function that takes a dictionary and a text file and writes the text \
+        of the dictionary to the file. The text is the same as the emitter returns, \
+        except that lists and dictionaries appearing more than once are written out \
+        each time rather than given anchors, as in the output of :meth:`to_dict`. \
+        The dictionary can be a :class:`LazyMapping`
+    """
+    return STREAM_EMITTERS[_check_emitter_name(name)]
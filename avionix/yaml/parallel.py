@@ -0,0 +1,195 @@
+"""
+Serialization of :class:`~avionix.yaml.yaml_handling.HelmYaml` objects in a pool of
+processes
+
+The objects are pickled in chunks and each chunk is written by a worker process.
+The workers build the dictionaries of the objects as well as emitting them. The
+texts come back in the order of the objects, so the output is the same as writing
+the objects one after the other. They aren't memoized on the objects, since the
+objects in this process never build the dictionaries that link them to the objects
+they contain, which is what clears memoized text when a nested object changes
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+import pickle
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from avionix.yaml.deduplication import DeduplicationReport, SubtreeDeduplicator
+from avionix.yaml.emitters import _check_emitter_name
+from avionix.yaml.yaml_handling import HelmYaml
+
+# Raised by pickle for lambdas, local classes, open files, locks and the like
+_PICKLING_ERRORS = (pickle.PicklingError, TypeError, AttributeError)
+
+
+def _render_chunk(
+    payload: bytes, emitter: str, deduplicate: bool
+) -> Tuple[List[str], Optional[DeduplicationReport]]:
+    helm_yamls: List[HelmYaml] = pickle.loads(payload)
+    if not deduplicate:
+        return [helm_yaml._get_text(emitter) for helm_yaml in helm_yamls], None
+    deduplicator = SubtreeDeduplicator(emitter)
+    return deduplicator.get_texts(helm_yamls), deduplicator.report
+
+
+def _add_report(total: DeduplicationReport, report: DeduplicationReport):
+    total.repeated_blocks += report.repeated_blocks
+    total.reused_blocks += report.reused_blocks
+    total.bytes_saved += report.bytes_saved
+    total.seconds_saved += report.seconds_saved
+    total.seconds_hashing += report.seconds_hashing
+
+
+class ParallelSerializer:
+    """
+    Writes the text of HelmYaml objects in a pool of worker processes
+
+    Objects that can't be pickled, for instance objects holding a lambda or an
+    instance of a class defined in a function, are written in this process instead.
+    Objects whose text is already memoized are not sent to the workers
+
+    Used as a context manager, the worker processes are started on entering it and
+    used by every call to :meth:`get_texts` until leaving it. Otherwise each call
+    starts its own
+
+    :param workers: The number of worker processes
+    :param emitter: The name of the emitter, defaults to DEFAULTS["emitter"] as it is \
+        when the serializer is created
+    :param chunk_size: The number of objects sent to a worker at a time, defaults \
+        to splitting the objects into four chunks per worker
+    :param deduplicate: Whether each worker writes blocks repeated across its chunk \
+        only once, see :class:`~avionix.yaml.deduplication.SubtreeDeduplicator`
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        emitter: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        deduplicate: bool = True,
+    ):
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+        self.workers = workers
+        # Resolved here, as workers that aren't forked don't see changes made to
+        # DEFAULTS in this process
+        self.emitter = _check_emitter_name(emitter)
+        self.chunk_size = chunk_size
+        self.deduplicate = deduplicate
+        self.report: Optional[DeduplicationReport] = (
+            DeduplicationReport() if deduplicate else None
+        )
+        # The number of objects written in this process because they couldn't be
+        # pickled
+        self.unpicklable = 0
+        self.__executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "ParallelSerializer":
+        self.__executor = ProcessPoolExecutor(max_workers=self.workers)
+        # Starts the workers now rather than when the first chunk is sent, so that
+        # when they are forked, threads started later, such as the background
+        # writer of ChartWriter, aren't running yet
+        self.__executor.submit(int).result()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        assert self.__executor is not None
+        self.__executor.shutdown()
+        self.__executor = None
+
+    def __get_chunks(self, helm_yamls: List[HelmYaml]) -> List[List[HelmYaml]]:
+        chunk_size = self.chunk_size or -(-len(helm_yamls) // (self.workers * 4))
+        return [
+            helm_yamls[start : start + chunk_size]
+            for start in range(0, len(helm_yamls), chunk_size)
+        ]
+
+    def __pickle(self, chunk: List[HelmYaml]) -> Tuple[bytes, List[HelmYaml]]:
+        """
+        :returns: The pickled objects of the chunk that can be pickled, and the \
+            objects that can't be pickled
+        """
+        try:
+            return pickle.dumps(chunk, pickle.HIGHEST_PROTOCOL), []
+        except _PICKLING_ERRORS:
+            pass
+        picklable = []
+        unpicklable = []
+        for helm_yaml in chunk:
+            try:
+                pickle.dumps(helm_yaml, pickle.HIGHEST_PROTOCOL)
+            except _PICKLING_ERRORS:
+                unpicklable.append(helm_yaml)
+            else:
+                picklable.append(helm_yaml)
+        return pickle.dumps(picklable, pickle.HIGHEST_PROTOCOL), unpicklable
+
+    def get_texts(self, helm_yamls: Sequence[HelmYaml]) -> List[str]:
+        """
+        :param helm_yamls: The objects to write, for instance the templates of a chart
+
+        :returns: The text of each object, in the order of the objects
+        """
+        pending = [
+            helm_yaml
+            for helm_yaml in helm_yamls
+            if not helm_yaml._has_text(self.emitter)
+        ]
+        texts = self.__render(pending) if pending else {}
+        return [
+            texts.get(id(helm_yaml)) or helm_yaml._get_text(self.emitter)
+            for helm_yaml in helm_yamls
+        ]
+
+    def __render(self, helm_yamls: List[HelmYaml]) -> Dict[int, str]:
+        """
+        :returns: The text of each object, keyed by the id of the object
+        """
+        if self.__executor is not None:
+            return self.__render_in(self.__executor, helm_yamls)
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            return self.__render_in(executor, helm_yamls)
+
+    def __render_in(
+        self, executor: ProcessPoolExecutor, helm_yamls: List[HelmYaml]
+    ) -> Dict[int, str]:
+        texts: Dict[int, str] = {}
+        local: List[HelmYaml] = []
+        submitted: List[Tuple[List[HelmYaml], Future]] = []
+        for chunk in self.__get_chunks(helm_yamls):
+            payload, unpicklable = self.__pickle(chunk)
+            if unpicklable:
+                local.extend(unpicklable)
+                unpicklable_ids = {id(helm_yaml) for helm_yaml in unpicklable}
+                chunk = [
+                    helm_yaml
+                    for helm_yaml in chunk
+                    if id(helm_yaml) not in unpicklable_ids
+                ]
+            if chunk:
+                future = executor.submit(
+                    _render_chunk, payload, self.emitter, self.deduplicate
+                )
+                submitted.append((chunk, future))
+        # The objects that can't be pickled are written while the workers run
+        self.unpicklable += len(local)
+        texts.update(zip(map(id, local), self.__render_locally(local)))
+        for chunk, future in submitted:
+            chunk_texts, report = future.result()
+            if self.report is not None and report is not None:
+                _add_report(self.report, report)
+            texts.update(zip(map(id, chunk), chunk_texts))
+        return texts
+
+    def __render_locally(self, helm_yamls: List[HelmYaml]) -> List[str]:
+        if not helm_yamls:
+            return []
+        if not self.deduplicate:
+            return [helm_yaml._get_text(self.emitter) for helm_yaml in helm_yamls]
+        deduplicator = SubtreeDeduplicator(self.emitter)
+        texts = deduplicator.get_texts(helm_yamls)
+        if self.report is not None:
+            _add_report(self.report, deduplicator.report)
+        return texts
@@ -1,9 +1,30 @@
-from copy import deepcopy
+from contextlib import contextmanager
 from datetime import datetime
+from itertools import chain, count
+from operator import attrgetter
 import re
-from typing import Optional, Union
+from threading import local
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+from weakref import ref
 
-from yaml import dump
+from avionix.options import DEFAULTS
+from avionix.yaml.emitters import (
+    LazyMapping,
+    LazySequence,
+    get_emitter,
+    get_stream_emitter,
+)
 
 
 def is_empty_yaml(value):
@@ -12,65 +33,646 @@ def is_empty_yaml(value):
 
 
 def is_private_var(key: str):
+    if type(key) is str:
+        return key[:1] == "_"
     if re.match(r"_+.*", key):
         return True
     return False
 
 
-class HelmYaml:
-    def __clean_nested(self, dictionary_or_list: Union[dict, list]):
-        if isinstance(dictionary_or_list, list):
-            cleaned_list = []
-            for value in dictionary_or_list:
-                if is_empty_yaml(value):
-                    continue
+# Returned by value handlers when a value should not appear in the output
+_EMPTY: Any = object()
+
+# The instance attribute holding the memoized output of a HelmYaml object
+_MEMO = "_HelmYaml__memo"
+
+# The instance attribute holding the attributes set on an object that its class
+# doesn't declare in __slots__
+_EXTRA = "_HelmYaml__extra"
+
+
+class _MemoScope(local):
+    # The number of memoized blocks this thread is in
+    depth = 0
+    # The generation of the outermost of these blocks, 0 outside of them
+    generation = 0
+    # The memos filled in the outermost of these blocks, cleared when it exits
+    memos: List["_Memo"] = []
+
+
+_SCOPE = _MemoScope()
+_GENERATIONS = count(1)
+
+
+@contextmanager
+def memoized() -> Iterator[None]:
+    """
+    Memoizes the output of HelmYaml objects within the block, so that an object used
+    more than once, or written more than once, is only serialized once
+
+    Output memoized before the outermost block of a thread is entered is never used,
+    so each block starts from the current state of the objects, and the output
+    memoized in it is dropped when it exits. Within the block,
+    setting or deleting a public attribute clears the memoized output of the object
+    and of every object containing it, but changes made to a list or dictionary
+    attribute in place, such as appending to it, are not seen. Either assign the
+    attribute again or call :meth:`HelmYaml.invalidate` after making them. Outside
+    of these blocks the output is built again every time it is needed
+
+    :meth:`~avionix.ChartBuilder.generate_chart` memoizes the output of the objects
+    while it writes the chart
+    """
+    if _SCOPE.depth == 0:
+        _SCOPE.generation = next(_GENERATIONS)
+        _SCOPE.memos = []
+    _SCOPE.depth += 1
+    try:
+        yield
+    finally:
+        _SCOPE.depth -= 1
+        if _SCOPE.depth == 0:
+            generation = _SCOPE.generation
+            _SCOPE.generation = 0
+            memos = _SCOPE.memos
+            _SCOPE.memos = []
+            for memo in memos:
+                # A block in another thread may have taken the memo over since
+                if memo.generation == generation:
+                    memo.clear()
+                    memo.generation = 0
+                    memo.parents = None
+
+
+class _Memo:
+    """
+    The memoized output of a HelmYaml object and the objects it is part of
+    """
+
+    __slots__ = ("generation", "dictionary", "texts", "parents")
+
+    def __init__(self):
+        # The generation of the memoized block the output was memoized in
+        self.generation = 0
+        self.dictionary: Optional[dict] = None
+        self.texts: Dict[str, str] = {}
+        # Weak references to the objects containing this one, keyed by their id
+        self.parents: Optional[Dict[int, ref]] = None
+
+    def clear(self) -> bool:
+        had_output = self.dictionary is not None or bool(self.texts)
+        self.dictionary = None
+        self.texts.clear()
+        return had_output
+
+
+def _get_slot_names(helm_yaml_class: type) -> Tuple[str, ...]:
+    names = []
+    for klass in reversed(helm_yaml_class.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name.startswith("__") and not name.endswith("__"):
+                name = f"_{klass.__name__.lstrip('_')}{name}"
+            if (
+                name not in ("__dict__", "__weakref__", _MEMO, _EXTRA)
+                and name not in names
+            ):
+                names.append(name)
+    return tuple(names)
+
+
+class _SerializationPlan:
+    """
+    Everything needed to serialize instances of one HelmYaml class, worked out the
+    first time an instance of that class is serialized
+    """
+
+    def __init__(self, helm_yaml_class: Type["HelmYaml"]):
+        self.uses_custom_to_dict = helm_yaml_class.to_dict is not HelmYaml.to_dict
+        # Instances of classes that declare __slots__ all the way down have no
+        # __dict__, their attributes are read from the slots
+        self.slot_names = _get_slot_names(helm_yaml_class)
+        self.public_slot_names = tuple(
+            name for name in self.slot_names if not is_private_var(name)
+        )
+        self.has_dict = helm_yaml_class.__dictoffset__ != 0
+        self.__get_slot_values: Optional[Callable[[Any], tuple]] = None
+        if len(self.public_slot_names) > 1:
+            self.__get_slot_values = attrgetter(*self.public_slot_names)
+        elif self.public_slot_names:
+            (name,) = self.public_slot_names
+            self.__get_slot_values = lambda helm_yaml: (getattr(helm_yaml, name),)
+        self.__get_all_slot_values: Optional[Callable[[Any], tuple]] = None
+        if len(self.slot_names) > 1:
+            self.__get_all_slot_values = attrgetter(*self.slot_names)
+        self.__public_keys: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+    def public_keys(self, attributes: dict) -> Tuple[str, ...]:
+        layout = tuple(attributes)
+        keys = self.__public_keys.get(layout)
+        if keys is None:
+            keys = tuple(key for key in layout if not is_private_var(key))
+            self.__public_keys[layout] = keys
+        return keys
+
+    def slot_state(self, helm_yaml: "HelmYaml") -> Dict[str, Any]:
+        """
+        :returns: The value of every slot that is set, for pickling
+        """
+        if self.__get_all_slot_values is not None:
+            try:
+                return dict(zip(self.slot_names, self.__get_all_slot_values(helm_yaml)))
+            except AttributeError:
+                pass
+        state = {}
+        for name in self.slot_names:
+            try:
+                state[name] = getattr(helm_yaml, name)
+            except AttributeError:
+                pass
+        return state
+
+    def public_items(self, helm_yaml: "HelmYaml") -> Iterable[Tuple[str, Any]]:
+        items: Iterable[Tuple[str, Any]] = ()
+        if self.__get_slot_values is not None:
+            try:
+                values = self.__get_slot_values(helm_yaml)
+            except AttributeError:
+                # Some of the slots were never set
+                values = tuple(
+                    getattr(helm_yaml, name, None) for name in self.public_slot_names
+                )
+            items = zip(self.public_slot_names, values)
+        attributes = helm_yaml.__dict__ if self.has_dict else _get_extra(helm_yaml)
+        if attributes:
+            dict_items = [
+                (key, attributes[key]) for key in self.public_keys(attributes)
+            ]
+            items = chain(items, dict_items) if self.public_slot_names else dict_items
+        return items
+
+
+_PLANS: Dict[type, _SerializationPlan] = {}
+_VALUE_HANDLERS: Dict[type, Callable[[Any, "HelmYaml"], Any]] = {}
+
+
+def _get_plan(helm_yaml_class: Type["HelmYaml"]) -> _SerializationPlan:
+    plan = _PLANS.get(helm_yaml_class)
+    if plan is None:
+        plan = _PLANS[helm_yaml_class] = _SerializationPlan(helm_yaml_class)
+    return plan
+
+
+def _serialize_attributes(helm_yaml: "HelmYaml", plan: _SerializationPlan) -> dict:
+    cleaned_dict = {}
+    for key, value in plan.public_items(helm_yaml):
+        if value is None:
+            continue
+        handler = _VALUE_HANDLERS.get(type(value))
+        if handler is None:
+            handler = _VALUE_HANDLERS[type(value)] = _get_value_handler(type(value))
+        cleaned_value = handler(value, helm_yaml)
+        if cleaned_value is not _EMPTY:
+            cleaned_dict[key] = cleaned_value
+    return cleaned_dict
+
+
+def _serialize_dict(dictionary: dict, parent: "HelmYaml"):
+    cleaned_dict = {}
+    for key, value in dictionary.items():
+        if is_private_var(key):
+            continue
+        handler = _VALUE_HANDLERS.get(type(value))
+        if handler is None:
+            handler = _VALUE_HANDLERS[type(value)] = _get_value_handler(type(value))
+        cleaned_value = handler(value, parent)
+        if cleaned_value is not _EMPTY:
+            cleaned_dict[key] = cleaned_value
+    return cleaned_dict if cleaned_dict else _EMPTY
+
+
+def _serialize_list(values: list, parent: "HelmYaml"):
+    cleaned_list = []
+    for value in values:
+        handler = _VALUE_HANDLERS.get(type(value))
+        if handler is None:
+            handler = _VALUE_HANDLERS[type(value)] = _get_value_handler(type(value))
+        cleaned_value = handler(value, parent)
+        if cleaned_value is not _EMPTY:
+            cleaned_list.append(cleaned_value)
+    return cleaned_list if cleaned_list else _EMPTY
+
+
+def _serialize_helm_yaml(helm_yaml: "HelmYaml", parent: "HelmYaml"):
+    memo = helm_yaml._add_parent(parent)
+    plan = _get_plan(type(helm_yaml))
+    if plan.uses_custom_to_dict:
+        cleaned = helm_yaml.to_dict()
+    elif memo is None:
+        cleaned = _serialize_attributes(helm_yaml, plan)
+    else:
+        if memo.dictionary is None:
+            memo.dictionary = _serialize_attributes(helm_yaml, plan)
+        cleaned = memo.dictionary
+    return cleaned if cleaned else _EMPTY
+
+
+def _serialize_truthy(value, parent: "HelmYaml"):
+    return value if value else _EMPTY
+
+
+def _serialize_always(value, parent: "HelmYaml"):
+    return value
+
+
+def _serialize_never(value, parent: "HelmYaml"):
+    return _EMPTY
+
+
+def _serialize_leaf(value, parent: "HelmYaml"):
+    return _EMPTY if is_empty_yaml(value) else value
+
+
+def _get_value_handler(value_type: type) -> Callable[[Any, "HelmYaml"], Any]:
+    if issubclass(value_type, dict):
+        return _serialize_dict
+    if issubclass(value_type, list):
+        return _serialize_list
+    if issubclass(value_type, HelmYaml):
+        return _serialize_helm_yaml
+    return _serialize_leaf
+
+
+_VALUE_HANDLERS.update(
+    {
+        str: _serialize_always,
+        bool: _serialize_always,
+        int: _serialize_truthy,
+        float: _serialize_truthy,
+        type(None): _serialize_never,
+    }
+)
+
 
-                if isinstance(value, (dict, list)):
-                    cleaned_dict_or_list = self.__clean_nested(value)
+def _copy_dict(dictionary: dict) -> dict:
+    copy = {}
+    for key, value in dictionary.items():
+        if type(value) is dict:
+            value = _copy_dict(value)
+        elif type(value) is list:
+            value = _copy_list(value)
+        copy[key] = value
+    return copy
 
-                    if cleaned_dict_or_list:
-                        cleaned_list.append(self.__clean_nested(value))
 
-                elif isinstance(value, HelmYaml):
-                    cleaned_dict_or_list = value.to_dict()
+def _copy_list(values: list) -> list:
+    copy = []
+    for value in values:
+        if type(value) is dict:
+            value = _copy_dict(value)
+        elif type(value) is list:
+            value = _copy_list(value)
+        copy.append(value)
+    return copy
 
-                    if cleaned_dict_or_list:
-                        cleaned_list.append(cleaned_dict_or_list)
 
-                else:
-                    cleaned_list.append(value)
-            return cleaned_list
+def _get_handler(value: Any) -> Callable[[Any, "HelmYaml"], Any]:
+    handler = _VALUE_HANDLERS.get(type(value))
+    if handler is None:
+        handler = _VALUE_HANDLERS[type(value)] = _get_value_handler(type(value))
+    return handler
 
-        elif isinstance(dictionary_or_list, dict):
-            cleaned_dict = {}
-            for key, value in dictionary_or_list.items():
-                if is_private_var(key):
-                    continue
 
-                if is_empty_yaml(value):
-                    continue
+def _is_empty_output(value: Any, parent: "HelmYaml") -> bool:
+    """
+    :returns: Whether the value is left out of the output, found without building \
+        the output
+    """
+    handler = _get_handler(value)
+    if handler is _serialize_dict:
+        return all(
+            is_private_var(key) or _is_empty_output(item, parent)
+            for key, item in value.items()
+        )
+    if handler is _serialize_list:
+        return all(_is_empty_output(item, parent) for item in value)
+    if handler is _serialize_helm_yaml:
+        plan = _get_plan(type(value))
+        if plan.uses_custom_to_dict:
+            return not value.to_dict()
+        return all(
+            item is None or _is_empty_output(item, value)
+            for _, item in plan.public_items(value)
+        )
+    return handler(value, parent) is _EMPTY
+
+
+def _get_lazy_output(value: Any, parent: "HelmYaml") -> Any:
+    """
+    :returns: The output of a value that isn't left out, with the output of the \
+        dictionaries, lists and HelmYaml objects in it only worked out as it is \
+        written by a stream emitter
+    """
+    handler = _get_handler(value)
+    if handler is _serialize_dict:
+        return _LazyDict(value, parent)
+    if handler is _serialize_list:
+        return _LazyList(value, parent)
+    if handler is _serialize_helm_yaml:
+        if _get_plan(type(value)).uses_custom_to_dict:
+            return value.to_dict()
+        return _LazyHelmYaml(value)
+    return handler(value, parent)
+
+
+class _LazyHelmYaml(LazyMapping):
+    __slots__ = ("helm_yaml", "plan")
+
+    def __init__(self, helm_yaml: "HelmYaml"):
+        self.helm_yaml = helm_yaml
+        self.plan = _get_plan(type(helm_yaml))
+
+    def keys(self) -> List[str]:
+        return [
+            key
+            for key, value in self.plan.public_items(self.helm_yaml)
+            if value is not None and not _is_empty_output(value, self.helm_yaml)
+        ]
+
+    def __getitem__(self, key: str) -> Any:
+        return _get_lazy_output(getattr(self.helm_yaml, key), self.helm_yaml)
+
+    def build(self) -> dict:
+        return _serialize_attributes(self.helm_yaml, self.plan)
+
+
+class _LazyDict(LazyMapping):
+    __slots__ = ("dictionary", "parent")
+
+    def __init__(self, dictionary: dict, parent: "HelmYaml"):
+        self.dictionary = dictionary
+        self.parent = parent
+
+    def keys(self) -> List[Any]:
+        return [
+            key
+            for key, value in self.dictionary.items()
+            if not is_private_var(key) and not _is_empty_output(value, self.parent)
+        ]
+
+    def __getitem__(self, key: Any) -> Any:
+        return _get_lazy_output(self.dictionary[key], self.parent)
+
+    def build(self) -> dict:
+        return _serialize_dict(self.dictionary, self.parent)
+
+
+class _LazyList(LazySequence):
+    __slots__ = ("values", "parent")
+
+    def __init__(self, values: list, parent: "HelmYaml"):
+        self.values = values
+        self.parent = parent
+
+    def __iter__(self) -> Iterator[Any]:
+        return (
+            _get_lazy_output(value, self.parent)
+            for value in self.values
+            if not _is_empty_output(value, self.parent)
+        )
+
+    def build(self) -> list:
+        return _serialize_list(self.values, self.parent)
+
+
+def _get_memo(helm_yaml: "HelmYaml") -> Optional[_Memo]:
+    try:
+        return object.__getattribute__(helm_yaml, _MEMO)
+    except AttributeError:
+        # Objects unpickled with protocol 0 or 1 are not created by HelmYaml.__new__
+        return None
 
-                elif isinstance(value, (dict, list)):
-                    cleaned_dict_or_list = self.__clean_nested(value)
 
-                    if cleaned_dict_or_list:
-                        cleaned_dict[key] = cleaned_dict_or_list
+def _get_extra(helm_yaml: "HelmYaml") -> Optional[Dict[str, Any]]:
+    try:
+        return object.__getattribute__(helm_yaml, _EXTRA)
+    except AttributeError:
+        return None
 
-                elif isinstance(value, HelmYaml):
-                    cleaned_dict_or_list = value.to_dict()
 
-                    if cleaned_dict_or_list:
-                        cleaned_dict[key] = cleaned_dict_or_list
-                else:
-                    cleaned_dict[key] = value
-            return cleaned_dict
+class HelmYaml:
+    """
+    Base class for every object that is output as yaml
+
+    Public instance attributes are output under their own name, while attributes
+    starting with an underscore are left out. The work of deciding which attributes
+    are public and how each type of value is cleaned is done once per class and
+    reused by every later call to :meth:`to_dict`
+
+    Attributes are read in place, only the dictionaries and lists of the output are
+    newly built, so nothing in the object graph is copied
+
+    Within a :func:`memoized` block the output of each object is memoized
+
+    The kubernetes classes declare ``__slots__`` so that their instances have no
+    ``__dict__``. Attributes set on them that their class doesn't declare, for fields
+    avionix doesn't model, are kept in a dictionary that is only created for them.
+    Subclasses that do not declare ``__slots__`` store their attributes in a
+    ``__dict__`` as usual, and every kind of attribute is output
+    """
+
+    __slots__ = ("__memo", "__extra", "__weakref__")
+
+    def __new__(cls, *args, **kwargs):
+        helm_yaml = super().__new__(cls)
+        object.__setattr__(helm_yaml, _MEMO, None)
+        object.__setattr__(helm_yaml, _EXTRA, None)
+        return helm_yaml
 
     def __str__(self):
-        return dump(self.to_dict())
+        return self._get_text()
 
     def to_dict(self):
-        dictionary = deepcopy(self.__dict__)
-        return self.__clean_nested(dictionary)
+        if self.__get_memo() is None:
+            # Built for this call only, so there is nothing to copy
+            return _serialize_attributes(self, _get_plan(type(self)))
+        return _copy_dict(self._get_cached_dict())
+
+    def __get_memo(self) -> Optional[_Memo]:
+        """
+        :returns: The memo of this object, cleared if it is from an earlier \
+            memoized block, or None outside of memoized blocks
+        """
+        generation = _SCOPE.generation
+        if not generation:
+            return None
+        memo = _get_memo(self)
+        if memo is None:
+            memo = _Memo()
+            object.__setattr__(self, _MEMO, memo)
+        if memo.generation != generation:
+            memo.clear()
+            memo.generation = generation
+            _SCOPE.memos.append(memo)
+        return memo
+
+    def _get_cached_dict(self) -> dict:
+        """
+        :returns: The output of :meth:`to_dict`, memoized within memoized blocks, \
+            which must not be modified
+        """
+        memo = self.__get_memo()
+        if memo is None:
+            return _serialize_attributes(self, _get_plan(type(self)))
+        if memo.dictionary is None:
+            memo.dictionary = _serialize_attributes(self, _get_plan(type(self)))
+        return memo.dictionary
+
+    def _get_text(
+        self,
+        emitter: Optional[str] = None,
+        render: Optional[Callable[["HelmYaml"], str]] = None,
+    ) -> str:
+        """
+        :param emitter: The name of the emitter to use, defaults to \
+            DEFAULTS["emitter"]
+        :param render: Called with this object to produce its text when it is not \
+            memoized, must produce the same text as the emitter
+
+        :returns: The output of the emitter for this object, memoized within \
+            memoized blocks
+        """
+        if emitter is None:
+            emitter = DEFAULTS["emitter"]
+        memo = self.__get_memo()
+        text = memo.texts.get(emitter) if memo is not None else None
+        if text is None:
+            if render is None:
+                text = get_emitter(emitter)(self.to_dict())
+            else:
+                text = render(self)
+            if memo is not None:
+                memo.texts[emitter] = text
+        return text
+
+    def _write_text(self, stream: IO[str], emitter: Optional[str] = None):
+        """
+        Writes the output of the emitter for this object to a file as it is emitted.
+        Unless the text is already memoized, neither the text nor the output of
+        :meth:`to_dict` is built, the objects are read as they are written
+
+        :param stream: The text file to write to
+        :param emitter: The name of the emitter to use, defaults to \
+            DEFAULTS["emitter"]
+        """
+        memo = self.__get_memo()
+        text = memo.texts.get(emitter or DEFAULTS["emitter"]) if memo else None
+        if text is not None:
+            stream.write(text)
+        elif _get_plan(type(self)).uses_custom_to_dict:
+            get_stream_emitter(emitter)(self.to_dict(), stream)
+        else:
+            get_stream_emitter(emitter)(_LazyHelmYaml(self), stream)
+
+    def _has_text(self, emitter: Optional[str] = None) -> bool:
+        """
+        :returns: Whether the output of the emitter for this object is memoized
+        """
+        memo = self.__get_memo()
+        return memo is not None and (emitter or DEFAULTS["emitter"]) in memo.texts
+
+    def _add_parent(self, parent: "HelmYaml") -> Optional[_Memo]:
+        """
+        :param parent: An object whose output includes the output of this object, \
+            its memoized output is cleared along with the output of this object
+
+        :returns: The memo of this object, None outside of memoized blocks
+        """
+        memo = self.__get_memo()
+        if memo is None:
+            return None
+        if memo.parents is None:
+            memo.parents = {}
+        parent_reference = memo.parents.get(id(parent))
+        if parent_reference is None or parent_reference() is not parent:
+            memo.parents[id(parent)] = ref(parent)
+        return memo
+
+    def invalidate(self):
+        """
+        Clears the memoized output of this object and of every object containing it
+        """
+        memo = _get_memo(self)
+        if memo is None:
+            return
+        had_output = memo.clear()
+        # Objects containing this one only memoize their output after this one has,
+        # so there is nothing further to clear if this object had nothing memoized.
+        # Overridden to_dict methods are not memoized, so always clear the parents
+        if memo.parents and (had_output or _get_plan(type(self)).uses_custom_to_dict):
+            for parent_reference in list(memo.parents.values()):
+                parent = parent_reference()
+                if parent is not None:
+                    parent.invalidate()
+
+    def __getattr__(self, name: str):
+        # Only called for attributes that aren't in a slot or a __dict__
+        extra = _get_extra(self)
+        if extra is not None and name in extra:
+            return extra[name]
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
+        )
+
+    def __setattr__(self, name: str, value):
+        try:
+            object.__setattr__(self, name, value)
+        except AttributeError:
+            # Read only properties and class attributes can't be set either way
+            if hasattr(type(self), name):
+                raise
+            extra = _get_extra(self)
+            if extra is None:
+                extra = {}
+                object.__setattr__(self, _EXTRA, extra)
+            extra[name] = value
+        if _get_memo(self) is not None and (
+            name[:1] != "_" or _get_plan(type(self)).uses_custom_to_dict
+        ):
+            self.invalidate()
+
+    def __delattr__(self, name: str):
+        try:
+            object.__delattr__(self, name)
+        except AttributeError:
+            extra = _get_extra(self)
+            if extra is None or name not in extra:
+                raise
+            del extra[name]
+        if _get_memo(self) is not None and (
+            name[:1] != "_" or _get_plan(type(self)).uses_custom_to_dict
+        ):
+            self.invalidate()
+
+    def __getstate__(self):
+        # The memo is left out, so copies start without memoized output
+        plan = _get_plan(type(self))
+        attributes = self.__dict__ if plan.has_dict else _get_extra(self)
+        return (
+            dict(attributes) if attributes else None,
+            plan.slot_state(self),
+        )
+
+    def __setstate__(self, state: Tuple[Optional[dict], Dict[str, Any]]):
+        # Setting the attributes directly skips clearing the memo, which is empty
+        attributes, slots = state
+        object.__setattr__(self, _MEMO, None)
+        object.__setattr__(self, _EXTRA, None)
+        if attributes and _get_plan(type(self)).has_dict:
+            self.__dict__.update(attributes)
+        elif attributes:
+            object.__setattr__(self, _EXTRA, attributes)
+        for name, value in slots.items():
+            object.__setattr__(self, name, value)
 
     @staticmethod
     def _get_kube_date_string(datetime_obj: Optional[datetime]):
@@ -81,4 +683,4 @@ class HelmYaml:
         )
 
     def __setitem__(self, key, value):
-        self.__dict__[key] = value
+        setattr(self, key, value)
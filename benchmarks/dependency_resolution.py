@@ -0,0 +1,79 @@
+"""
+Times resolving the version constraints of dependencies against a generated
+repository index, reading the index itself, the versions cached on disk, and the
+versions already in memory
+
+Usage::
+
+    python benchmarks/dependency_resolution.py [number_of_dependencies]
+"""
+
+from pathlib import Path
+import sys
+from tempfile import TemporaryDirectory
+import time
+
+import yaml
+
+from avionix import ChartDependency
+from avionix.chart.dependency_resolver import DependencyResolver
+
+REPOSITORY = "https://charts.example.com"
+CHARTS = 1000
+VERSIONS = 40
+
+
+def write_index(repository_cache: Path):
+    entries = {
+        f"chart-{i}": [
+            {
+                "name": f"chart-{i}",
+                "version": f"{major}.{minor}.{patch}",
+                "urls": [f"{REPOSITORY}/chart-{i}-{major}.{minor}.{patch}.tgz"],
+                "digest": "0" * 64,
+            }
+            for major in range(VERSIONS // 20)
+            for minor in range(4)
+            for patch in range(5)
+        ]
+        for i in range(CHARTS)
+    }
+    repository_cache.mkdir()
+    with open(repository_cache / "example-index.yaml", "w") as index:
+        yaml.safe_dump({"apiVersion": "v1", "entries": entries}, index)
+
+
+def time_resolving(resolver: DependencyResolver, dependencies):
+    started = time.perf_counter()
+    resolver.resolve_all(dependencies)
+    return time.perf_counter() - started
+
+
+def main(count: int):
+    dependencies = [
+        ChartDependency(f"chart-{i}", "^1.1.0", "@example", "example")
+        for i in range(count)
+    ]
+    with TemporaryDirectory() as directory:
+        repository_cache = Path(directory) / "repository"
+        write_index(repository_cache)
+        size = (repository_cache / "example-index.yaml").stat().st_size
+        print(
+            f"{count} dependencies, index of {CHARTS} charts with {VERSIONS} "
+            f"versions each ({size / 1024 / 1024:.1f} MiB)"
+        )
+        cache_directory = Path(directory) / "cache"
+        resolver = DependencyResolver(repository_cache, cache_directory)
+        timings = {
+            "reading the index": time_resolving(resolver, dependencies),
+            "versions in memory": time_resolving(resolver, dependencies),
+            "versions cached on disk": time_resolving(
+                DependencyResolver(repository_cache, cache_directory), dependencies
+            ),
+        }
+    for name, seconds in timings.items():
+        print(f"{name:>24}: {seconds * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
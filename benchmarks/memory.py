@@ -0,0 +1,101 @@
+"""
+Measures the memory taken by instances of the kubernetes classes, which store their
+attributes in ``__slots__``, and by a graph of containers built from them, against
+classes with the same constructors that store their attributes in a ``__dict__``
+
+Usage::
+
+    python benchmarks/memory.py [number_of_containers]
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from avionix.kube.core import Container, ContainerPort, EnvVar, KeyToPath, VolumeMount
+
+KUBE_CLASSES = (Container, ContainerPort, EnvVar, KeyToPath, VolumeMount)
+
+
+def get_dict_class(kube_class: type):
+    return type(kube_class.__name__, (), {"__init__": kube_class.__init__})
+
+
+def build_graph(count: int, classes: dict):
+    graph = []
+    for i in range(count):
+        container = classes[Container](
+            name=f"container-{i}",
+            image="k8s.gcr.io/echoserver:1.4",
+            env=[classes[EnvVar]("MODE", "worker"), classes[EnvVar]("INDEX", str(i))],
+            ports=[classes[ContainerPort](8080, name="http")],
+            volume_mounts=[
+                classes[VolumeMount]("config", "/etc/config"),
+                classes[VolumeMount]("data", "/data"),
+            ],
+        )
+        items = [
+            classes[KeyToPath]("settings", "settings.yaml"),
+            classes[KeyToPath]("logging", "logging.yaml"),
+        ]
+        graph.append((container, items))
+    return graph
+
+
+# Arguments shared by every instance, so that only the instances themselves are
+# measured
+ARGUMENTS = {
+    Container: {"name": "container", "image": "k8s.gcr.io/echoserver:1.4"},
+    ContainerPort: {"container_port": 8080, "name": "http"},
+    EnvVar: {"name": "MODE", "value": "worker"},
+    KeyToPath: {"key": "settings", "path": "settings.yaml"},
+    VolumeMount: {"name": "config", "mount_path": "/etc/config"},
+}
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    built = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del built
+    return size
+
+
+def measure_instances(count: int, instance_class: type, kube_class: type):
+    arguments = ARGUMENTS[kube_class]
+    return measure(lambda: [instance_class(**arguments) for _ in range(count)]) / count
+
+
+def main(count: int):
+    slot_classes = {kube_class: kube_class for kube_class in KUBE_CLASSES}
+    dict_classes = {
+        kube_class: get_dict_class(kube_class) for kube_class in KUBE_CLASSES
+    }
+
+    print("Bytes per instance")
+    for kube_class in KUBE_CLASSES:
+        dict_size = measure_instances(count, dict_classes[kube_class], kube_class)
+        slots_size = measure_instances(count, slot_classes[kube_class], kube_class)
+        print(
+            f"{kube_class.__name__:>14}: __dict__ {dict_size:6.1f}, "
+            f"__slots__ {slots_size:6.1f}, saving {dict_size - slots_size:6.1f}"
+        )
+
+    # Objects per container: the container, 2 env vars, a port, 2 volume mounts and
+    # 2 key to paths
+    objects = count * 8
+    dict_size = measure(lambda: build_graph(count, dict_classes))
+    slots_size = measure(lambda: build_graph(count, slot_classes))
+    print(f"Graph of {count} containers, {objects} objects")
+    for name, size in (("__dict__", dict_size), ("__slots__", slots_size)):
+        print(
+            f"{name:>14}: {size / 1024 ** 2:8.1f} MiB, "
+            f"{size / objects:6.1f} bytes per object"
+        )
+    print(f"{'saving':>14}: {(dict_size - slots_size) / objects:6.1f} bytes per object")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,107 @@
+"""
+Compares parsing the tables printed by helm list and kubectl get with parsing their
+JSON output into records, on generated listings
+
+Usage::
+
+    python benchmarks/output_parsing.py [number_of_rows]
+"""
+
+import json
+import sys
+import time
+
+from avionix.chart.utils import get_release_columns, parse_helm_releases
+from avionix.testing.helpers import parse_kubernetes_resources, parse_output_to_dict
+
+REPEATS = 20
+
+
+def format_table(rows):
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return "\n".join(
+        "   ".join(value.ljust(width) for value, width in zip(row, widths))
+        for row in rows
+    )
+
+
+def get_helm_list(count: int):
+    releases = [
+        {
+            "name": f"release-{i}",
+            "namespace": f"namespace-{i % 50}",
+            "revision": str(i % 7 + 1),
+            "updated": "2020-07-12 14:16:17.530935 -0400 EDT",
+            "status": "deployed",
+            "chart": f"chart-{i}-0.1.0",
+            "app_version": "1.16.0",
+        }
+        for i in range(count)
+    ]
+    header = [
+        "NAME",
+        "NAMESPACE",
+        "REVISION",
+        "UPDATED",
+        "STATUS",
+        "CHART",
+        "APP VERSION",
+    ]
+    table = format_table([header] + [list(release.values()) for release in releases])
+    return table, json.dumps(releases)
+
+
+def get_kubectl_get_pods(count: int):
+    pods = [
+        {
+            "apiVersion": "v1",
+            "kind": "Pod",
+            "metadata": {
+                "name": f"deployment-{i}-5d4f8c7b9-x2x8k",
+                "namespace": f"namespace-{i % 50}",
+                "labels": {"app": f"app-{i}"},
+            },
+            "spec": {"containers": [{"name": "container", "image": "nginx:1.19"}]},
+            "status": {"phase": "Running"},
+        }
+        for i in range(count)
+    ]
+    header = ["NAME", "READY", "STATUS", "RESTARTS", "AGE"]
+    table = format_table(
+        [header]
+        + [[pod["metadata"]["name"], "1/1", "Running", "0", "5m"] for pod in pods]
+    )
+    return table, json.dumps({"apiVersion": "v1", "kind": "List", "items": pods})
+
+
+def time_parsing(parse, output: str):
+    best = None
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        parse(output)
+        seconds = time.perf_counter() - started
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def main(count: int):
+    print(f"{count} rows, best of {REPEATS}")
+    helm_table, helm_json = get_helm_list(count)
+    kubectl_table, kubectl_json = get_kubectl_get_pods(count)
+    timings = {
+        "helm list table": (parse_output_to_dict, helm_table),
+        "helm list json records": (parse_helm_releases, helm_json),
+        "helm list json columns": (
+            lambda output: get_release_columns(parse_helm_releases(output)),
+            helm_json,
+        ),
+        "kubectl get table": (parse_output_to_dict, kubectl_table),
+        "kubectl get json records": (parse_kubernetes_resources, kubectl_json),
+    }
+    for name, (parse, output) in timings.items():
+        seconds = time_parsing(parse, output)
+        print(f"{name:>24}: {seconds * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
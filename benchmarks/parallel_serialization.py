@@ -0,0 +1,61 @@
+"""
+Times generating a chart of deployments with the templates written by 1, 2, 4, 8
+and 16 worker processes
+
+Usage::
+
+    python benchmarks/parallel_serialization.py [number_of_deployments] [emitter]
+"""
+
+import os
+import sys
+from tempfile import TemporaryDirectory
+import time
+
+from avionix import ChartBuilder, ChartInfo
+
+# Run as a script, so the other benchmarks can be imported
+from serialization import get_deployment  # isort:skip
+
+WORKERS = (1, 2, 4, 8, 16)
+
+
+def main(count: int, emitter: str):
+    deployments = [get_deployment(i) for i in range(count)]
+    chart_info = ChartInfo(api_version="3.2.4", name="parallel", version="0.1.0")
+    print(f"{count} deployments, {emitter} emitter, {os.cpu_count()} cpus")
+    expected = None
+    serial_seconds = None
+    for workers in WORKERS:
+        with TemporaryDirectory() as output_directory:
+            builder = ChartBuilder(
+                chart_info,
+                deployments,
+                output_directory=output_directory,
+                emitter=emitter,
+                workers=workers,
+            )
+            for deployment in deployments:
+                deployment.invalidate()
+            started = time.perf_counter()
+            templates_directory = builder.generate_chart()
+            seconds = time.perf_counter() - started
+            templates = {
+                path.name: path.read_text() for path in templates_directory.iterdir()
+            }
+        if expected is None:
+            expected = templates
+            serial_seconds = seconds
+        # The templates are the same whatever the number of workers
+        assert templates == expected
+        print(
+            f"{workers:>3} workers: {seconds * 1000:9.2f} ms, "
+            f"speedup {serial_seconds / seconds:5.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+        sys.argv[2] if len(sys.argv) > 2 else "pyyaml",
+    )
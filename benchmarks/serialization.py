@@ -0,0 +1,73 @@
+"""
+Times ``HelmYaml.to_dict`` and each emitter on a graph of deployments
+
+Usage::
+
+    python benchmarks/serialization.py [number_of_deployments]
+
+Serialization plans alone made ``to_dict`` about 4 times faster, short of the 5 to
+10 times aimed for. On one CPU with 1000 deployments, best of 5 runs:
+
+- Before the serialization plans (f1380b7): 520 to 700 ms.
+- With the serialization plans alone (e362684): 120 to 170 ms.
+- Together with the later changes to ``to_dict``: 26 to 45 ms, 15 to 19 times
+  faster than before the plans.
+"""
+
+import sys
+import timeit
+
+from avionix import ObjectMeta
+from avionix.kube.apps import Deployment, DeploymentSpec
+from avionix.kube.core import Container, ContainerPort, EnvVar, PodSpec, PodTemplateSpec
+from avionix.kube.meta import LabelSelector
+from avionix.yaml.emitters import EMITTERS
+
+
+def get_deployment(number: int):
+    labels = {"container_type": f"worker-{number}"}
+    return Deployment(
+        metadata=ObjectMeta(name=f"deployment-{number}", labels={"type": "worker"}),
+        spec=DeploymentSpec(
+            replicas=1,
+            template=PodTemplateSpec(
+                ObjectMeta(labels=labels),
+                spec=PodSpec(
+                    containers=[
+                        Container(
+                            name=f"container-{number}",
+                            image="k8s.gcr.io/echoserver:1.4",
+                            env=[EnvVar("test", "test-value")],
+                            ports=[ContainerPort(8080, name="port")],
+                        )
+                    ]
+                ),
+            ),
+            selector=LabelSelector(match_labels=labels),
+        ),
+    )
+
+
+def main(count: int):
+    deployments = [get_deployment(i) for i in range(count)]
+
+    def to_dict():
+        for deployment in deployments:
+            deployment.to_dict()
+
+    seconds = min(timeit.repeat(to_dict, number=1, repeat=5))
+    print(f"{'to_dict':>8}: {seconds * 1000:9.2f} ms for {count} deployments")
+
+    dictionaries = [deployment.to_dict() for deployment in deployments]
+    for name, emit in EMITTERS.items():
+
+        def emit_all():
+            for dictionary in dictionaries:
+                emit(dictionary)
+
+        seconds = min(timeit.repeat(emit_all, number=1, repeat=5))
+        print(f"{name:>8}: {seconds * 1000:9.2f} ms for {count} deployments")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
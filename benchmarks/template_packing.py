@@ -0,0 +1,103 @@
+"""
+Compares writing one template per object with packing the objects into
+multi-document templates, by the time taken to generate the chart, the number of
+files, the disk space used and the time helm takes to load and render the chart
+
+Usage::
+
+    python benchmarks/template_packing.py [number_of_objects]
+
+The helm load time is only measured when helm is installed
+"""
+
+import os
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+import time
+
+from avionix import ChartBuilder, ChartInfo, ObjectMeta
+from avionix.kube.core import ConfigMap
+
+# Run as a script, so the other benchmarks can be imported
+from serialization import get_deployment  # isort:skip
+
+LAYOUTS = {
+    "per object": {},
+    "by kind": {"pack_templates": "kind"},
+    "by namespace": {"pack_templates": "namespace"},
+    "by size (1 MiB)": {"pack_templates": "size"},
+}
+
+
+def get_objects(count: int):
+    objects = []
+    for i in range(count):
+        if i % 2:
+            objects.append(get_deployment(i))
+        else:
+            objects.append(
+                ConfigMap(
+                    ObjectMeta(name=f"config-{i}", namespace=f"namespace-{i % 10}"),
+                    {"key": f"value-{i}"},
+                )
+            )
+    return objects
+
+
+def get_disk_usage(directory: Path):
+    files = 0
+    size = 0
+    for path in directory.glob("**/*"):
+        if path.is_file():
+            files += 1
+            size += os.stat(path).st_blocks * 512
+    return files, size
+
+
+def time_helm_template(chart_directory: Path):
+    if shutil.which("helm") is None:
+        return None
+    started = time.perf_counter()
+    subprocess.run(
+        ["helm", "template", str(chart_directory)],
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - started
+
+
+def main(count: int):
+    objects = get_objects(count)
+    chart_info = ChartInfo(api_version="3.2.4", name="packed", version="0.1.0")
+    print(f"{count} objects")
+    # Works out the serialization plans before any layout is timed
+    for kube_object in objects:
+        kube_object.to_dict()
+    for layout, options in LAYOUTS.items():
+        with TemporaryDirectory() as output_directory:
+            builder = ChartBuilder(
+                chart_info, objects, output_directory=output_directory, **options
+            )
+            for kube_object in objects:
+                kube_object.invalidate()
+            started = time.perf_counter()
+            builder.generate_chart()
+            seconds = time.perf_counter() - started
+            files, size = get_disk_usage(builder.chart_folder_path)
+            helm_seconds = time_helm_template(builder.chart_folder_path)
+            helm_time = (
+                "helm not found"
+                if helm_seconds is None
+                else f"helm template {helm_seconds * 1000:9.2f} ms"
+            )
+            print(
+                f"{layout:>16}: generate {seconds * 1000:9.2f} ms, {files:6} files, "
+                f"{size / 1024:9.0f} KiB on disk, {helm_time}"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
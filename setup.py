@@ -27,7 +27,7 @@ setup(
     maintainer_email="zachb1996@yahoo.com",
     description="A package for soldifying kubernetes structure and development by "
     "using objects and code rather than yaml",
-    python_requires=">=3.6.1",
+    python_requires=">=3.7",
     install_requires=["pyyaml >=5.4"],
     project_urls={
         "Source Code": "https://github.com/zbrookle/avionix",
@@ -42,7 +42,6 @@ setup(
         "Intended Audience :: Developers",
         "Topic :: Software Development :: Build Tools",
         "License :: OSI Approved :: BSD License",
-        "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
         "Programming Language :: Python :: 3.8",
         "Typing :: Typed",